@@ -1,22 +1,18 @@
-import asyncio
 import os
 import shutil
-import traceback
 from textwrap import dedent
 
 from aiogram import flags
 from aiogram.enums import ChatAction
-from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import Command, CommandObject
 from aiogram.types import ErrorEvent, Message
-from aiohttp import ClientResponseError
 
 from nazurin import config, dp
-from nazurin.utils import logger
+from nazurin.queue import JobState
 from nazurin.utils.decorators import Cache
-from nazurin.utils.exceptions import InvalidCommandUsageError, NazurinError
+from nazurin.utils.exceptions import InvalidCommandUsageError
 from nazurin.utils.filters import IDFilter
-from nazurin.utils.helpers import format_error
+from nazurin.utils.helpers import reply_error
 
 
 @dp.message_handler(Command("start"), description="Get help")
@@ -86,27 +82,32 @@ async def clear_cache(message: Message):
         await message.reply(error.strerror)
 
 
+@dp.message_handler(
+    IDFilter(config.ADMIN_ID),
+    Command("stats"),
+    description="Show collection statistics",
+)
+async def show_stats(message: Message):
+    pending = await dp.queue.count(JobState.PENDING)
+    running = await dp.queue.count(JobState.RUNNING)
+    if dp.workers:
+        pipeline = f"Running in {dp.workers.size} worker processes"
+    else:
+        pipeline = dp.bot.pipeline.stats()
+    await message.reply(
+        f"<b>Jobs:</b> {pending} pending, {running} running\n"
+        f"<b>Pipeline:</b>\n{pipeline}",
+    )
+
+
 @dp.error()
 async def on_error(event: ErrorEvent):
-    update = event.update
-    message = update.message
-    try:
-        raise event.exception
-    except InvalidCommandUsageError as error:
+    error = event.exception
+    message = event.update.message
+    if isinstance(error, InvalidCommandUsageError):
         await message.reply(dp.commands.help(error.command))
-    except ClientResponseError as error:
-        traceback.print_exc()
-        await message.reply(f"Response Error: {error.status} {error.message}")
-    except NazurinError as error:
-        await message.reply(error.msg)
-    except asyncio.TimeoutError:
-        traceback.print_exc()
-        await message.reply("Error: Timeout, please try again.")
-    except Exception as error:
-        logger.exception("Update {} caused {}: {}", update, type(error), error)
-        if not isinstance(error, TelegramAPIError):
-            await message.reply(f"Error: {format_error(error)}")
-
+    else:
+        await reply_error(message, error)
     return True
 
 
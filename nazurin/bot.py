@@ -1,6 +1,7 @@
 import asyncio
+from dataclasses import dataclass
 from time import time
-from typing import Optional
+from typing import Optional, Union
 
 from aiogram import Bot, flags
 from aiogram.client.default import DefaultBotProperties
@@ -10,11 +11,13 @@ from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import FSInputFile, InputMediaPhoto, Message
 
 from nazurin import config
-from nazurin.database import Database
-from nazurin.models import File, Illust, Image, Ugoira
-from nazurin.sites import SiteManager
+from nazurin.database import Database, DatabaseDriver
+from nazurin.database.index import MembershipIndex
+from nazurin.models import Document, File, Illust, Image, Ugoira
+from nazurin.pipeline import Pipeline
+from nazurin.sites import MatchResult, SiteManager
 from nazurin.storage import Storage
-from nazurin.utils import logger
+from nazurin.utils import logger, metrics
 from nazurin.utils.decorators import retry_after
 from nazurin.utils.exceptions import AlreadyExistsError, NazurinError
 from nazurin.utils.helpers import (
@@ -22,6 +25,27 @@ from nazurin.utils.helpers import (
     remove_files_older_than,
     sanitize_caption,
 )
+from nazurin.utils.network import sessions
+from nazurin.utils.singleflight import SingleFlight
+
+
+@dataclass
+class CollectionUpdate:
+    """
+    State of a collection update passed between pipeline stages.
+    """
+
+    result: MatchResult
+    message: Optional[Message] = None
+    illust: Optional[Illust] = None
+    document: Optional[Document] = None
+    collection: Optional[DatabaseDriver] = None
+
+
+@dataclass
+class CollectionResult:
+    url: str
+    error: Optional[Exception] = None
 
 
 class NazurinBot(Bot):
@@ -38,7 +62,21 @@ class NazurinBot(Bot):
         )
         self.sites = SiteManager()
         self.storage = Storage()
+        self.pipeline = (
+            Pipeline("collection", config.PIPELINE_QUEUE_SIZE)
+            .stage("metadata", self.fetch_update, config.METADATA_WORKERS)
+            .stage("download", self.download_update, config.DOWNLOAD_WORKERS)
+            .stage("storage", self.store_update, config.STORAGE_WORKERS)
+            .stage("database", self.save_update, config.DATABASE_WORKERS)
+        )
+        # Updates of the same artwork in progress, e.g. from webhook and API
+        self.updates = SingleFlight()
+        self.index = MembershipIndex()
+        # Whether this process is the only one saving to the database
+        self.exclusive = True
         self.cleanup_task = None
+        self.index_task = None
+        self.connect_task = None
 
     def init(self):
         self.sites.load()
@@ -46,10 +84,22 @@ class NazurinBot(Bot):
 
     async def on_startup(self):
         self.cleanup_task = asyncio.create_task(self.cleanup_temp_dir())
+        # Connecting may take a while, don't hold up the webhook
+        self.connect_task = asyncio.create_task(self.connect())
+        if config.MEMBERSHIP_INDEX:
+            self.index_task = asyncio.create_task(self.load_index())
+        self.pipeline.start()
 
     async def on_shutdown(self):
         if self.cleanup_task:
             self.cleanup_task.cancel()
+        if self.index_task:
+            self.index_task.cancel()
+        if self.connect_task:
+            self.connect_task.cancel()
+        await self.pipeline.stop()
+        await Database().close()
+        await sessions.close()
 
     @retry_after
     @flags.chat_action(ChatAction.UPLOAD_PHOTO)
@@ -159,35 +209,164 @@ class NazurinBot(Bot):
         self,
         urls: list[str],
         message: Optional[Message] = None,
-    ):
-        result = self.sites.match(urls)
-        if not result:
+    ) -> list[CollectionResult]:
+        """
+        Collect every supported URL in `urls`.
+
+        If only one artwork is matched, errors are raised directly,
+        otherwise artworks are collected concurrently
+        and errors are returned along with the results.
+        """
+
+        with metrics.STAGE_DURATION.labels(stage="match", site="").time():
+            results = self.sites.match(urls)
+        if not results:
             raise NazurinError("No source matched")
-        logger.info(
-            "Collection update: source={}, match={}",
-            result.source.name,
-            result.match.groups(),
+        if len(results) == 1:
+            await self.collect(results[0], message)
+            return [CollectionResult(results[0].url)]
+
+        semaphore = asyncio.Semaphore(config.MAX_PARALLEL_COLLECTION)
+        # Skip duplicates with one query per collection instead of one per URL
+        keys = {result.url: self.sites.identify(result) for result in results}
+        existing = await self.exists_many([key for key in keys.values() if key])
+
+        async def collect(result: MatchResult) -> CollectionResult:
+            if keys[result.url] in existing:
+                site = result.source.name
+                metrics.COLLECTIONS.labels(site=site, result="exists").inc()
+                return CollectionResult(result.url, AlreadyExistsError())
+            async with semaphore:
+                try:
+                    # Message is not passed to avoid forwarding it for every artwork
+                    await self.collect(result)
+                # pylint: disable-next=broad-exception-caught
+                except Exception as error:
+                    logger.warning("Failed to collect {}: {}", result.url, error)
+                    return CollectionResult(result.url, error)
+                return CollectionResult(result.url)
+
+        return await asyncio.gather(*[collect(result) for result in results])
+
+    async def collect(self, result: MatchResult, message: Optional[Message] = None):
+        await self.updates.do(result.key, lambda: self._collect(result, message))
+
+    async def _collect(self, result: MatchResult, message: Optional[Message] = None):
+        site = result.source.name
+        logger.info("Collection update: source={}, match={}", site, result.match.groups())
+        metrics.current_site.set(site)
+        outcome = "error"
+        try:
+            with (
+                metrics.COLLECTIONS_IN_PROGRESS.track_inprogress(),
+                metrics.COLLECTION_DURATION.labels(site=site).time(),
+            ):
+                # Skip duplicates before making any request to the site
+                key = self.sites.identify(result)
+                if key and await self.exists(*key):
+                    raise AlreadyExistsError
+                await self.pipeline.submit(CollectionUpdate(result, message))
+            outcome = "collected"
+        except AlreadyExistsError:
+            outcome = "exists"
+            raise
+        finally:
+            metrics.COLLECTIONS.labels(site=site, result=outcome).inc()
+
+    async def exists(
+        self,
+        collection: str,
+        document_id: Union[str, int],
+        *,
+        use_index: bool = True,
+    ) -> bool:
+        # Only query the database if the index can't rule it out
+        if use_index and not self.index.may_contain(collection, document_id):
+            return False
+        db = Database().driver()
+        return await db.collection(collection).document(document_id).exists()
+
+    async def exists_many(
+        self,
+        keys: list[tuple[str, Union[str, int]]],
+    ) -> set[tuple[str, Union[str, int]]]:
+        """`(collection, document_id)` pairs in `keys` that exist."""
+        ids: dict[str, list[Union[str, int]]] = {}
+        for collection, document_id in keys:
+            if self.index.may_contain(collection, document_id):
+                ids.setdefault(collection, []).append(document_id)
+        db = Database().driver()
+        results = await asyncio.gather(
+            *(
+                db.collection(collection).exists_many(document_ids)
+                for collection, document_ids in ids.items()
+            ),
         )
+        return {
+            (collection, document_id)
+            for (collection, document_ids), exists in zip(ids.items(), results)
+            for document_id, found in zip(document_ids, exists)
+            if found
+        }
 
-        illust, document = await self.sites.handle_update(result)
+    async def fetch_update(self, update: CollectionUpdate):
+        update.illust, update.document = await self.sites.handle_update(update.result)
 
         db = Database().driver()
-        collection = db.collection(document.collection)
-        if await collection.document(document.id).exists():
+        update.collection = db.collection(update.document.collection)
+        # The index misses documents saved by other processes since it was loaded,
+        # so the final check before collecting must ask the database then
+        if await self.exists(
+            update.document.collection,
+            update.document.id,
+            use_index=self.exclusive,
+        ):
             raise AlreadyExistsError
 
+    async def download_update(self, update: CollectionUpdate):
         # Send / Forward to gallery & Save to album
-        download = asyncio.create_task(illust.download())
+        download = asyncio.create_task(update.illust.download())
         if config.GALLERY_ID:
-            save = asyncio.create_task(self.send_to_gallery(urls, illust, message))
+            save = asyncio.create_task(
+                self.send_to_gallery(
+                    [update.result.url],
+                    update.illust,
+                    update.message,
+                ),
+            )
             await asyncio.gather(save, download)
         else:
             await download
 
-        await self.storage.store(illust)
+    async def store_update(self, update: CollectionUpdate):
+        await self.storage.store(update.illust)
+
+    async def save_update(self, update: CollectionUpdate):
+        document = update.document
         document.data["collected_at"] = time()
-        await collection.insert(document.id, document.data)
-        return True
+        await update.collection.insert(document.id, document.data)
+        self.index.add(document.collection, document.id)
+
+    async def connect(self):
+        """Connect database and storage drivers in parallel."""
+        await asyncio.gather(self.connect_database(), self.storage.connect())
+
+    async def connect_database(self):
+        try:
+            await Database().driver().connect()
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            logger.opt(exception=error).error(
+                "Failed to connect to database: {}",
+                error,
+            )
+
+    async def load_index(self):
+        try:
+            await self.index.load(Database().driver())
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            logger.warning("Failed to load membership index: {}", error)
 
     async def cleanup_temp_dir(self):
         if config.CLEANUP_INTERVAL == 0:
@@ -19,6 +19,8 @@ WEBHOOK_SECRET = hashlib.sha256(TOKEN.encode()).hexdigest()
 HOST: str = env.str("HOST", default="0.0.0.0")
 # Port is automatically set if on Heroku or fly.io
 PORT: int = env.int("PORT", default=80)
+# Path to serve Prometheus metrics at, disabled if not set
+METRICS_PATH: Optional[str] = env.str("METRICS_PATH", default=None)
 
 STORAGE: list[str] = env.list("STORAGE", subcast=str, default=["Local"])
 STORAGE_DIR: str = env.str("STORAGE_DIR", default="Pictures")
@@ -28,6 +30,8 @@ DANBOORU_USERNAME: str = env.str("DANBOORU_USERNAME", default=None)
 DANBOORU_API_KEY: str = env.str("DANBOORU_API_KEY", default=None)
 
 DATABASE: str = env.str("DATABASE", default="Local")
+# Keep keys of collected documents in memory to skip database queries for new ones
+MEMBERSHIP_INDEX: bool = env.bool("MEMBERSHIP_INDEX", default=True)
 # Nazurin data collection in database
 NAZURIN_DATA: str = "nazurin"
 # Ignored items in image caption
@@ -45,9 +49,54 @@ ALLOW_GROUP: list[int] = env.list("ALLOW_GROUP", subcast=int, default=[])
 RETRIES: int = env.int("RETRIES", default=5)
 TIMEOUT: int = env.int("TIMEOUT", default=20)
 DOWNLOAD_CHUNK_SIZE: int = env.int("DOWNLOAD_CHUNK_SIZE", default=4096)
+# Received chunks are written to disk in buffers of this many bytes
+DOWNLOAD_BUFFER_SIZE: int = env.int("DOWNLOAD_BUFFER_SIZE", default=1024 * 1024)
+# Files of at least this many bytes are downloaded in parallel segments
+SEGMENTED_DOWNLOAD_SIZE: int = env.int(
+    "SEGMENTED_DOWNLOAD_SIZE",
+    default=16 * 1024 * 1024,
+)
+# Number of segments of a large file, 1 to download in a single stream
+DOWNLOAD_SEGMENTS: int = env.int("DOWNLOAD_SEGMENTS", default=4)
 MAX_PARALLEL_DOWNLOAD: int = env.int("MAX_PARALLEL_DOWNLOAD", default=5)
 MAX_PARALLEL_UPLOAD: int = env.int("MAX_PARALLEL_UPLOAD", default=5)
+# Maximum number of artworks collected in parallel from one message
+MAX_PARALLEL_COLLECTION: int = env.int("MAX_PARALLEL_COLLECTION", default=5)
+# Number of workers in each stage of collection pipeline
+METADATA_WORKERS: int = env.int("METADATA_WORKERS", default=4)
+DOWNLOAD_WORKERS: int = env.int("DOWNLOAD_WORKERS", default=3)
+STORAGE_WORKERS: int = env.int("STORAGE_WORKERS", default=2)
+DATABASE_WORKERS: int = env.int("DATABASE_WORKERS", default=2)
+# Maximum number of items waiting before each pipeline stage
+PIPELINE_QUEUE_SIZE: int = env.int("PIPELINE_QUEUE_SIZE", default=10)
+# Number of workers processing collection jobs
+QUEUE_WORKERS: int = env.int("QUEUE_WORKERS", default=5)
+# Number of processes collecting artworks from the job queue,
+# 0 to collect in the process receiving updates
+WORKER_PROCESSES: int = env.int("WORKER_PROCESSES", default=0)
+# Attempts of a collection job failed with network errors
+QUEUE_RETRIES: int = env.int("QUEUE_RETRIES", default=3)
+# Delay before the first retry of a job in seconds, doubled on each retry
+QUEUE_RETRY_DELAY: int = env.int("QUEUE_RETRY_DELAY", default=30)
+# Maximum requests per second to each host, also applies to its subdomains
+RATE_LIMITS: dict[str, float] = env.dict(
+    "RATE_LIMITS",
+    subcast_values=float,
+    default={},
+)
+# Maximum concurrent requests to each host, also applies to its subdomains
+CONCURRENCY_LIMITS: dict[str, int] = env.dict(
+    "CONCURRENCY_LIMITS",
+    subcast_values=int,
+    default={},
+)
 PROXY: str = env.str("HTTP_PROXY", default=None)
+# Maximum simultaneous connections to each host, 0 for no limit
+CONNECTION_LIMIT_PER_HOST: int = env.int("CONNECTION_LIMIT_PER_HOST", default=10)
+# Idle connections are kept open for reuse for this many seconds
+KEEPALIVE_TIMEOUT: float = env.float("KEEPALIVE_TIMEOUT", default=30)
+# Resolved host addresses are cached for this many seconds
+DNS_CACHE_TTL: int = env.int("DNS_CACHE_TTL", default=300)
 UA: str = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -2,22 +2,61 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import importlib
-from typing import Callable, Optional, Union
+from collections.abc import AsyncIterator
+from typing import ClassVar, Optional, Union
 
 from nazurin.config import DATABASE
+from nazurin.utils.exceptions import NazurinError
 
 
 class Database:
     """Nazurin database manager."""
 
-    def __init__(self):
-        """Dynamically load all database drivers."""
-        module = importlib.import_module("nazurin.database." + DATABASE.lower())
-        self.driver: Callable[..., DatabaseDriver] = getattr(module, DATABASE)
+    instance: ClassVar[Optional[DatabaseDriver]] = None
+
+    @staticmethod
+    def load(name: str) -> type[DatabaseDriver]:
+        """Driver class by its name, e.g. `Mongo`."""
+        module = importlib.import_module("nazurin.database." + name.lower())
+        return getattr(module, name)
+
+    def driver(self) -> DatabaseDriver:
+        """Driver of the configured database, shared by the whole process."""
+        if Database.instance is None:
+            Database.instance = self.load(DATABASE)()
+        return Database.instance
+
+    async def close(self):
+        if Database.instance is None:
+            return
+        driver, Database.instance = Database.instance, None
+        await driver.close()
 
 
 class DatabaseDriver:
+    """
+    A driver instance holds the connection and is shared by the process,
+    `collection` and `document` return handles instead of changing it.
+    """
+
+    async def connect(self):
+        """
+        Connect to the server ahead of first use, called once on startup.
+        Drivers should also work without it.
+        """
+
+    async def close(self):
+        """Release connections, called once on shutdown."""
+
+    def _handle(self, **state) -> DatabaseDriver:
+        """Lightweight copy with `state` changed, sharing the connection."""
+        handle = copy.copy(self)
+        handle.__dict__.update(state)
+        return handle
+
     def collection(self, key: str) -> DatabaseDriver:
         raise NotImplementedError
 
@@ -36,5 +75,68 @@ class DatabaseDriver:
     async def update(self, data: dict) -> bool:
         raise NotImplementedError
 
+    async def exists_many(self, keys: list[Union[str, int]]) -> list[bool]:
+        """
+        Whether each of `keys` exists in the collection.
+        Drivers should override batch methods with a single request.
+        """
+        tasks = [self.document(key).exists() for key in keys]
+        return list(await asyncio.gather(*tasks))
+
+    async def get_many(self, keys: list[Union[str, int]]) -> list[Optional[dict]]:
+        """Documents of `keys` in the collection, `None` if not found."""
+        return list(await asyncio.gather(*(self.document(key).get() for key in keys)))
+
+    async def insert_many(self, documents: dict[Union[str, int], dict]) -> int:
+        """
+        Insert `documents` by their keys, skipping those already existing.
+        Returns the number of documents inserted.
+        """
+        exists = await self.exists_many(list(documents))
+        results = await asyncio.gather(
+            *(
+                self.insert(key, data)
+                for (key, data), existing in zip(documents.items(), exists)
+                if not existing
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            # Inserted by someone else in between
+            if isinstance(result, Exception) and not isinstance(result, NazurinError):
+                raise result
+        return sum(not isinstance(result, Exception) for result in results)
+
     async def delete(self) -> bool:
         raise NotImplementedError
+
+    async def collections(self) -> list[str]:
+        raise NotImplementedError
+
+    def keys(self) -> AsyncIterator[Union[str, int]]:
+        """Keys of all documents in the collection."""
+        raise NotImplementedError
+
+    async def documents(
+        self,
+        batch_size: int = 1000,
+        offset: int = 0,
+    ) -> AsyncIterator[dict[Union[str, int], dict]]:
+        """
+        All documents in the collection, in batches of keys to documents.
+        Fields added by the driver, like the key itself, are left out.
+
+        The first `offset` documents are skipped, e.g. to resume a migration,
+        which relies on documents coming in the same order every time.
+        """
+        keys = []
+        async for key in self.keys():
+            if offset:
+                offset -= 1
+                continue
+            keys.append(key)
+            if len(keys) >= batch_size:
+                yield dict(zip(keys, await self.get_many(keys)))
+                keys = []
+        if keys:
+            yield dict(zip(keys, await self.get_many(keys)))
@@ -1,4 +1,5 @@
 import json
+from collections import OrderedDict
 from typing import Optional
 
 import firebase_admin
@@ -8,6 +9,11 @@ from google.cloud.firestore import AsyncClient
 from nazurin.config import env
 from nazurin.database import DatabaseDriver
 
+# Maximum number of writes in a batch
+BATCH_SIZE = 500
+# Paths of documents known to exist, documents are not deleted in normal operation
+EXISTS_CACHE_SIZE = 50_000
+
 
 class Firebase(DatabaseDriver):
     """Firestore driver of Firebase."""
@@ -15,24 +21,28 @@ class Firebase(DatabaseDriver):
     db: AsyncClient
 
     def __init__(self):
+        self.initialize()
+        self.db = firestore_async.client()
+        self.known: OrderedDict[str, None] = OrderedDict()
+        self._collection = None
+        self._document = None
+
+    @staticmethod
+    def initialize():
         """Load credentials and initialize Firebase app."""
+        if len(firebase_admin._apps) > 0:
+            return
         cert = env.str("GOOGLE_APPLICATION_CREDENTIALS")
         if cert.startswith("{"):
             cert = json.loads(cert)
         cred = credentials.Certificate(cert)
-        if len(firebase_admin._apps) == 0:
-            firebase_admin.initialize_app(cred)
-        self.db = firestore_async.client()
-        self._collection = None
-        self._document = None
+        firebase_admin.initialize_app(cred)
 
     def collection(self, key):
-        self._collection = self.db.collection(str(key))
-        return self
+        return self._handle(_collection=self.db.collection(str(key)))
 
     def document(self, key=None):
-        self._document = self._collection.document(str(key))
-        return self
+        return self._handle(_document=self._collection.document(str(key)))
 
     async def list(self, page_size: Optional[int] = None):
         return self._collection.list_documents(page_size)
@@ -42,16 +52,84 @@ class Firebase(DatabaseDriver):
         return document.to_dict()
 
     async def exists(self) -> bool:
-        document = await self._document.get()
+        if self._is_known(self._document.path):
+            return True
+        # An empty field mask returns no fields, only whether the document exists
+        document = await self._document.get(field_paths=[])
+        if document.exists:
+            self._remember(self._document.path)
         return document.exists
 
     async def insert(self, key, data):
         if key:
-            return await self._collection.document(str(key)).set(data)
+            document = self._collection.document(str(key))
+            result = await document.set(data)
+            self._remember(document.path)
+            return result
         return await self._collection.add(data)
 
+    async def exists_many(self, keys):
+        unknown = [
+            key
+            for key in keys
+            if not self._is_known(self._collection.document(str(key)).path)
+        ]
+        found = await self._get_all(unknown, field_paths=[]) if unknown else {}
+        for snapshot in found.values():
+            if snapshot.exists:
+                self._remember(snapshot.reference.path)
+        return [str(key) not in found or found[str(key)].exists for key in keys]
+
+    async def get_many(self, keys):
+        found = await self._get_all(keys)
+        return [found[str(key)].to_dict() for key in keys]
+
+    async def insert_many(self, documents):
+        exists = await self.exists_many(list(documents))
+        new = [
+            (key, data)
+            for (key, data), existing in zip(documents.items(), exists)
+            if not existing
+        ]
+        for start in range(0, len(new), BATCH_SIZE):
+            batch = self.db.batch()
+            for key, data in new[start : start + BATCH_SIZE]:
+                batch.set(self._collection.document(str(key)), data)
+            await batch.commit()
+            for key, _ in new[start : start + BATCH_SIZE]:
+                self._remember(self._collection.document(str(key)).path)
+        return len(new)
+
+    def _is_known(self, path: str) -> bool:
+        if path in self.known:
+            self.known.move_to_end(path)
+            return True
+        return False
+
+    def _remember(self, path: str):
+        self.known[path] = None
+        self.known.move_to_end(path)
+        if len(self.known) > EXISTS_CACHE_SIZE:
+            self.known.popitem(last=False)
+
+    async def _get_all(self, keys, field_paths=None) -> dict:
+        references = [self._collection.document(str(key)) for key in keys]
+        # Results are not in the order of references
+        return {
+            snapshot.id: snapshot
+            async for snapshot in self.db.get_all(references, field_paths=field_paths)
+        }
+
     async def update(self, data):
         return await self._document.update(data)
 
     async def delete(self):
+        self.known.pop(self._document.path, None)
         return await self._document.delete()
+
+    async def collections(self):
+        return [collection.id async for collection in self.db.collections()]
+
+    async def keys(self):
+        async for document in self._collection.list_documents():
+            yield document.id
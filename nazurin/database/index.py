@@ -0,0 +1,168 @@
+"""In-memory membership index of document keys in collections."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Union
+
+from nazurin.database import DatabaseDriver
+from nazurin.utils import logger
+
+# Initial capacity of Bloom filters, doubled when full
+BLOOM_CAPACITY = 4096
+# False positive rate of Bloom filters
+BLOOM_ERROR_RATE = 0.001
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+Key = Union[int, str]
+
+
+def normalize(key: Key) -> Key:
+    """
+    Use integers for numeric keys, since some drivers store them as strings.
+    """
+
+    if isinstance(key, int):
+        number = key
+    else:
+        key = str(key)
+        if not (key.isascii() and key.isdigit()):
+            return key
+        number = int(key)
+    if INT64_MIN <= number <= INT64_MAX:
+        return number
+    return str(key)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class CollectionIndex:
+    """
+    Keys of a collection, numeric keys are kept in a sorted array,
+    other keys in a Bloom filter that grows by adding larger filters.
+    """
+
+    def __init__(self):
+        self.numbers = array("q")
+        self.filters = [BloomFilter(BLOOM_CAPACITY)]
+
+    def add(self, key: Key):
+        key = normalize(key)
+        if isinstance(key, int):
+            index = bisect_left(self.numbers, key)
+            if index == len(self.numbers) or self.numbers[index] != key:
+                self.numbers.insert(index, key)
+            return
+        if key in self:
+            return
+        if self.filters[-1].full:
+            self.filters.append(BloomFilter(self.filters[-1].capacity * 2))
+        self.filters[-1].add(key)
+
+    def update(self, keys: Iterable[Key]):
+        numbers = set(self.numbers)
+        for key in keys:
+            key = normalize(key)
+            if isinstance(key, int):
+                numbers.add(key)
+            else:
+                self.add(key)
+        self.numbers = array("q", sorted(numbers))
+
+    def __contains__(self, key: Key) -> bool:
+        """
+        Whether the key may exist, `False` means it definitely does not.
+        """
+
+        key = normalize(key)
+        if isinstance(key, int):
+            index = bisect_left(self.numbers, key)
+            return index < len(self.numbers) and self.numbers[index] == key
+        return any(key in bloom for bloom in self.filters)
+
+    def __len__(self) -> int:
+        return len(self.numbers) + sum(bloom.count for bloom in self.filters)
+
+
+class MembershipIndex:
+    """
+    Answer whether a document may exist without querying the database.
+
+    Collections not loaded yet are treated as possibly containing any key.
+    """
+
+    def __init__(self):
+        self.collections: dict[str, CollectionIndex] = {}
+        self._loading: dict[str, CollectionIndex] = {}
+
+    async def load(self, db: DatabaseDriver):
+        start = time.time()
+        try:
+            names = await db.collections()
+        except NotImplementedError:
+            logger.info("Database driver does not support listing collections")
+            return
+        for name in names:
+            await self.load_collection(db, name)
+        logger.info(
+            "Membership index loaded: {} keys in {} collections, took {:.2f}s",
+            sum(len(index) for index in self.collections.values()),
+            len(self.collections),
+            time.time() - start,
+        )
+
+    async def load_collection(self, db: DatabaseDriver, name: str):
+        # Keys inserted while loading are added to the new index as well
+        index = self._loading[name] = CollectionIndex()
+        try:
+            keys = [key async for key in db.collection(name).keys()]
+            index.update(keys)
+            self.collections[name] = index
+        finally:
+            del self._loading[name]
+
+    def add(self, collection: str, key: Key):
+        for indexes in (self.collections, self._loading):
+            if collection in indexes:
+                indexes[collection].add(key)
+
+    def may_contain(self, collection: str, key: Key) -> bool:
+        index = self.collections.get(collection)
+        if index is None:
+            return True
+        return key in index
@@ -1,6 +1,8 @@
+from glob import glob
 from os import path
 
-from tinydb import Query, TinyDB
+from tinydb import JSONStorage, Query, TinyDB
+from tinydb.middlewares import CachingMiddleware
 
 from nazurin.config import DATA_DIR
 from nazurin.database import DatabaseDriver
@@ -12,16 +14,32 @@ class Local(DatabaseDriver):
 
     def __init__(self):
         ensure_existence(DATA_DIR)
+        self.tables: dict[str, TinyDB] = {}
         self.db = None
         self._key = None
 
+    def open(self, key: str) -> TinyDB:
+        """Open the file of collection `key` once and keep its content in memory."""
+        if key not in self.tables:
+            db = TinyDB(
+                path.join(DATA_DIR, key + ".json"),
+                storage=CachingMiddleware(JSONStorage),
+            )
+            # Only cache reads, every write still goes to the file
+            db.storage.WRITE_CACHE_SIZE = 1
+            self.tables[key] = db
+        return self.tables[key]
+
+    async def close(self):
+        for db in self.tables.values():
+            db.close()
+        self.tables.clear()
+
     def collection(self, key):
-        self.db = TinyDB(path.join(DATA_DIR, key + ".json"))
-        return self
+        return self._handle(db=self.open(key))
 
     def document(self, key):
-        self._key = key
-        return self
+        return self._handle(_key=key)
 
     async def get(self):
         document = Query()
@@ -39,6 +57,29 @@ class Local(DatabaseDriver):
             data["key"] = key
         return self.db.insert(data)
 
+    async def exists_many(self, keys):
+        found = {document["key"] for document in self._search(keys)}
+        return [key in found for key in keys]
+
+    async def get_many(self, keys):
+        found = {document["key"]: document for document in self._search(keys)}
+        return [found.get(key) for key in keys]
+
+    async def insert_many(self, documents):
+        exists = await self.exists_many(list(documents))
+        new = [
+            {**data, "key": key}
+            for (key, data), existing in zip(documents.items(), exists)
+            if not existing
+        ]
+        # Written to the file once for all documents
+        self.db.insert_multiple(new)
+        return len(new)
+
+    def _search(self, keys):
+        document = Query()
+        return self.db.search(document.key.one_of(list(keys)))
+
     async def update(self, data):
         document = Query()
         return self.db.update(data, document.key == self._key)
@@ -46,3 +87,26 @@ class Local(DatabaseDriver):
     async def delete(self):
         document = Query()
         return self.db.remove(document.key == self._key)
+
+    async def collections(self):
+        return [
+            path.splitext(path.basename(file))[0]
+            for file in glob(path.join(DATA_DIR, "*.json"))
+        ]
+
+    async def keys(self):
+        for document in self.db.all():
+            if "key" in document:
+                yield document["key"]
+
+    async def documents(self, batch_size=1000, offset=0):
+        # Documents are in memory already, looking up keys would scan them again
+        documents = [document for document in self.db.all() if "key" in document]
+        documents = documents[offset:]
+        for start in range(0, len(documents), batch_size):
+            yield {
+                document["key"]: {
+                    field: value for field, value in document.items() if field != "key"
+                }
+                for document in documents[start : start + batch_size]
+            }
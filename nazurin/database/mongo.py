@@ -1,13 +1,152 @@
+import asyncio
 from functools import lru_cache
 from typing import Optional, Union
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import DuplicateKeyError
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from nazurin.config import env
 from nazurin.database import DatabaseDriver
+from nazurin.utils import logger
 from nazurin.utils.exceptions import NazurinError
 
+DUPLICATE_KEY = 11000
+
+with env.prefixed("MONGO_"):
+    # Acknowledge inserts once buffered in memory and write them in batches
+    WRITE_BEHIND = env.bool("WRITE_BEHIND", default=False)
+    FLUSH_SIZE = env.int("FLUSH_SIZE", default=100)
+    FLUSH_INTERVAL = env.float("FLUSH_INTERVAL", default=1)
+    # Inserts beyond this many buffered documents are written directly
+    BUFFER_LIMIT = env.int("BUFFER_LIMIT", default=1000)
+
+# Longest delay before retrying a failed flush, in seconds
+MAX_FLUSH_BACKOFF = 60
+
+
+async def insert_documents(
+    collection: AsyncIOMotorCollection,
+    documents: dict[Union[str, int], dict],
+) -> int:
+    """Insert `documents` by their keys, skipping existing ones."""
+    if not documents:
+        return 0
+    try:
+        # Unordered, so that duplicates don't stop the rest from being inserted
+        result = await collection.insert_many(
+            [{**data, "_id": key} for key, data in documents.items()],
+            ordered=False,
+        )
+        return len(result.inserted_ids)
+    except BulkWriteError as error:
+        if any(
+            write_error["code"] != DUPLICATE_KEY
+            for write_error in error.details["writeErrors"]
+        ):
+            raise
+        return error.details["nInserted"]
+
+
+class WriteBuffer:
+    """
+    Inserts waiting to be written, flushed in batches
+    when `FLUSH_SIZE` documents are buffered or after `FLUSH_INTERVAL` seconds.
+
+    Buffered documents stay visible to reads until written,
+    so that duplicates are still detected.
+
+    Failed flushes are retried with exponential backoff,
+    at most `BUFFER_LIMIT` documents are kept in the meantime.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.pending: dict[str, dict[Union[str, int], dict]] = {}
+        self.flushing: dict[str, dict[Union[str, int], dict]] = {}
+        self.size = 0
+        self.lock: Optional[asyncio.Lock] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+        self.failures = 0
+        # Loop time before which flushes are not retried after a failure
+        self.retry_at = 0.0
+
+    def get(self, collection: str, key: Union[str, int]) -> Optional[dict]:
+        for documents in (self.pending, self.flushing):
+            document = documents.get(collection, {}).get(key)
+            if document is not None:
+                return document
+        return None
+
+    async def add(self, collection: str, key: Union[str, int], data: dict) -> bool:
+        """
+        Buffer an insert, returns `False` if the buffer is full
+        and the document should be written directly instead.
+        """
+        if self.get(collection, key) is not None:
+            raise NazurinError("Already exists in database.")
+        if self.size >= BUFFER_LIMIT:
+            return False
+        self.pending.setdefault(collection, {})[key] = {**data, "_id": key}
+        self.size += 1
+        loop = asyncio.get_running_loop()
+        # Don't wait on a failing database for every insert, the timer retries
+        if self.size >= FLUSH_SIZE and loop.time() >= self.retry_at:
+            await self.flush()
+        elif not self.timer:
+            delay = max(FLUSH_INTERVAL, self.retry_at - loop.time())
+            self.timer = loop.call_later(delay, self.schedule_flush)
+        return True
+
+    def schedule_flush(self):
+        self.timer = None
+        self.task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            self.flushing, self.pending, self.size = self.pending, {}, 0
+            try:
+                for collection, documents in self.flushing.items():
+                    await insert_documents(self.db[collection], documents)
+                self.failures = 0
+                self.retry_at = 0.0
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                self.failures += 1
+                delay = min(FLUSH_INTERVAL * 2**self.failures, MAX_FLUSH_BACKOFF)
+                logger.error(
+                    "Failed to write buffered documents: {}, retry in {} seconds",
+                    error,
+                    delay,
+                )
+                # Written documents are skipped as duplicates next time
+                for collection, documents in self.flushing.items():
+                    self.pending.setdefault(collection, {}).update(documents)
+                self.size = sum(len(documents) for documents in self.pending.values())
+                loop = asyncio.get_running_loop()
+                self.retry_at = loop.time() + delay
+                if not self.timer:
+                    self.timer = loop.call_later(delay, self.schedule_flush)
+            finally:
+                self.flushing = {}
+
+    async def close(self):
+        await self.flush()
+        if self.size:
+            logger.error("{} buffered documents are not written", self.size)
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
 
 class Mongo(DatabaseDriver):
     """MongoDB driver for MongoDB Atlas or local server."""
@@ -15,6 +154,7 @@ class Mongo(DatabaseDriver):
     def __init__(self):
         """Load credentials and initialize client."""
         self.db = self.get_database()
+        self.buffer = WriteBuffer(self.db) if WRITE_BEHIND else None
         self._collection = None
         self._document = None
 
@@ -25,22 +165,50 @@ class Mongo(DatabaseDriver):
         client = AsyncIOMotorClient(uri)
         return client.get_default_database()
 
+    async def connect(self):
+        await self.db.command("ping")
+
+    async def close(self):
+        if self.buffer:
+            await self.buffer.close()
+        self.db.client.close()
+        Mongo.get_database.cache_clear()
+
+    async def flush(self):
+        """Write buffered inserts before operations that can't see the buffer."""
+        if self.buffer:
+            await self.buffer.flush()
+
+    def buffered(self, key: Union[str, int]) -> Optional[dict]:
+        if not self.buffer:
+            return None
+        return self.buffer.get(self._collection.name, key)
+
     def collection(self, key: str):
-        self._collection = self.db[key]
-        return self
+        return self._handle(_collection=self.db[key])
 
     def document(self, key: Union[str, int]):
-        self._document = key
-        return self
+        return self._handle(_document=key)
 
     async def get(self) -> Optional[dict]:
+        document = self.buffered(self._document)
+        if document is not None:
+            return document
         return await self._collection.find_one({"_id": self._document})
 
     async def exists(self) -> bool:
+        if self.buffered(self._document) is not None:
+            return True
         count = await self._collection.count_documents({"_id": self._document}, limit=1)
         return count > 0
 
     async def insert(self, key: Optional[Union[str, int]], data: dict) -> bool:
+        if key and self.buffer and await self.buffer.add(
+            self._collection.name,
+            key,
+            data,
+        ):
+            return True
         if key:
             data["_id"] = key
         try:
@@ -50,12 +218,56 @@ class Mongo(DatabaseDriver):
             raise NazurinError("Already exists in database.") from error
 
     async def update(self, data: dict) -> bool:
+        await self.flush()
         result = await self._collection.update_one(
             {"_id": self._document},
             {"$set": data},
         )
         return result.modified_count == 1
 
+    async def exists_many(self, keys: list[Union[str, int]]) -> list[bool]:
+        documents = await self.get_many(keys, projection={"_id": 1})
+        return [document is not None for document in documents]
+
+    async def get_many(
+        self,
+        keys: list[Union[str, int]],
+        projection: Optional[dict] = None,
+    ) -> list[Optional[dict]]:
+        # Look into the buffer first, documents may be written in the meantime
+        found = {key: self.buffered(key) for key in keys}
+        missing = [key for key, document in found.items() if document is None]
+        if missing:
+            cursor = self._collection.find({"_id": {"$in": missing}}, projection)
+            found.update({document["_id"]: document async for document in cursor})
+        return [found[key] for key in keys]
+
+    async def insert_many(self, documents: dict[Union[str, int], dict]) -> int:
+        await self.flush()
+        return await insert_documents(self._collection, documents)
+
     async def delete(self) -> bool:
+        await self.flush()
         result = await self._collection.delete_one({"_id": self._document})
         return result.deleted_count == 1
+
+    async def collections(self) -> list[str]:
+        await self.flush()
+        return await self.db.list_collection_names()
+
+    async def keys(self):
+        await self.flush()
+        async for document in self._collection.find({}, {"_id": 1}):
+            yield document["_id"]
+
+    async def documents(self, batch_size=1000, offset=0):
+        await self.flush()
+        batch = {}
+        cursor = self._collection.find({}, batch_size=batch_size, skip=offset)
+        async for document in cursor:
+            batch[document.pop("_id")] = document
+            if len(batch) >= batch_size:
+                yield batch
+                batch = {}
+        if batch:
+            yield batch
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Optional, Union
+
+from nazurin.config import DATA_DIR, env
+from nazurin.database import DatabaseDriver
+from nazurin.utils.decorators import async_wrap
+from nazurin.utils.exceptions import NazurinError
+from nazurin.utils.helpers import ensure_existence
+
+PATH = env.str("SQLITE_PATH", default=os.path.join(DATA_DIR, "nazurin.db"))
+# Stay below the limit of host parameters in a statement of old SQLite versions
+BATCH_SIZE = 500
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLite(DatabaseDriver):
+    """
+    Local database driver using SQLite.
+
+    Each collection is a table of documents keyed by their ID,
+    documents are stored as JSON.
+    WAL mode allows reading while writing and sharing between processes.
+    """
+
+    def __init__(self, path: str = PATH):
+        ensure_existence(os.path.dirname(path) or ".")
+        # Wait for other processes holding the lock instead of failing immediately
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self.tables: set[str] = set()
+        self._table = None
+        self._key = None
+
+    def _create_table(self):
+        if self._table in self.tables:
+            return
+        # Keys keep their type, so that integer and string IDs don't collide
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(self._table)} "
+            "(key PRIMARY KEY NOT NULL, data TEXT NOT NULL) WITHOUT ROWID",
+        )
+        self.tables.add(self._table)
+
+    def _execute(self, sql: str, *params) -> sqlite3.Cursor:
+        with self.lock, self.connection:
+            self._create_table()
+            return self.connection.execute(
+                sql.format(table=quote(self._table)),
+                params,
+            )
+
+    def _fetch(self, sql: str, *params) -> list[tuple]:
+        # Rows must be fetched before another thread uses the connection
+        with self.lock:
+            return self._execute(sql, *params).fetchall()
+
+    def collection(self, key: str):
+        return self._handle(_table=str(key))
+
+    def document(self, key: Union[str, int]):
+        return self._handle(_key=key)
+
+    @async_wrap
+    def get(self) -> Optional[dict]:
+        rows = self._fetch("SELECT data FROM {table} WHERE key = ?", self._key)
+        return json.loads(rows[0][0]) if rows else None
+
+    @async_wrap
+    def exists(self) -> bool:
+        return bool(self._fetch("SELECT 1 FROM {table} WHERE key = ?", self._key))
+
+    @async_wrap
+    def insert(self, key: Optional[Union[str, int]], data: dict) -> bool:
+        try:
+            self._execute(
+                "INSERT INTO {table} (key, data) VALUES (?, ?)",
+                key if key is not None else uuid.uuid4().hex,
+                json.dumps(data, ensure_ascii=False),
+            )
+        except sqlite3.IntegrityError as error:
+            raise NazurinError("Already exists in database.") from error
+        return True
+
+    def _fetch_many(self, sql: str, keys: list[Union[str, int]]) -> list[tuple]:
+        rows = []
+        for start in range(0, len(keys), BATCH_SIZE):
+            batch = keys[start : start + BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows += self._fetch(sql.replace("?", placeholders), *batch)
+        return rows
+
+    @async_wrap
+    def exists_many(self, keys: list[Union[str, int]]) -> list[bool]:
+        rows = self._fetch_many("SELECT key FROM {table} WHERE key IN (?)", keys)
+        found = {row[0] for row in rows}
+        return [key in found for key in keys]
+
+    @async_wrap
+    def get_many(self, keys: list[Union[str, int]]) -> list[Optional[dict]]:
+        found = dict(
+            self._fetch_many("SELECT key, data FROM {table} WHERE key IN (?)", keys),
+        )
+        return [json.loads(found[key]) if key in found else None for key in keys]
+
+    @async_wrap
+    def insert_many(self, documents: dict[Union[str, int], dict]) -> int:
+        with self.lock, self.connection:
+            self._create_table()
+            before = self.connection.total_changes
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO {quote(self._table)} (key, data) VALUES (?, ?)",
+                (
+                    (key, json.dumps(data, ensure_ascii=False))
+                    for key, data in documents.items()
+                ),
+            )
+            return self.connection.total_changes - before
+
+    @async_wrap
+    def update(self, data: dict) -> bool:
+        with self.lock, self.connection:
+            self._create_table()
+            # Other processes may update in between, lock before reading
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(
+                f"SELECT data FROM {quote(self._table)} WHERE key = ?",
+                (self._key,),
+            ).fetchone()
+            if not row:
+                return False
+            document = {**json.loads(row[0]), **data}
+            self.connection.execute(
+                f"UPDATE {quote(self._table)} SET data = ? WHERE key = ?",
+                (json.dumps(document, ensure_ascii=False), self._key),
+            )
+        return True
+
+    @async_wrap
+    def delete(self) -> bool:
+        cursor = self._execute("DELETE FROM {table} WHERE key = ?", self._key)
+        return cursor.rowcount == 1
+
+    @async_wrap
+    def collections(self) -> list[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'",
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    async def keys(self):
+        for key in await self._keys():
+            yield key
+
+    @async_wrap
+    def _keys(self) -> list[Union[str, int]]:
+        return [row[0] for row in self._fetch("SELECT key FROM {table}")]
+
+    async def close(self):
+        with self.lock:
+            self.connection.close()
@@ -1,6 +1,8 @@
 import asyncio
+import signal
 import time
-from typing import ClassVar
+from html import escape
+from typing import ClassVar, Optional
 from urllib.parse import urljoin
 
 from aiogram import Bot, Dispatcher, F
@@ -14,13 +16,20 @@ from aiohttp import web
 from nazurin import config
 from nazurin.config import FeedbackType
 from nazurin.utils import logger
-from nazurin.utils.exceptions import AlreadyExistsError
+from nazurin.utils.exceptions import AlreadyExistsError, NazurinError
 from nazurin.utils.filters import URLFilter
+from nazurin.utils.helpers import format_error, reply_error
 
-from .bot import NazurinBot
+from .bot import CollectionResult, NazurinBot
 from .commands import CommandsManager
 from .middleware import AuthMiddleware, LoggingMiddleware
+from .queue import Job, JobQueue
 from .server import NazurinServer
+from .workers import WorkerPool
+
+
+# Worker processes are not woken up by enqueued jobs, poll more frequently instead
+WORKER_POLL_INTERVAL = 1
 
 
 class NazurinDispatcher(Dispatcher):
@@ -35,7 +44,9 @@ class NazurinDispatcher(Dispatcher):
         self.message.middleware(LoggingMiddleware())
         # self.message.middleware(ChatActionMiddleware())
 
-        self.server = NazurinServer(bot)
+        self.queue = JobQueue(self.process_job, self.on_job_error)
+        self.server = NazurinServer(self.queue)
+        self.workers: Optional[WorkerPool] = None
 
         self.startup.register(self.on_startup)
         self.shutdown.register(self.on_shutdown)
@@ -88,11 +99,42 @@ class NazurinDispatcher(Dispatcher):
                 allowed_updates=self.allowed_updates,
                 drop_pending_updates=True,
             )
+        if self.workers:
+            # Only receive updates here, jobs are resumed before workers start
+            await self.queue.start(workers=0)
+            self.workers.start()
+            return
         await self.bot.on_startup()
+        await self.queue.start()
 
     async def on_shutdown(self, *_args):
+        if self.workers:
+            await self.workers.stop()
+        await self.queue.stop()
         await self.bot.on_shutdown()
 
+    async def work(self):
+        """
+        Run as a worker process, collecting artworks from the shared job queue
+        until interrupted.
+        """
+
+        self.bot.init()
+        # Other processes are saving to the same database
+        self.bot.exclusive = False
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopping.set)
+        await self.bot.on_startup()
+        await self.queue.start(recover=False, poll_interval=WORKER_POLL_INTERVAL)
+        try:
+            await stopping.wait()
+        finally:
+            await self.queue.stop()
+            await self.bot.on_shutdown()
+            await self.bot.session.close()
+
     async def feed_update(self, bot: Bot, update: Update, **kwargs):
         with logger.contextualize(request=f"update:{update.update_id}"):
             return await super().feed_update(bot, update, **kwargs)
@@ -100,6 +142,14 @@ class NazurinDispatcher(Dispatcher):
     def start(self):
         logger.info("Starting...")
         self.init()
+        if config.WORKER_PROCESSES:
+            if config.DATABASE == "Local":
+                logger.warning(
+                    "Local database can't be shared between processes, "
+                    "collecting in a single process",
+                )
+            else:
+                self.workers = WorkerPool(config.WORKER_PROCESSES)
         if config.ENV == "production":
             logger.info("Set webhook")
             handler = SimpleRequestHandler(
@@ -139,24 +189,88 @@ class NazurinDispatcher(Dispatcher):
             await self.bot.delete_webhook(drop_pending_updates=True)
 
     async def update_collection(self, message: Message, urls: list[str]):
-        try:
-            await self.bot.update_collection(urls, message)
-            if config.FEEDBACK_TYPE in [
-                FeedbackType.REPLY,
-                FeedbackType.BOTH,
-            ]:
-                current_time = time.time()
-                if current_time - self._last_reply_time > 2.0:
-                    self._last_reply_time = current_time
-                    await message.reply("Done!")
-            if config.FEEDBACK_TYPE in [
-                FeedbackType.REACTION,
-                FeedbackType.BOTH,
-            ]:
-                await message.react([ReactionTypeEmoji(emoji="❤")])
-        except AlreadyExistsError as error:
+        await self.queue.enqueue(urls, message.model_dump_json(exclude_none=True))
+        if config.FEEDBACK_TYPE in [
+            FeedbackType.REACTION,
+            FeedbackType.BOTH,
+        ]:
+            await message.react([ReactionTypeEmoji(emoji="👀")])
+        elif config.FEEDBACK_TYPE == FeedbackType.REPLY:
+            await message.reply("Queued, collecting...")
+
+    def restore_message(self, job: Job) -> Optional[Message]:
+        if not job.message:
+            return None
+        return Message.model_validate_json(job.message, context={"bot": self.bot})
+
+    async def process_job(self, job: Job):
+        message = self.restore_message(job)
+        results = await self.bot.update_collection(job.urls, message)
+        if not message:
+            # Requested through the API, report to admin instead
+            if len(results) > 1:
+                text = self.summarize(results)
+            else:
+                text = f"Successfully collected {escape(job.urls[0], quote=False)}"
+            await self.bot.send_message(config.ADMIN_ID, text)
+            return
+        if len(results) > 1:
+            await message.reply(self.summarize(results))
+        elif config.FEEDBACK_TYPE in [
+            FeedbackType.REPLY,
+            FeedbackType.BOTH,
+        ]:
             current_time = time.time()
-            # Rate limiting: only allow 1 error reply per second
             if current_time - self._last_reply_time > 2.0:
-                await message.reply(error.msg)
                 self._last_reply_time = current_time
+                await message.reply("Done!")
+        if config.FEEDBACK_TYPE in [
+            FeedbackType.REACTION,
+            FeedbackType.BOTH,
+        ] and any(result.error is None for result in results):
+            await message.react([ReactionTypeEmoji(emoji="❤")])
+
+    @staticmethod
+    def summarize(results: list[CollectionResult]) -> str:
+        collected = sum(1 for result in results if result.error is None)
+        lines = [f"Collected {collected} / {len(results)}:"]
+        for result in results:
+            url = escape(result.url, quote=False)
+            error = result.error
+            if error is None:
+                lines.append(f"✅ {url}")
+            elif isinstance(error, AlreadyExistsError):
+                lines.append(f"⚪️ {url}: Already exists")
+            elif isinstance(error, NazurinError):
+                lines.append(f"❌ {url}: {escape(error.msg, quote=False)}")
+            else:
+                lines.append(f"❌ {url}: {format_error(error)}")
+        return "\n".join(lines)
+
+    async def on_job_error(self, job: Job, error: Exception):
+        message = self.restore_message(job)
+        if not message:
+            await self.report_error(job, error)
+            return
+        if isinstance(error, AlreadyExistsError):
+            current_time = time.time()
+            # Rate limiting: only allow 1 error reply per second
+            if current_time - self._last_reply_time <= 2.0:
+                return
+            self._last_reply_time = current_time
+        await reply_error(message, error)
+
+    async def report_error(self, job: Job, error: Exception):
+        """Report errors of jobs requested through the API to admin."""
+        if isinstance(error, NazurinError):
+            detail = escape(error.msg, quote=False)
+        elif isinstance(error, asyncio.TimeoutError):
+            detail = "Timeout, please try again."
+        else:
+            logger.opt(exception=error).error("{}: {}", type(error), error)
+            detail = format_error(error)
+        urls = escape(", ".join(job.urls), quote=False)
+        await self.bot.send_message(
+            config.ADMIN_ID,
+            f"Error processing {urls}: {detail}",
+        )
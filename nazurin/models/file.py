@@ -1,14 +1,17 @@
 import os
 import pathlib
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
 import aiofiles
 import aiofiles.os
+from humanize import naturalsize
 
 from nazurin.config import STORAGE_DIR, TEMP_DIR
-from nazurin.utils import logger
+from nazurin.utils import logger, metrics
 from nazurin.utils.decorators import network_retry
+from nazurin.utils.download import hash_file
 from nazurin.utils.helpers import (
     ensure_existence_async,
     sanitize_filename,
@@ -22,6 +25,10 @@ class File:
     name: str
     url: str = None
     _destination: str = ""
+    # Digests of the downloaded file, e.g. `{"md5": ..., "sha256": ...}`
+    hashes: dict[str, str] = field(default_factory=dict, init=False)
+    # Digests given by the site to verify the download against
+    checksums: dict[str, str] = field(default_factory=dict, init=False)
 
     def __post_init__(self):
         self.name = sanitize_filename(self.name)
@@ -56,7 +63,28 @@ class File:
             return stat.st_size
         return None
 
+    @property
+    def verified(self) -> Optional[bool]:
+        """
+        Whether the downloaded file matches digests given by the site,
+        `None` if there's nothing to compare.
+        """
+        names = self.hashes.keys() & self.checksums.keys()
+        if not names:
+            return None
+        return all(self.hashes[name] == self.checksums[name].lower() for name in names)
+
+    async def hash(self) -> dict[str, str]:
+        """Digests of the downloaded file, computed on first use."""
+        if not self.hashes:
+            self.hashes = await hash_file(self.path)
+        return self.hashes
+
     async def exists(self) -> bool:
+        """
+        Whether the file is downloaded,
+        unfinished downloads stay at `{path}.part` until complete.
+        """
         return (
             os.path.exists(self.path)
             and (await aiofiles.os.stat(self.path)).st_size != 0
@@ -64,12 +92,27 @@ class File:
 
     @network_retry
     async def download(self, session: NazurinRequestSession) -> Optional[int]:
+        self.hashes = {}
         if await self.exists():
             logger.info("File {} already exists", self.path)
+            if self.checksums:
+                await self.hash()
             return await self.size()
         await ensure_existence_async(TEMP_DIR)
         logger.info("Downloading {} to {}...", self.url, self.path)
-        await session.download(self.url, self.path)
+        started = time.perf_counter()
+        digests = await session.download(self.url, self.path)
+        elapsed = time.perf_counter() - started
+        self.hashes = digests or {}
+        if self.checksums:
+            # Resumed and segmented downloads are hashed afterwards
+            await self.hash()
         size = await self.size()
-        logger.info("Downloaded to {}, size = {}", self.path, size)
+        logger.info(
+            "Downloaded to {}, size = {}, {}/s",
+            self.path,
+            size,
+            naturalsize((size or 0) / max(elapsed, 1e-9), binary=True),
+        )
+        metrics.DOWNLOADED_BYTES.labels(site=metrics.current_site.get()).inc(size or 0)
         return size
@@ -5,9 +5,10 @@ from typing import Optional
 import aiohttp
 from humanize import naturalsize
 
-from nazurin.utils import Request, logger
+from nazurin.utils import logger, metrics
 from nazurin.utils.exceptions import NazurinError
 from nazurin.utils.helpers import check_image
+from nazurin.utils.network import sessions
 
 from .file import File
 
@@ -75,7 +76,7 @@ class Image(File):
         self._size = self._size or await super().size()
         if self._size:
             return self._size
-        async with Request(**kwargs) as request, request.head(self.url) as response:
+        async with sessions.get(**kwargs).head(self.url) as response:
             headers = response.headers
             if "Content-Length" in headers:
                 self._size = int(headers["Content-Length"])
@@ -100,8 +101,18 @@ class Image(File):
     async def download(self, session: aiohttp.ClientSession):
         for i in range(INVALID_IMAGE_RETRIES):
             downloaded_size = await super().download(session)
-            is_valid = await check_image(self.path)
             attempt_count = f"{i + 1} / {INVALID_IMAGE_RETRIES}"
+            verified = self.verified
+            if verified:
+                # Same file as the site has, no need to decode it
+                return
+            is_valid = False
+            if verified is None:
+                with metrics.STAGE_DURATION.labels(
+                    stage="image_check",
+                    site=metrics.current_site.get(),
+                ).time():
+                    is_valid = await check_image(self.path)
             if is_valid:
                 if self._size is None or self._size == downloaded_size:
                     return
@@ -111,6 +122,13 @@ class Image(File):
                     self._size,
                     attempt_count,
                 )
+            elif verified is False:
+                logger.warning(
+                    "Downloaded image {} does not match checksums {}, attempt {}",
+                    self.path,
+                    self.checksums,
+                    attempt_count,
+                )
             else:
                 logger.warning(
                     "Downloaded image {} is not valid, attempt {}",
@@ -0,0 +1,200 @@
+"""Staged pipeline with bounded queues between stages."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from nazurin.utils import logger, metrics
+
+# Window to calculate stage throughput in, in seconds
+THROUGHPUT_WINDOW = 300
+
+StageHandler = Callable[[Any], Awaitable[Optional[bool]]]
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    failed: int = 0
+    busy_time: float = 0
+    completions: deque = field(default_factory=deque)
+
+    def record(self, duration: float, *, success: bool):
+        now = time.time()
+        self.busy_time += duration
+        if success:
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.completions.append(now)
+        while self.completions and self.completions[0] < now - THROUGHPUT_WINDOW:
+            self.completions.popleft()
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items finished per minute in the last `THROUGHPUT_WINDOW` seconds.
+        """
+
+        now = time.time()
+        recent = [t for t in self.completions if t >= now - THROUGHPUT_WINDOW]
+        return len(recent) * 60 / THROUGHPUT_WINDOW
+
+    @property
+    def average_time(self) -> float:
+        total = self.processed + self.failed
+        return self.busy_time / total if total else 0
+
+
+class Stage:
+    def __init__(self, name: str, handler: StageHandler, workers: int, size: int):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: Optional[asyncio.Queue] = None
+        self.size = size
+        self.active = 0
+        self.stats = StageStats()
+
+    def __str__(self) -> str:
+        pending = self.queue.qsize() if self.queue else 0
+        return (
+            f"{self.name}: {self.active}/{self.workers} active, {pending} queued, "
+            f"{self.stats.processed} done, {self.stats.failed} failed, "
+            f"{self.stats.throughput:.1f}/min, "
+            f"avg {self.stats.average_time:.2f}s"
+        )
+
+
+@dataclass
+class PipelineTask:
+    item: Any
+    future: asyncio.Future
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+    def enter_context(self) -> list[tuple[contextvars.ContextVar, contextvars.Token]]:
+        """
+        Apply context variables of the submitter, e.g. logging context,
+        to the current worker.
+        """
+
+        return [(var, var.set(value)) for var, value in self.context.items()]
+
+    @staticmethod
+    def exit_context(tokens: list[tuple[contextvars.ContextVar, contextvars.Token]]):
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class Pipeline:
+    """
+    Run items through a series of stages, each with its own workers.
+
+    Stages are connected with bounded queues, a stage blocks when the next one
+    is full, so that a slow stage applies backpressure to the previous ones
+    while different items can be processed in different stages concurrently.
+
+    A stage handler returning `False` finishes the item early.
+    """
+
+    def __init__(self, name: str, size: int = 10):
+        self.name = name
+        self.size = size
+        self.stages: list[Stage] = []
+        self.tasks: list[asyncio.Task] = []
+
+    def stage(self, name: str, handler: StageHandler, workers: int = 1):
+        self.stages.append(Stage(name, handler, workers, self.size))
+        return self
+
+    @property
+    def running(self) -> bool:
+        return len(self.tasks) > 0
+
+    def start(self):
+        for index, stage in enumerate(self.stages):
+            stage.queue = asyncio.Queue(stage.size)
+            items = metrics.PIPELINE_ITEMS
+            items.labels(stage.name, "active").set_function(lambda s=stage: s.active)
+            items.labels(stage.name, "queued").set_function(
+                lambda s=stage: s.queue.qsize() if s.queue else 0,
+            )
+            self.tasks += [
+                asyncio.create_task(
+                    self.work(index),
+                    name=f"{self.name}-{stage.name}-{i}",
+                )
+                for i in range(stage.workers)
+            ]
+        logger.info(
+            "Pipeline {} started: {}",
+            self.name,
+            ", ".join(f"{stage.name} x {stage.workers}" for stage in self.stages),
+        )
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        for stage in self.stages:
+            while stage.queue and not stage.queue.empty():
+                stage.queue.get_nowait().future.cancel()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Put the item into the first stage and wait until it leaves the pipeline.
+        """
+
+        if not self.running:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.stages[0].queue.put(PipelineTask(item, future))
+        return await future
+
+    async def work(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            task: PipelineTask = await stage.queue.get()
+            if task.future.done():
+                continue
+            stage.active += 1
+            tokens = task.enter_context()
+            start = time.time()
+            try:
+                result = await stage.handler(task.item)
+            except asyncio.CancelledError:
+                task.future.cancel()
+                raise
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                stage.stats.record(time.time() - start, success=False)
+                if not task.future.done():
+                    task.future.set_exception(error)
+                continue
+            finally:
+                metrics.STAGE_DURATION.labels(
+                    stage=stage.name,
+                    site=metrics.current_site.get(),
+                ).observe(time.time() - start)
+                stage.active -= 1
+                task.exit_context(tokens)
+            stage.stats.record(time.time() - start, success=True)
+            if next_stage and result is not False:
+                try:
+                    await next_stage.queue.put(task)
+                except asyncio.CancelledError:
+                    task.future.cancel()
+                    raise
+            elif not task.future.done():
+                task.future.set_result(task.item)
+
+    def stats(self) -> str:
+        return "\n".join(str(stage) for stage in self.stages)
@@ -0,0 +1,477 @@
+"""Persistent job queue for collection updates, backed by SQLite."""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from nazurin import config
+from nazurin.utils import logger, metrics
+from nazurin.utils.decorators import async_wrap, exception_predicate
+from nazurin.utils.helpers import ensure_existence
+
+# Interval to look for jobs whose retry delay has elapsed, in seconds
+POLL_INTERVAL = 5
+# Running jobs not renewed within this duration are taken over by other workers,
+# e.g. when the worker process crashed, in seconds
+LEASE_DURATION = 60
+# Finished jobs older than this will be removed on startup, in seconds
+RETENTION = 7 * 86400
+# Interval to update metrics of jobs in each state, in seconds
+METRICS_INTERVAL = 15
+
+
+class JobState(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: int
+    urls: list[str]
+    message: Optional[str]
+    """
+    Serialized `aiogram.types.Message` that triggered this job, if any.
+    """
+    state: JobState
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+JobHandler = Callable[[Job], Awaitable[None]]
+JobErrorHandler = Callable[[Job, Exception], Awaitable[None]]
+
+
+class JobQueue:
+    """
+    Durable queue of collection jobs with a pool of workers.
+
+    Jobs are persisted to SQLite before being acknowledged,
+    unfinished jobs are resumed on startup,
+    and jobs failed with transient errors are retried with exponential backoff.
+
+    The database can be shared by multiple processes:
+    jobs are claimed atomically and leased to the claiming process,
+    leases of running jobs are renewed until they finish.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        error_handler: JobErrorHandler,
+        path: str = os.path.join(config.DATA_DIR, "queue.db"),
+    ):
+        self.handler = handler
+        self.error_handler = error_handler
+        self.path = path
+        self.poll_interval: float = POLL_INTERVAL
+        self.workers: list[asyncio.Task] = []
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def open(self):
+        ensure_existence(os.path.dirname(self.path) or ".")
+        # Wait for other processes holding the lock instead of failing immediately
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    urls TEXT NOT NULL,
+                    message TEXT,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    run_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_until REAL
+                )
+                """,
+            )
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            for column in ("owner TEXT", "lease_until REAL"):
+                if column.split()[0] not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_state_run_at ON jobs (state, run_at)",
+            )
+
+    def close(self):
+        if self._db:
+            self._db.close()
+            self._db = None
+
+    def _execute(self, sql: str, *params) -> sqlite3.Cursor:
+        with self._lock, self._db:
+            return self._db.execute(sql, params)
+
+    @async_wrap
+    def put(self, urls: list[str], message: Optional[str] = None) -> int:
+        now = time.time()
+        cursor = self._execute(
+            "INSERT INTO jobs (urls, message, state, run_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            json.dumps(urls),
+            message,
+            JobState.PENDING.value,
+            now,
+            now,
+            now,
+        )
+        return cursor.lastrowid
+
+    @property
+    def owner(self) -> str:
+        return str(os.getpid())
+
+    @async_wrap
+    def claim(self) -> Optional[Job]:
+        """
+        Take the next due job, or a running job whose lease has expired,
+        and mark it as running by this process.
+
+        Expired jobs that have used up their attempts are failed instead,
+        they are likely to crash workers again.
+        """
+
+        while True:
+            now = time.time()
+            with self._lock, self._db:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE (state = ? AND run_at <= ?) "
+                    "OR (state = ? AND lease_until < ?) ORDER BY run_at, id LIMIT 1",
+                    (JobState.PENDING.value, now, JobState.RUNNING.value, now),
+                ).fetchone()
+                if not row:
+                    return None
+                if (
+                    row["state"] == JobState.RUNNING.value
+                    and row["attempts"] >= config.QUEUE_RETRIES
+                ):
+                    self._db.execute(
+                        "UPDATE jobs SET state = ?, error = ?, updated_at = ? "
+                        "WHERE id = ? AND state = ? AND attempts = ?",
+                        (
+                            JobState.FAILED.value,
+                            "Worker stopped while running the job",
+                            now,
+                            row["id"],
+                            row["state"],
+                            row["attempts"],
+                        ),
+                    )
+                    logger.error(
+                        "Job {} failed: interrupted after {} attempts",
+                        row["id"],
+                        row["attempts"],
+                    )
+                    continue
+                # Only succeeds if no other process has claimed it in the meantime
+                claimed = self._db.execute(
+                    "UPDATE jobs SET state = ?, attempts = attempts + 1, owner = ?, "
+                    "lease_until = ?, updated_at = ? "
+                    "WHERE id = ? AND state = ? AND attempts = ?",
+                    (
+                        JobState.RUNNING.value,
+                        self.owner,
+                        now + LEASE_DURATION,
+                        now,
+                        row["id"],
+                        row["state"],
+                        row["attempts"],
+                    ),
+                ).rowcount
+            if claimed:
+                break
+        return Job(
+            id=row["id"],
+            urls=json.loads(row["urls"]),
+            message=row["message"],
+            state=JobState.RUNNING,
+            attempts=row["attempts"] + 1,
+            error=row["error"],
+        )
+
+    @async_wrap
+    def renew(self, job: Job):
+        self._execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ?",
+            time.time() + LEASE_DURATION,
+            job.id,
+            self.owner,
+        )
+
+    @async_wrap
+    def release(self, job: Job):
+        """
+        Hand an interrupted job over to other workers.
+        """
+
+        now = time.time()
+        job.state = JobState.PENDING
+        self._execute(
+            "UPDATE jobs SET state = ?, run_at = ?, updated_at = ? "
+            "WHERE id = ? AND owner = ?",
+            job.state.value,
+            now,
+            now,
+            job.id,
+            self.owner,
+        )
+
+    def _finish(self, job: Job, sql: str, *params):
+        """Update a job only if it's still leased to this process."""
+        cursor = self._execute(
+            f"{sql} WHERE id = ? AND owner = ?",
+            *params,
+            job.id,
+            self.owner,
+        )
+        if not cursor.rowcount:
+            logger.warning("Job {} has been taken over, result is discarded", job.id)
+
+    @async_wrap
+    def complete(self, job: Job):
+        job.state = JobState.DONE
+        self._finish(
+            job,
+            "UPDATE jobs SET state = ?, error = NULL, updated_at = ?",
+            job.state.value,
+            time.time(),
+        )
+
+    @async_wrap
+    def retry(self, job: Job, error: str, delay: float):
+        now = time.time()
+        job.state = JobState.PENDING
+        job.error = error
+        self._finish(
+            job,
+            "UPDATE jobs SET state = ?, error = ?, run_at = ?, updated_at = ?",
+            job.state.value,
+            error,
+            now + delay,
+            now,
+        )
+
+    @async_wrap
+    def fail(self, job: Job, error: str):
+        job.state = JobState.FAILED
+        job.error = error
+        self._finish(
+            job,
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ?",
+            job.state.value,
+            error,
+            time.time(),
+        )
+
+    @async_wrap
+    def resume(self) -> int:
+        """
+        Reset jobs interrupted by last shutdown to pending state,
+        or fail them if they have used up their attempts,
+        e.g. when they crashed the process every time.
+        """
+
+        now = time.time()
+        failed = self._execute(
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ? "
+            "WHERE state = ? AND attempts >= ?",
+            JobState.FAILED.value,
+            "Worker stopped while running the job",
+            now,
+            JobState.RUNNING.value,
+            config.QUEUE_RETRIES,
+        ).rowcount
+        if failed:
+            logger.error("Failed {} job(s) interrupted too many times", failed)
+        cursor = self._execute(
+            "UPDATE jobs SET state = ?, run_at = ? WHERE state = ?",
+            JobState.PENDING.value,
+            now,
+            JobState.RUNNING.value,
+        )
+        return cursor.rowcount
+
+    @async_wrap
+    def prune(self, retention: float = RETENTION) -> int:
+        cursor = self._execute(
+            "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?",
+            JobState.DONE.value,
+            JobState.FAILED.value,
+            time.time() - retention,
+        )
+        return cursor.rowcount
+
+    def _count(self, state: JobState) -> int:
+        if not self._db:
+            return 0
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ?",
+                (state.value,),
+            ).fetchone()
+        return row[0]
+
+    count = async_wrap(_count)
+
+    @async_wrap
+    def counts(self) -> dict[JobState, int]:
+        """Number of jobs in each state."""
+        if not self._db:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state",
+            ).fetchall()
+        return {JobState(row[0]): row[1] for row in rows}
+
+    async def update_metrics(self):
+        counts = await self.counts()
+        for state in JobState:
+            metrics.QUEUE_JOBS.labels(state=state.value).set(counts.get(state, 0))
+
+    async def refresh_metrics(self):
+        # Jobs may be updated by other processes, count them periodically
+        # instead of on every scrape, which would block the event loop
+        while True:
+            try:
+                await self.update_metrics()
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                logger.warning("Failed to update queue metrics: {}", error)
+            await asyncio.sleep(METRICS_INTERVAL)
+
+    async def enqueue(self, urls: list[str], message: Optional[str] = None) -> int:
+        job_id = await self.put(urls, message)
+        logger.info("Job {} enqueued: {}", job_id, urls)
+        if self._wakeup:
+            self._wakeup.set()
+        return job_id
+
+    async def start(
+        self,
+        workers: int = config.QUEUE_WORKERS,
+        *,
+        recover: bool = True,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        """
+        Start processing jobs with `workers` workers.
+
+        Unfinished jobs are resumed if `recover` is set,
+        which must only be done when no other process is working on the queue.
+        """
+
+        self.open()
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        if recover:
+            resumed = await self.resume()
+            pruned = await self.prune()
+            if resumed:
+                logger.info("Resumed {} unfinished job(s)", resumed)
+            if pruned:
+                logger.info("Removed {} finished job(s)", pruned)
+        self.workers = [
+            asyncio.create_task(self.work(), name=f"queue-worker-{i}")
+            for i in range(workers)
+        ]
+        self._metrics_task = asyncio.create_task(
+            self.refresh_metrics(),
+            name="queue-metrics",
+        )
+        logger.info("Job queue started with {} worker(s)", workers)
+
+    async def stop(self):
+        tasks = self.workers + ([self._metrics_task] if self._metrics_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self._metrics_task = None
+        self.close()
+
+    async def work(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await self.claim()
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                logger.error("Failed to claim job: {}", error)
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run(job)
+
+    async def run(self, job: Job):
+        with logger.contextualize(request=f"job:{job.id}"):
+            heartbeat = asyncio.create_task(self.heartbeat(job))
+            try:
+                await self.handler(job)
+            except asyncio.CancelledError:
+                await self.release(job)
+                raise
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                await self.handle_error(job, error)
+            else:
+                await self.complete(job)
+                logger.info("Job {} completed", job.id)
+            finally:
+                heartbeat.cancel()
+
+    async def heartbeat(self, job: Job):
+        while True:
+            await asyncio.sleep(LEASE_DURATION / 3)
+            try:
+                await self.renew(job)
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                logger.warning("Failed to renew lease of job {}: {}", job.id, error)
+
+    async def handle_error(self, job: Job, error: Exception):
+        message = f"{type(error).__name__}: {error}"
+        if exception_predicate(error) and job.attempts < config.QUEUE_RETRIES:
+            delay = config.QUEUE_RETRY_DELAY * 2 ** (job.attempts - 1)
+            logger.warning(
+                "Job {} failed with {}, attempt {} / {}, retry in {} seconds",
+                job.id,
+                message,
+                job.attempts,
+                config.QUEUE_RETRIES,
+                delay,
+            )
+            await self.retry(job, message, delay)
+            return
+        logger.error("Job {} failed: {}", job.id, message)
+        await self.fail(job, message)
+        try:
+            await self.error_handler(job, error)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as report_error:
+            logger.exception("Failed to report error of job {}: {}", job.id, report_error)
@@ -1,23 +1,19 @@
-import asyncio
-import traceback
 from json import JSONDecodeError
 
 import aiohttp_cors
 from aiohttp import web
-from aiojobs.aiohttp import setup as setup_jobs
-from aiojobs.aiohttp import spawn
 
 from nazurin import config
-from nazurin.bot import NazurinBot
-from nazurin.utils import logger
-from nazurin.utils.exceptions import NazurinError
-from nazurin.utils.helpers import format_error
+from nazurin.queue import JobQueue
+from nazurin.utils import logger, metrics
 
 
 class NazurinServer(web.Application):
-    def __init__(self, bot: NazurinBot):
+    def __init__(self, queue: JobQueue):
         super().__init__()
-        self.bot = bot
+        # Requests are collected by whoever processes the queue,
+        # which may be another process
+        self.queue = queue
         cors = aiohttp_cors.setup(self)
         resource = cors.add(self.router.add_resource(f"/{config.TOKEN}/api"))
         cors.add(
@@ -29,34 +25,19 @@ class NazurinServer(web.Application):
                 ),
             },
         )
-        setup_jobs(self)
+        if config.METRICS_PATH:
+            self.router.add_get(config.METRICS_PATH, self.metrics_handler)
         self.request_id = 1
 
     def start(self):
         web.run_app(self, access_log_format=config.ACCESS_LOG_FORMAT)
 
-    async def do_update(self, url):
-        try:
-            logger.info("API request: {}", url)
-            await self.bot.update_collection([url])
-            await self.bot.send_message(
-                config.ADMIN_ID,
-                f"Successfully collected {url}",
-            )
-        except NazurinError as error:
-            await self.bot.send_message(
-                config.ADMIN_ID,
-                f"Error processing {url}: {error}",
-            )
-        # pylint: disable-next=broad-exception-caught
-        except Exception as error:
-            traceback.print_exc()
-            if isinstance(error, asyncio.TimeoutError):
-                error = "Timeout, please try again."
-            await self.bot.send_message(
-                config.ADMIN_ID,
-                f"Error processing {url}: {format_error(error)}",
-            )
+    async def metrics_handler(self, _request):
+        return web.Response(
+            text=metrics.generate_latest(),
+            content_type="text/plain",
+            charset="utf-8",
+        )
 
     async def update_handler(self, request):
         try:
@@ -66,6 +47,7 @@ class NazurinServer(web.Application):
         if "url" not in data:
             return web.HTTPBadRequest()
         with logger.contextualize(request=f"request:{self.request_id}"):
-            await spawn(request, self.do_update(data.get("url")))
+            logger.info("API request: {}", data["url"])
+            await self.queue.enqueue([data["url"]])
         self.request_id += 1
         return web.json_response({"error": 0})
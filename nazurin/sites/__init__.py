@@ -1,10 +1,15 @@
 """Nazurin site plugins & plugin manager."""
 
 import re
-from glob import glob
+import sys
+import time
+from functools import cached_property, lru_cache
 from importlib import import_module
-from os import path
-from typing import Callable, Optional
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Optional, Union
+from urllib.parse import urlsplit
 
 from pydantic import BaseModel, ConfigDict
 
@@ -15,13 +20,36 @@ from nazurin.utils.helpers import snake_to_pascal
 
 HandlerResult = tuple[Illust, Document]
 SourceHandler = Callable[[re.Match], HandlerResult]
+# (collection, document ID)
+DocumentKey = tuple[str, Union[int, str]]
+SourceIdentifier = Callable[[re.Match], Optional[DocumentKey]]
+
+SITES_DIR = Path(__file__).parent
 
 
 class Source(BaseModel):
     priority: int
     patterns: list[str]
-    handler: SourceHandler
     name: str
+    handler: Optional[SourceHandler] = None
+    """
+    Handle a match, imported from `module` on first use if not set.
+    """
+    module: Optional[str] = None
+    hosts: list[str] = []
+    """
+    Domains of URLs handled, including their subdomains,
+    or schemes of app links. If empty, the source is tried on every URL.
+    """
+    identify: Optional[SourceIdentifier] = None
+    """
+    Derive the database document of a match without calling site API,
+    return `None` if not possible.
+    """
+
+    @cached_property
+    def regexes(self) -> list[re.Pattern]:
+        return [re.compile(pattern) for pattern in self.patterns]
 
 
 class MatchResult(BaseModel):
@@ -29,65 +57,192 @@ class MatchResult(BaseModel):
 
     match: re.Match
     source: Source
+    url: str
+
+    @property
+    def key(self) -> tuple[str, tuple]:
+        """Identify the matched artwork regardless of URL format."""
+        return self.source.name, self.match.groups()
+
+
+def url_host(url: str) -> str:
+    """Hostname of a URL, or its scheme if it's not a web URL."""
+    if "://" not in url:
+        url = "//" + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return ""
+    if parts.scheme and parts.scheme not in ("http", "https"):
+        return parts.scheme.lower()
+    return parts.hostname or ""
+
+
+def read_manifest(directory: Path) -> Optional[ModuleType]:
+    """
+    Execute `manifest.py` of a site plugin on its own,
+    without importing the plugin package and its dependencies.
+    """
+
+    path = directory / "manifest.py"
+    if not path.exists():
+        return None
+    spec = spec_from_file_location(f"nazurin.sites.{directory.name}.manifest", path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 class SiteManager:
-    """Site plugin manager."""
+    """
+    Site plugin manager.
+
+    A site plugin declares `PRIORITY`, `patterns` and `hosts` in `manifest.py`,
+    which must not import anything. Its `interface` module with `handle`
+    and `identify` is imported on first match, and its API class in `api` module
+    on first use. Only `commands` module is imported on startup
+    to register commands, which should import the rest lazily as well.
+
+    Plugins without a manifest are imported on startup entirely.
+    """
 
     def __init__(self):
         self.sites: dict[str, object] = {}
+        self.plugins: list[str] = []
         self.sources: list[Source] = []
+        # Sources by their hosts, and sources to try on every URL
+        self.hosts: dict[str, list[Source]] = {}
+        self.fallback: list[Source] = []
+        self.candidates = lru_cache(maxsize=1024)(self._candidates)
+        # Time to import each module of plugins in seconds
+        self.import_times: dict[str, float] = {}
+        self.loaded = False
+
+    def import_module(self, name: str) -> ModuleType:
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = import_module(name)
+        self.import_times[name] = time.perf_counter() - start
+        if self.loaded:
+            logger.info("Imported {} in {:.1f} ms", name, self.import_times[name] * 1000)
+        return module
 
     def load(self):
-        """Dynamically load all site plugins."""
-        module_paths = glob("nazurin/sites/*/")
-        for module_path in module_paths:
-            module_name = path.basename(path.normpath(module_path))
-            if module_name.startswith("__"):
+        """Load manifests of all site plugins."""
+        start = time.perf_counter()
+        for directory in sorted(SITES_DIR.iterdir()):
+            name = directory.name
+            if not directory.is_dir() or name.startswith("__"):
                 continue
-
-            module = import_module("nazurin.sites." + module_name)
-            # Store site API class
-            self.sites[module_name.lower()] = getattr(
-                module,
-                snake_to_pascal(module_name),
-            )()
-            if hasattr(module, "patterns") and hasattr(module, "handle"):
-                priority = module.PRIORITY
-                patterns = module.patterns
-                handle = module.handle
-                self.sources.append(
-                    Source(
-                        priority=priority,
-                        patterns=patterns,
-                        handler=handle,
-                        name=module_name,
-                    ),
-                )
-            self.sources.sort(key=lambda s: s.priority, reverse=True)
-        logger.info("Loaded {} sites", len(self.sites))
+            self.plugins.append(name)
+            manifest = read_manifest(directory)
+            if manifest is None:
+                self.load_plugin(name)
+                continue
+            self.register(
+                Source(
+                    priority=manifest.PRIORITY,
+                    patterns=manifest.patterns,
+                    name=name,
+                    hosts=getattr(manifest, "hosts", []),
+                    module=f"nazurin.sites.{name}.interface",
+                ),
+            )
+            if (directory / "commands.py").exists():
+                self.import_module(f"nazurin.sites.{name}.commands")
+        self.loaded = True
+        logger.info(
+            "Loaded {} sites in {:.1f} ms",
+            len(self.plugins),
+            (time.perf_counter() - start) * 1000,
+        )
+        if self.import_times:
+            logger.info("Imported on startup: {}", self.import_report())
+
+    def import_report(self) -> str:
+        """Time to import each module of plugins, slowest first."""
+        times = sorted(self.import_times.items(), key=lambda item: -item[1])
+        return ", ".join(
+            f"{name.removeprefix('nazurin.sites.')} {seconds * 1000:.1f} ms"
+            for name, seconds in times
+        )
+
+    def load_plugin(self, name: str):
+        """Import a plugin without manifest."""
+        module = self.import_module("nazurin.sites." + name)
+        # Store site API class
+        self.sites[name.lower()] = getattr(module, snake_to_pascal(name))()
+        if hasattr(module, "patterns") and hasattr(module, "handle"):
+            self.register(
+                Source(
+                    priority=module.PRIORITY,
+                    patterns=module.patterns,
+                    handler=module.handle,
+                    name=name,
+                    hosts=getattr(module, "hosts", []),
+                    identify=getattr(module, "identify", None),
+                ),
+            )
+
+    def register(self, source: Source):
+        self.sources.append(source)
+        self.sources.sort(key=lambda s: s.priority, reverse=True)
+        for host in source.hosts:
+            self.hosts.setdefault(host.lower(), []).append(source)
+        if not source.hosts:
+            self.fallback.append(source)
+        self.candidates.cache_clear()
+
+    def _candidates(self, host: str) -> list[Source]:
+        """Sources that may handle URLs of `host`, by priority."""
+        labels = host.split(".")
+        sources = {id(source) for source in self.fallback}
+        # Sources of the host itself and every parent domain
+        for i in range(len(labels)):
+            for source in self.hosts.get(".".join(labels[i:]), []):
+                sources.add(id(source))
+        return [source for source in self.sources if id(source) in sources]
 
     def api(self, site: str):
+        if site not in self.sites:
+            if site not in self.plugins:
+                raise KeyError(site)
+            module = self.import_module(f"nazurin.sites.{site}.api")
+            self.sites[site] = getattr(module, snake_to_pascal(site))()
         return self.sites[site]
 
-    def match(self, urls: list[str]) -> Optional[MatchResult]:
-        sources = self.sources
-        urls = str.join(",", urls)
-        result: Optional[MatchResult] = None
-        matched_priority = 0
-
-        for source in sources:
-            if source.priority < matched_priority:
-                break
-            for pattern in source.patterns:
-                match = re.search(pattern, urls)
+    def load_source(self, source: Source):
+        if source.handler is not None:
+            return
+        module = self.import_module(source.module)
+        source.identify = getattr(module, "identify", None)
+        source.handler = module.handle
+
+    def match_url(self, url: str) -> Optional[MatchResult]:
+        """Match a single URL against the source with the highest priority."""
+        for source in self.candidates(url_host(url)):
+            for regex in source.regexes:
+                match = regex.search(url)
                 if match:
-                    result = MatchResult(match=match, source=source)
-                    matched_priority = source.priority
-                    break
-
-        return result
+                    return MatchResult(match=match, source=source, url=url)
+        return None
+
+    def match(self, urls: list[str]) -> list[MatchResult]:
+        """Match every URL and return distinct results in the original order."""
+        results: dict[tuple[str, tuple], MatchResult] = {}
+        for url in urls:
+            result = self.match_url(url)
+            if result and result.key not in results:
+                results[result.key] = result
+        return list(results.values())
+
+    def identify(self, result: MatchResult) -> Optional[DocumentKey]:
+        self.load_source(result.source)
+        identify = result.source.identify
+        return identify(result.match) if identify else None
 
     async def handle_update(self, result: MatchResult) -> HandlerResult:
+        self.load_source(result.source)
         handle = result.source.handler
         return await handle(result.match)
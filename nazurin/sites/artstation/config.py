@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 10
 COLLECTION = "artstation"
 
 with env.prefixed("ARTSTATION_"), env.prefixed("FILE_"):
@@ -1,16 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Artstation
 from .config import COLLECTION
 
-patterns = [
-    # https://www.artstation.com/artwork/2x3LaB
-    # https://catzz.artstation.com/projects/A9ELeq
-    r"artstation\.com/(?:artwork|projects)/([0-9a-zA-Z]+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, match.group(1)
 
 
 async def handle(match: re.Match) -> HandlerResult:
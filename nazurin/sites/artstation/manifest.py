@@ -0,0 +1,10 @@
+"""Artstation site plugin manifest."""
+
+PRIORITY = 10
+
+patterns = [
+    # https://www.artstation.com/artwork/2x3LaB
+    # https://catzz.artstation.com/projects/A9ELeq
+    r"artstation\.com/(?:artwork|projects)/([0-9a-zA-Z]+)",
+]
+hosts = ["artstation.com"]
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 4
 COLLECTION = "bilibili"
 
 with env.prefixed("BILIBILI_"), env.prefixed("FILE_"):
@@ -1,24 +1,14 @@
 import re
+from typing import Optional
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 from nazurin.utils import Request
 from nazurin.utils.exceptions import NazurinError
 
 from .api import Bilibili
 from .config import COLLECTION
-
-patterns = [
-    # https://t.bilibili.com/123456789012345678
-    r"t\.bilibili\.com/(\d+)",
-    # https://t.bilibili.com/h5/dynamic/detail/123456789012345678
-    r"t\.bilibili\.com/h5/dynamic/detail/(\d+)",
-    # https://www.bilibili.com/opus/123456789012345678
-    r"bilibili\.com/opus/(\d+)",
-    r"m\.bilibili\.com/dynamic/(\d+)",
-    # b23.tv/O8xWAlB
-    r"b23.tv/(\w+)",
-]
+from .manifest import patterns
 
 
 async def resolve_b23(b23_url: str) -> str:
@@ -32,6 +22,14 @@ async def resolve_b23(b23_url: str) -> str:
     raise NazurinError("Dynamic not found for b23.tv link")
 
 
+def identify(match: re.Match) -> Optional[DocumentKey]:
+    dynamic_id = match.group(1)
+    # b23.tv short links need to be resolved first
+    if not dynamic_id.isdigit():
+        return None
+    return COLLECTION, int(dynamic_id)
+
+
 async def handle(match: re.Match) -> HandlerResult:
     dynamic_id = match.group(1)
     try:
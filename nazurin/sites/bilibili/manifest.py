@@ -0,0 +1,16 @@
+"""Bilibili dynamic site plugin manifest."""
+
+PRIORITY = 4
+
+patterns = [
+    # https://t.bilibili.com/123456789012345678
+    r"t\.bilibili\.com/(\d+)",
+    # https://t.bilibili.com/h5/dynamic/detail/123456789012345678
+    r"t\.bilibili\.com/h5/dynamic/detail/(\d+)",
+    # https://www.bilibili.com/opus/123456789012345678
+    r"bilibili\.com/opus/(\d+)",
+    r"m\.bilibili\.com/dynamic/(\d+)",
+    # b23.tv/O8xWAlB
+    r"b23.tv/(\w+)",
+]
+hosts = ["bilibili.com", "b23.tv"]
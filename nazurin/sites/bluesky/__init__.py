@@ -1,7 +1 @@
 """Bluesky site plugin."""
-
-from .api import Bluesky
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Bluesky", "handle", "patterns"]
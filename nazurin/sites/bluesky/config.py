@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 10
 COLLECTION = "bluesky"
 
 with env.prefixed("BLUESKY_"), env.prefixed("FILE_"):
@@ -1,16 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Bluesky
 from .config import COLLECTION
 
-patterns = [
-    # https://atproto.com/specs/record-key#record-key-syntax
-    # https://bsky.app/profile/shiratamacaron.bsky.social/post/3kkt7oj5rmw2j
-    r"bsky\.app/profile/([\w\.\-]+)/post/([\w\.\-~]+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, "_".join([match.group(1), match.group(2)])
 
 
 async def handle(match: re.Match) -> HandlerResult:
@@ -0,0 +1,10 @@
+"""Bluesky site plugin manifest."""
+
+PRIORITY = 10
+
+patterns = [
+    # https://atproto.com/specs/record-key#record-key-syntax
+    # https://bsky.app/profile/shiratamacaron.bsky.social/post/3kkt7oj5rmw2j
+    r"bsky\.app/profile/([\w\.\-]+)/post/([\w\.\-~]+)",
+]
+hosts = ["bsky.app"]
@@ -1,8 +1 @@
 """Danbooru site plugin."""
-
-from .api import Danbooru
-from .commands import *  # noqa: F403
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Danbooru", "handle", "patterns"]
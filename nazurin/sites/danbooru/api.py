@@ -67,19 +67,21 @@ class Danbooru:
         files = []
         destination, filename = self.get_storage_dest(post, filename)
         if is_image(url):
-            imgs.append(
-                Image(
-                    filename,
-                    url,
-                    destination,
-                    post["large_file_url"],
-                    post["file_size"],
-                    post["image_width"],
-                    post["image_height"],
-                ),
+            file = Image(
+                filename,
+                url,
+                destination,
+                post["large_file_url"],
+                post["file_size"],
+                post["image_width"],
+                post["image_height"],
             )
+            imgs.append(file)
         else:  # danbooru has non-image posts, such as #animated
-            files.append(File(filename, url, destination))
+            file = File(filename, url, destination)
+            files.append(file)
+        if post.get("md5"):
+            file.checksums["md5"] = post["md5"]
 
         # Build media caption
         tags = post["tag_string"].split(" ")
@@ -4,10 +4,6 @@ from aiogram.types import Message
 from nazurin import bot, dp
 from nazurin.utils.exceptions import InvalidCommandUsageError
 
-from .api import Danbooru
-
-danbooru = Danbooru()
-
 
 @dp.message_handler(
     Command("danbooru"),
@@ -22,7 +18,7 @@ async def danbooru_view(message: Message, command: CommandObject):
     if post_id <= 0:
         await message.reply("Invalid post id!")
         return
-    illust = await danbooru.view(post_id)
+    illust = await bot.sites.api("danbooru").view(post_id)
     await bot.send_illust(illust, message)
 
 
@@ -39,6 +35,6 @@ async def danbooru_download(message: Message, command: CommandObject):
     if post_id <= 0:
         await message.reply("Invalid post id!")
         return
-    illust = await danbooru.view(post_id)
+    illust = await bot.sites.api("danbooru").view(post_id)
     await illust.download()
     await bot.send_docs(illust, message)
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 30
 COLLECTION = "danbooru"
 
 with env.prefixed("DANBOORU_"), env.prefixed("FILE_"):
@@ -1,22 +1,18 @@
 import re
+from typing import Optional
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Danbooru
 from .config import COLLECTION
 
-patterns = [
-    # https://danbooru.donmai.us/posts/123456
-    # https://safebooru.donmai.us/posts/123456
-    r"(?:danbooru|safebooru)\.donmai\.us/posts/(?P<id>\d+)",
-    # https://cdn.donmai.us/original/12/ab/12ab34cd56ef7890ab12cd34ef567890.png
-    r"cdn\.donmai\.us/\w+/(?:[a-f0-9]{2}/){2}(?P<md5>[a-f0-9]{32})\.",
-    # https://danbooru.donmai.us/data/sample/sample-12ab34cd56ef7890ab12cd34ef567890.jpg
-    # https://safebooru.donmai.us/data/___original__drawn_by__12ab34cd56ef7890ab12cd34ef567890.png
-    r"(?:danbooru|safebooru)\.donmai\.us/data/(?:sample/)?(?:\S+)?"
-    r"(?P<md5>[a-f0-9]{32})\.",
-]
+
+def identify(match: re.Match) -> Optional[DocumentKey]:
+    # Post ID can't be derived from MD5 without querying the API
+    if match.lastgroup != "id":
+        return None
+    return COLLECTION, int(match.group(1))
 
 
 async def handle(match: re.Match) -> HandlerResult:
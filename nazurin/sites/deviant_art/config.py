@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 10
 COLLECTION = "deviantart"
 
 with env.prefixed("DEVIANT_ART_"), env.prefixed("FILE_"):
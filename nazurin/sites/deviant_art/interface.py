@@ -1,17 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import DeviantArt
 from .config import COLLECTION
 
-patterns = [
-    # https://www.deviantart.com/username/art/Title-of-Deviation-123456789
-    r"(?:www\.)?deviantart\.com/[\w-]+/art/[\w-]+-(\d+)",
-    # https://username.deviantart.com/art/Title-of-Deviation-123456789
-    r"[\w-]+\.deviantart\.com/art/[\w-]+-(\d+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, match.group(1)
 
 
 async def handle(match: re.Match) -> HandlerResult:
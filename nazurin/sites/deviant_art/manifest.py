@@ -0,0 +1,11 @@
+"""DeviantArt site plugin manifest."""
+
+PRIORITY = 10
+
+patterns = [
+    # https://www.deviantart.com/username/art/Title-of-Deviation-123456789
+    r"(?:www\.)?deviantart\.com/[\w-]+/art/[\w-]+-(\d+)",
+    # https://username.deviantart.com/art/Title-of-Deviation-123456789
+    r"[\w-]+\.deviantart\.com/art/[\w-]+-(\d+)",
+]
+hosts = ["deviantart.com"]
@@ -1,7 +1 @@
 """Gelbooru site plugin."""
-
-from .api import Gelbooru
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Gelbooru", "handle", "patterns"]
@@ -34,19 +34,18 @@ class Gelbooru:
     def get_images(self, post) -> list[Image]:
         """Get images from post."""
         url = post["file_url"]
-        imgs = []
         destination, filename = self.get_storage_dest(post)
-        imgs.append(
-            Image(
-                filename,
-                url,
-                destination,
-                self.get_thumbnail(post),
-                width=post["width"],
-                height=post["height"],
-            ),
+        image = Image(
+            filename,
+            url,
+            destination,
+            self.get_thumbnail(post),
+            width=post["width"],
+            height=post["height"],
         )
-        return imgs
+        if post.get("md5"):
+            image.checksums["md5"] = post["md5"]
+        return [image]
 
     @staticmethod
     def get_storage_dest(post: dict) -> tuple[str, str]:
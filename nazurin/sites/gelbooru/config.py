@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 8
 COLLECTION = "gelbooru"
 
 with env.prefixed("GELBOORU_"), env.prefixed("FILE_"):
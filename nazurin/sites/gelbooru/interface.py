@@ -1,15 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Gelbooru
 from .config import COLLECTION
 
-patterns = [
-    # https://gelbooru.com/index.php?page=post&s=view&id=123456
-    r"gelbooru\.com/index\.php\?page=post&s=view&id=(\d+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, int(match.group(1))
 
 
 async def handle(match: re.Match) -> HandlerResult:
@@ -0,0 +1,9 @@
+"""Gelbooru site plugin manifest."""
+
+PRIORITY = 8
+
+patterns = [
+    # https://gelbooru.com/index.php?page=post&s=view&id=123456
+    r"gelbooru\.com/index\.php\?page=post&s=view&id=(\d+)",
+]
+hosts = ["gelbooru.com"]
@@ -5,9 +5,9 @@ from typing import ClassVar, Union
 
 from nazurin.models import Caption, Illust, Image
 from nazurin.models.file import File
-from nazurin.utils import Request
 from nazurin.utils.decorators import network_retry
 from nazurin.utils.exceptions import NazurinError
+from nazurin.utils.network import sessions
 
 from .config import DESTINATION, FILENAME
 
@@ -19,7 +19,7 @@ class Kemono:
     async def get_post(self, service: str, user_id: str, post_id: str) -> dict:
         """Fetch an post."""
         api = f"{self.API_BASE}/{service}/user/{user_id}/post/{post_id}"
-        async with Request() as request, request.get(api) as response:
+        async with sessions.get().get(api) as response:
             response.raise_for_status()
             post = await response.json()
             if not post:
@@ -39,7 +39,7 @@ class Kemono:
     ) -> dict:
         """Fetch a post revision."""
         api = f"{self.API_BASE}/{service}/user/{user_id}/post/{post_id}/revisions"
-        async with Request() as request, request.get(api) as response:
+        async with sessions.get().get(api) as response:
             response.raise_for_status()
             revisions = await response.json()
             post = None
@@ -56,7 +56,7 @@ class Kemono:
     @network_retry
     async def get_username(self, service: str, user_id: str) -> str:
         url = f"{self.API_BASE}/{service}/user/{user_id}/profile"
-        async with Request() as request, request.get(url) as response:
+        async with sessions.get().get(url) as response:
             response.raise_for_status()
             profile = await response.json()
             return profile.get("name", "")
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 10
 COLLECTION = "kemono"
 
 with env.prefixed("KEMONO_"), env.prefixed("FILE_"):
@@ -0,0 +1,16 @@
+"""Kemono.party site plugin manifest."""
+
+PRIORITY = 10
+
+patterns = [
+    # https://kemono.party/fanbox/user/12345/post/12345
+    # https://kemono.party/patreon/user/12345/post/12345
+    # https://kemono.party/fantia/user/12345/post/12345
+    # https://kemono.party/boosty/user/abcdef/post/a1b2c3-d4e5f6-7890
+    # https://kemono.party/dlsite/user/RG12345/post/RE12345
+    # https://kemono.party/gumroad/user/12345/post/aBc1d2
+    # https://kemono.su/subscribestar/user/abcdef/post/12345
+    # https://kemono.su/fanbox/user/12345/post/12345/revision/12345
+    r"kemono\.(?:party|su)/(\w+)/user/([\w-]+)/post/([\w-]+)(?:/revision/(\d+))?",
+]
+hosts = ["kemono.party", "kemono.su"]
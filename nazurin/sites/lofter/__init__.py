@@ -1,7 +1 @@
 """Lofter site plugin."""
-
-from .api import Lofter
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Lofter", "handle", "patterns"]
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 8
 COLLECTION = "lofter"
 
 with env.prefixed("LOFTER_"), env.prefixed("FILE_"):
@@ -6,11 +6,6 @@ from nazurin.sites import HandlerResult
 from .api import Lofter
 from .config import COLLECTION
 
-patterns = [
-    # https://username.lofter.com/post/1a2b3c4d_1a2b3c4d5
-    r"(\w+)\.lofter\.com/post/(\w+)",
-]
-
 
 async def handle(match: re.Match) -> HandlerResult:
     username = match.group(1)
@@ -0,0 +1,9 @@
+"""Lofter site plugin manifest."""
+
+PRIORITY = 8
+
+patterns = [
+    # https://username.lofter.com/post/1a2b3c4d_1a2b3c4d5
+    r"(\w+)\.lofter\.com/post/(\w+)",
+]
+hosts = ["lofter.com"]
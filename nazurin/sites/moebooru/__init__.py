@@ -1,8 +1 @@
 """Moebooru site plugin."""
-
-from .api import Moebooru
-from .commands import *  # noqa: F403
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Moebooru", "handle", "patterns"]
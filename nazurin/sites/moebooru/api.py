@@ -89,18 +89,18 @@ class Moebooru:
         file_url = post["file_url"]
         name, _ = self.parse_url(file_url)
         destination, filename = self.get_storage_dest(post, name)
-        imgs = [
-            Image(
-                filename,
-                file_url,
-                destination,
-                post["sample_url"],
-                post["file_size"],
-                post["width"],
-                post["height"],
-            ),
-        ]
-        return imgs
+        image = Image(
+            filename,
+            file_url,
+            destination,
+            post["sample_url"],
+            post["file_size"],
+            post["width"],
+            post["height"],
+        )
+        if post.get("md5"):
+            image.checksums["md5"] = post["md5"]
+        return [image]
 
     def get_storage_dest(self, post: dict, filename: str) -> tuple[str, str]:
         """
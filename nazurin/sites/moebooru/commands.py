@@ -4,10 +4,6 @@ from aiogram.types import Message
 from nazurin import bot, dp
 from nazurin.utils.exceptions import InvalidCommandUsageError
 
-from .api import Moebooru
-
-moebooru = Moebooru()
-
 
 @dp.message_handler(
     Command("yandere"),
@@ -22,7 +18,7 @@ async def yandere_view(message: Message, command: CommandObject):
     if post_id < 0:
         await message.reply("Invalid post id!")
         return
-    illust = await moebooru.site("yande.re").view(post_id)
+    illust = await bot.sites.api("moebooru").site("yande.re").view(post_id)
     await bot.send_illust(illust, message)
 
 
@@ -39,7 +35,7 @@ async def yandere_download(message: Message, command: CommandObject):
     if post_id <= 0:
         await message.reply("Invalid post id!")
         return
-    illust = await moebooru.site("yande.re").view(post_id)
+    illust = await bot.sites.api("moebooru").site("yande.re").view(post_id)
     await illust.download()
     await bot.send_docs(illust, message)
 
@@ -57,7 +53,7 @@ async def konachan_view(message: Message, command: CommandObject):
     if post_id < 0:
         await message.reply("Invalid post id!")
         return
-    illust = await moebooru.site("konachan.com").view(post_id)
+    illust = await bot.sites.api("moebooru").site("konachan.com").view(post_id)
     await bot.send_illust(illust, message)
 
 
@@ -74,6 +70,6 @@ async def konachan_download(message: Message, command: CommandObject):
     if post_id <= 0:
         await message.reply("Invalid post id!")
         return
-    illust = await moebooru.site("konachan.com").view(post_id)
+    illust = await bot.sites.api("moebooru").site("konachan.com").view(post_id)
     await illust.download()
     await bot.send_docs(illust, message)
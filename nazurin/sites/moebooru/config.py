@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 15
 COLLECTIONS = {
     "yande.re": "yandere",
     "konachan.com": "konachan",
@@ -1,8 +1 @@
 """Pixiv site plugin."""
-
-from .api import Pixiv
-from .commands import *  # noqa: F403
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Pixiv", "handle", "patterns"]
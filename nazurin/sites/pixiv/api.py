@@ -42,9 +42,6 @@ br_pattern = re.compile(r'<br\s*/?>')
 
 class Pixiv:
     api = AppPixivAPI()
-    db = Database().driver()
-    collection = db.collection(NAZURIN_DATA)
-    document = collection.document(DOCUMENT)
     updated_time = 0
 
     illust_detail = async_wrap(api.illust_detail)
@@ -57,6 +54,14 @@ class Pixiv:
         if TRANSLATION:
             Pixiv.api.set_accept_language(TRANSLATION)
 
+    @property
+    def collection(self):
+        return Database().driver().collection(NAZURIN_DATA)
+
+    @property
+    def document(self):
+        return self.collection.document(DOCUMENT)
+
     async def require_auth(self):
         if (
             Pixiv.api.access_token
@@ -70,7 +75,7 @@ class Pixiv:
             return
 
         # Haven't logged in
-        tokens = await Pixiv.document.get()
+        tokens = await self.document.get()
         if tokens:
             Pixiv.api.access_token = tokens["access_token"]
             Pixiv.api.refresh_token = tokens["refresh_token"]
@@ -87,7 +92,7 @@ class Pixiv:
             Pixiv.api.refresh_token = REFRESH_TOKEN
             await self.auth()
             Pixiv.updated_time = time.time()
-            await Pixiv.collection.insert(
+            await self.collection.insert(
                 DOCUMENT,
                 {
                     "access_token": Pixiv.api.access_token,
@@ -192,7 +197,7 @@ https://www.pixiv.net/stacc/{account}
         """Refresh tokens and cache in database."""
         await self.auth()
         Pixiv.updated_time = time.time()
-        await Pixiv.document.update(
+        await self.document.update(
             {
                 "access_token": Pixiv.api.access_token,
                 "refresh_token": Pixiv.api.refresh_token,
@@ -7,11 +7,8 @@ from aiogram.types import Message
 from nazurin import bot, dp
 from nazurin.utils.exceptions import InvalidCommandUsageError
 
-from .api import Pixiv
 from .config import PixivPrivacy
 
-pixiv = Pixiv()
-
 
 @dp.message_handler(
     Command("pixiv"),
@@ -26,7 +23,7 @@ async def pixiv_view(message: Message, command: CommandObject):
     if artwork_id < 0:
         await message.reply("Invalid artwork id!")
         return
-    illust = await pixiv.view(artwork_id)
+    illust = await bot.sites.api("pixiv").view(artwork_id)
     await bot.send_illust(illust, message)
 
 
@@ -43,7 +40,7 @@ async def pixiv_download(message: Message, command: CommandObject):
     if artwork_id < 0:
         await message.reply("Invalid artwork id!")
         return
-    illust = await pixiv.view(artwork_id)
+    illust = await bot.sites.api("pixiv").view(artwork_id)
     await illust.download()
     await bot.send_docs(illust, message)
 
@@ -64,12 +61,12 @@ async def pixiv_bookmark(message: Message, command: CommandObject):
     privacy = PixivPrivacy.PUBLIC
     if command.command == "pixiv_bookmark_private":
         privacy = PixivPrivacy.PRIVATE
-    await pixiv.bookmark(artwork_id, privacy)
+    await bot.sites.api("pixiv").bookmark(artwork_id, privacy)
     await message.reply("Done!")
 
 
 @dp.message_handler(F.text.regexp(r"(?:www\.)?pixiv\.net/(?:users|u)/(\d+)"))
 async def pixiv_follow(message: Message, regexp: Match):
     user_id = int(regexp.group(1))
-    await pixiv.follow_user(user_id)
+    await bot.sites.api("pixiv").follow_user(user_id)
     await message.reply(f"Successfully followed user {user_id}.")
@@ -8,8 +8,6 @@ class PixivPrivacy(Enum):
     PRIVATE = "private"
 
 
-PRIORITY = 10
-
 COLLECTION = "pixiv"
 DOCUMENT = "pixiv"
 
@@ -1,8 +1 @@
 """Twitter site plugin."""
-
-from .api import Twitter
-from .commands import *  # noqa: F403
-from .config import PRIORITY
-from .interface import handle, patterns
-
-__all__ = ["PRIORITY", "Twitter", "handle", "patterns"]
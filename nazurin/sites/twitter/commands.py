@@ -4,10 +4,6 @@ from aiogram.types import Message
 from nazurin import bot, dp
 from nazurin.utils.exceptions import InvalidCommandUsageError
 
-from .api import Twitter
-
-twitter = Twitter()
-
 
 @dp.message_handler(Command("twitter"), args="STATUS_ID", description="View tweet")
 async def twitter_view(message: Message, command: CommandObject):
@@ -18,7 +14,7 @@ async def twitter_view(message: Message, command: CommandObject):
     if status_id < 0:
         await message.reply("Invalid status id.")
         return
-    illust = await twitter.fetch(status_id)
+    illust = await bot.sites.api("twitter").fetch(status_id)
     await bot.send_illust(illust, message)
 
 
@@ -35,6 +31,6 @@ async def twitter_download(message: Message, command: CommandObject):
     if status_id < 0:
         await message.reply("Invalid status id.")
         return
-    illust = await twitter.fetch(status_id)
+    illust = await bot.sites.api("twitter").fetch(status_id)
     await illust.download()
     await bot.send_docs(illust, message)
@@ -8,7 +8,6 @@ class TwitterAPI(Enum):
     WEB = "web"
 
 
-PRIORITY = 5
 COLLECTION = "twitter"
 
 with env.prefixed("TWITTER_"):
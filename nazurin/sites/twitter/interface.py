@@ -1,18 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Twitter
 from .config import COLLECTION
 
-patterns = [
-    # https://twitter.com/i/web/status/1234567890123456789
-    # https://twitter.com/abcdefg/status/1234567890123456789
-    # https://www.twitter.com/abcdefg/status/1234567890123456789
-    # https://mobile.twitter.com/abcdefg/status/1234567890123456789
-    r"(?:mobile\.|www\.)?(?:twitter|x)\.com/[^.]+/status/(\d+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, int(match.group(1))
 
 
 async def handle(match: re.Match) -> HandlerResult:
@@ -0,0 +1,20 @@
+"""Twitter site plugin manifest."""
+
+PRIORITY = 5
+
+patterns = [
+    # https://twitter.com/i/web/status/1234567890123456789
+    # https://twitter.com/abcdefg/status/1234567890123456789
+    # https://www.twitter.com/abcdefg/status/1234567890123456789
+    # https://mobile.twitter.com/abcdefg/status/1234567890123456789
+    r"(?:mobile\.|www\.)?(?:twitter|x)\.com/[^.]+/status/(\d+)",
+]
+# Including link preview mirrors matched by the patterns above
+hosts = [
+    "twitter.com",
+    "x.com",
+    "fxtwitter.com",
+    "vxtwitter.com",
+    "fixupx.com",
+    "fixvx.com",
+]
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 9
 COLLECTION = "wallhaven"
 
 with env.prefixed("WALLHAVEN_"):
@@ -1,16 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Wallhaven
 from .config import COLLECTION
 
-patterns = [
-    # http://whvn.cc/94x38z
-    # https://wallhaven.cc/w/94x38z
-    r"(?:wallhaven|whvn)\.cc\/(?:w\/)?([\w]+)",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, match.group(1)
 
 
 async def handle(match: re.Match) -> HandlerResult:
@@ -0,0 +1,10 @@
+"""Wallhaven site plugin manifest."""
+
+PRIORITY = 9
+
+patterns = [
+    # http://whvn.cc/94x38z
+    # https://wallhaven.cc/w/94x38z
+    r"(?:wallhaven|whvn)\.cc\/(?:w\/)?([\w]+)",
+]
+hosts = ["wallhaven.cc", "whvn.cc"]
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 5
 COLLECTION = "weibo"
 
 with env.prefixed("WEIBO_"), env.prefixed("FILE_"):
@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 4
 COLLECTION = "Xhs"
 
 with env.prefixed("XHS_"):
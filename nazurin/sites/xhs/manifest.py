@@ -0,0 +1,13 @@
+"""Xhs dynamic site plugin manifest."""
+
+PRIORITY = 4
+
+patterns = [
+    # https://www.xiaohongshu.com/explore/作品ID?xsec_token=XXX
+    # https://www.xiaohongshu.com/discovery/item/作品ID?xsec_token=XXX
+    # https://xhslink.com/分享码
+    r"(https?://www\.xiaohongshu\.com/explore/[a-zA-Z0-9_\-]+(?:\?[^?\s]*)?)",
+    r"(https?://www\.xiaohongshu\.com/discovery/item/[a-zA-Z0-9_\-]+(?:\?[^?\s]*)?)",
+    r"(https?://xhslink\.com/[a-zA-Z0-9_\-/]+)"
+]
+hosts = ["xiaohongshu.com", "xhslink.com"]
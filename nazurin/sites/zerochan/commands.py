@@ -4,10 +4,6 @@ from aiogram.types import Message
 from nazurin import bot, dp
 from nazurin.utils.exceptions import InvalidCommandUsageError
 
-from .api import Zerochan
-
-api = Zerochan()
-
 
 @dp.message_handler(
     Command("zerochan"),
@@ -22,7 +18,7 @@ async def zerochan_view(message: Message, command: CommandObject):
     if post_id < 0:
         await message.reply("Invalid post id!")
         return
-    illust = await api.view(post_id)
+    illust = await bot.sites.api("zerochan").view(post_id)
     await bot.send_illust(illust, message)
 
 
@@ -39,6 +35,6 @@ async def zerochan_download(message: Message, command: CommandObject):
     if post_id <= 0:
         await message.reply("Invalid post id!")
         return
-    illust = await api.view(post_id)
+    illust = await bot.sites.api("zerochan").view(post_id)
     await illust.download()
     await bot.send_docs(illust, message)
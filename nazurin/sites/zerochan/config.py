@@ -1,6 +1,5 @@
 from nazurin.config import env
 
-PRIORITY = 9
 COLLECTION = "zerochan"
 
 with env.prefixed("ZEROCHAN_"), env.prefixed("FILE_"):
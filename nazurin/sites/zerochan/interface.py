@@ -1,18 +1,14 @@
 import re
 
 from nazurin.models import Document
-from nazurin.sites import HandlerResult
+from nazurin.sites import DocumentKey, HandlerResult
 
 from .api import Zerochan
 from .config import COLLECTION
 
-patterns = [
-    # https://www.zerochan.net/123456
-    r"zerochan\.net/(\d+)",
-    # https://s1.zerochan.net/Abcdef.600.123456.jpg
-    # https://static.zerochan.net/Abcdef.full.123456.jpg
-    r"zerochan\.net/\S+\.(\d+)\.\w+$",
-]
+
+def identify(match: re.Match) -> DocumentKey:
+    return COLLECTION, int(match.group(1))
 
 
 async def handle(match: re.Match) -> HandlerResult:
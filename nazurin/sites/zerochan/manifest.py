@@ -0,0 +1,12 @@
+"""Zerochan site plugin manifest."""
+
+PRIORITY = 9
+
+patterns = [
+    # https://www.zerochan.net/123456
+    r"zerochan\.net/(\d+)",
+    # https://s1.zerochan.net/Abcdef.600.123456.jpg
+    # https://static.zerochan.net/Abcdef.full.123456.jpg
+    r"zerochan\.net/\S+\.(\d+)\.\w+$",
+]
+hosts = ["zerochan.net"]
@@ -3,11 +3,12 @@
 import asyncio
 import importlib
 import os
+from functools import lru_cache
 from typing import ClassVar, Callable, TypeVar, Any, Coroutine
 
 from nazurin.config import STORAGE, DANBOORU_SITE_URL, DANBOORU_USERNAME, DANBOORU_API_KEY
-from nazurin.models import Illust
-from nazurin.utils import logger
+from nazurin.models import File, Illust
+from nazurin.utils import logger, metrics
 from .danbooru import MyDanbooru
 from pybooru.exceptions import PybooruHTTPError
 
@@ -27,33 +28,89 @@ def async_wrapper(function: Callable[..., R]) -> Callable[..., Coroutine[Any, An
 class Storage:
     """Storage manager."""
 
-    disks: ClassVar[list[object]] = []
-    danbooru_client: MyDanbooru = MyDanbooru(
-        site_url=DANBOORU_SITE_URL,
-        username=DANBOORU_USERNAME,
-        api_key=DANBOORU_API_KEY,
-    )
+    drivers: ClassVar[dict[str, object]] = {}
 
     def load(self):
-        """Dynamically load all storage drivers."""
-        for driver_name in STORAGE:
-            driver = importlib.import_module("nazurin.storage." + driver_name.lower())
-            self.disks.append(getattr(driver, driver_name)())
-        logger.info("Loaded {} storage(s), using: {}", len(self.disks), STORAGE)
+        """Storage drivers are created on first use, see `driver`."""
+        logger.info("Using storage(s): {}", STORAGE)
+
+    @staticmethod
+    def driver(name: str) -> object:
+        """Create storage driver `name` on first use and keep it for the process."""
+        if name not in Storage.drivers:
+            module = importlib.import_module("nazurin.storage." + name.lower())
+            Storage.drivers[name] = getattr(module, name)()
+        return Storage.drivers[name]
+
+    @property
+    def disks(self) -> list[object]:
+        return [self.driver(name) for name in STORAGE]
+
+    @staticmethod
+    @lru_cache
+    def danbooru_client() -> MyDanbooru:
+        return MyDanbooru(
+            site_url=DANBOORU_SITE_URL,
+            username=DANBOORU_USERNAME,
+            api_key=DANBOORU_API_KEY,
+        )
+
+    async def connect(self):
+        """
+        Create all storage drivers and connect them in parallel.
+        Errors are logged only, drivers will try again on first use.
+        """
+
+        async def connect(name: str):
+            # Constructors may block, e.g. Google Drive authentication
+            driver = await async_wrapper(self.driver)(name)
+            if hasattr(driver, "connect"):
+                await driver.connect()
+
+        results = await asyncio.gather(
+            *(connect(name) for name in STORAGE),
+            return_exceptions=True,
+        )
+        for name, result in zip(STORAGE, results):
+            if isinstance(result, Exception):
+                logger.opt(exception=result).error(
+                    "Failed to connect to storage {}: {}",
+                    name,
+                    result,
+                )
+
+    def danbooru_new_files(self, files: list[File]) -> list[str]:
+        """Paths of files not on Danbooru yet, looked up by their MD5."""
+        md5s = [file.hashes["md5"] for file in files if "md5" in file.hashes]
+        existing = set()
+        if md5s:
+            try:
+                posts = self.danbooru_client().post_list(
+                    tags="md5:" + ",".join(md5s),
+                    limit=len(md5s),
+                )
+                existing = {post["md5"] for post in posts if "md5" in post}
+            except Exception as e:
+                logger.info(f"Unable to look up existing posts: {e}")
+        return [file.path for file in files if file.hashes.get("md5") not in existing]
 
     @async_wrapper
-    def danbooru_upload(self, illust: Illust):
+    def danbooru_upload(self, illust: Illust) -> int:
+        """Upload new files to Danbooru, returns the number of bytes uploaded."""
         danbooru_metadata = illust.danbooru_metadata
         if not danbooru_metadata:
-            return
+            return 0
 
         try:
             artist_detail = danbooru_metadata['artist']
-            self.danbooru_client.artist_create(**artist_detail)
+            self.danbooru_client().artist_create(**artist_detail)
         except Exception as e:
             logger.info(f"Unable to create artists: {e}")
 
-        files = [file.path for file in illust.all_files]
+        files = self.danbooru_new_files(illust.all_files)
+        if not files:
+            logger.info("All files are already on Danbooru")
+            return 0
         tags = [
             danbooru_metadata['artist']['name'],
             danbooru_metadata['tag_str'],
@@ -65,16 +122,16 @@ class Storage:
 
         for _ in range(3):
             try:
-                self.danbooru_client.bulk_upload_then_post(
+                self.danbooru_client().bulk_upload_then_post(
                     files=files,
                     tags=tags,
                     **danbooru_metadata['posts'],
                 )
-                return
+                return sum(os.path.getsize(path) for path in files)
             except PybooruHTTPError as e:
                 if 'Duplicate post' in str(e):
                     logger.info("Duplicate post")
-                    return
+                    return 0
                 logger.exception(e)
                 exception = e
             except Exception as e:
@@ -83,9 +140,15 @@ class Storage:
 
         if exception:
             raise exception
+        return 0
 
     async def store(self, illust: Illust):
-        await self.danbooru_upload(illust)
+        if illust.danbooru_metadata:
+            with metrics.STORAGE_DURATION.labels(driver="Danbooru").time():
+                # Files are looked up on Danbooru by their MD5
+                await asyncio.gather(*(file.hash() for file in illust.all_files))
+                uploaded = await self.danbooru_upload(illust)
+            metrics.UPLOADED_BYTES.labels(driver="Danbooru").inc(uploaded)
 
         for file in illust.all_files:
             try:
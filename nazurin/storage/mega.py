@@ -1,4 +1,5 @@
 import asyncio
+from functools import lru_cache
 from typing import Optional
 
 from mega import Mega as MegaBase
@@ -18,45 +19,57 @@ MEGA_DOCUMENT = "mega"
 
 
 class Mega:
-    api = MegaBase()
-    db = Database().driver()
-    collection = db.collection(NAZURIN_DATA)
-    document = collection.document(MEGA_DOCUMENT)
     destination = None
 
-    api_login = async_wrap(api.login)
-    api_upload = async_wrap(api.upload)
-    create_folder = async_wrap(api.create_folder)
+    @staticmethod
+    @lru_cache
+    def get_api() -> MegaBase:
+        return MegaBase()
+
+    @property
+    def api(self) -> MegaBase:
+        return Mega.get_api()
+
+    @property
+    def collection(self):
+        return Database().driver().collection(NAZURIN_DATA)
+
+    @property
+    def document(self):
+        return self.collection.document(MEGA_DOCUMENT)
+
+    async def connect(self):
+        await self.require_auth()
 
     @network_retry
     async def login(self, *, initialize=False):
-        await Mega.api_login(MEGA_USER, MEGA_PASS)
+        await async_wrap(self.api.login)(MEGA_USER, MEGA_PASS)
         if initialize:
-            await Mega.collection.insert(
+            await self.collection.insert(
                 MEGA_DOCUMENT,
                 {
-                    "sid": Mega.api.sid,
-                    "master_key": list(Mega.api.master_key),
-                    "root_id": Mega.api.root_id,
+                    "sid": self.api.sid,
+                    "master_key": list(self.api.master_key),
+                    "root_id": self.api.root_id,
                 },
             )
         else:
-            await Mega.document.update(
+            await self.document.update(
                 {
-                    "sid": Mega.api.sid,
-                    "master_key": list(Mega.api.master_key),
-                    "root_id": Mega.api.root_id,
+                    "sid": self.api.sid,
+                    "master_key": list(self.api.master_key),
+                    "root_id": self.api.root_id,
                 },
             )
         logger.info("MEGA tokens cached")
 
     async def require_auth(self):
-        if not Mega.api.sid:
-            tokens = await Mega.document.get()
+        if not self.api.sid:
+            tokens = await self.document.get()
             if tokens and "sid" in tokens:
-                Mega.api.sid = tokens["sid"]
-                Mega.api.master_key = tuple(tokens["master_key"])
-                Mega.api.root_id = tokens["root_id"]
+                self.api.sid = tokens["sid"]
+                self.api.master_key = tuple(tokens["master_key"])
+                self.api.root_id = tokens["root_id"]
                 logger.info("MEGA logged in through cached tokens")
             else:  # Initialize database
                 await self.login(initialize=True)
@@ -74,13 +87,13 @@ class Mega:
             destination = (
                 folders[path] if folders else await self.ensure_existence(path)
             )
-            await Mega.api_upload(file.path, destination)
+            await async_wrap(self.api.upload)(file.path, destination)
         except RequestError as error:
             # mega.errors.RequestError:
             # ESID, Invalid or expired user session, please relogin
             if "relogin" in error.message and not retry:
                 logger.info(error)
-                Mega.api.sid = None
+                self.api.sid = None
                 await self.login()
                 await self.upload(file, folders, retry=True)
 
@@ -100,7 +113,7 @@ class Mega:
     @network_retry
     @Cache.lru()
     async def ensure_existence(self, path: str) -> str:
-        result = await Mega.create_folder(path)
+        result = await async_wrap(self.api.create_folder)(path)
         if result.get(path):
             return result[path]
         raise NazurinError("Failed to create folder: " + path)
@@ -29,15 +29,22 @@ UPLOAD_CHUNK_SIZE = 16 * 320 * 1024  # 5MB
 class OneDrive:
     """OneDrive driver."""
 
-    db = Database().driver()
-    collection = db.collection(NAZURIN_DATA)
-    document = collection.document(OD_DOCUMENT)
-
     access_token = None
     refresh_token = None
     expires_at = 0
     folder_id = None
 
+    @property
+    def collection(self):
+        return Database().driver().collection(NAZURIN_DATA)
+
+    @property
+    def document(self):
+        return self.collection.document(OD_DOCUMENT)
+
+    async def connect(self):
+        await self.require_auth()
+
     async def upload(self, file: File):
         """
         Resumable multipart upload.
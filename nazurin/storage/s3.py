@@ -1,5 +1,6 @@
 import mimetypes
 import pathlib
+from functools import lru_cache
 
 from minio import Minio
 
@@ -21,23 +22,30 @@ with env.prefixed("S3_"):
 class S3:
     """S3 driver"""
 
-    client = Minio(
-        endpoint=ENDPOINT,
-        access_key=ACCESS_KEY,
-        secret_key=SECRET_KEY,
-        region=REGION,
-        secure=SECURE,
-    )
+    @staticmethod
+    @lru_cache
+    def get_client() -> Minio:
+        return Minio(
+            endpoint=ENDPOINT,
+            access_key=ACCESS_KEY,
+            secret_key=SECRET_KEY,
+            region=REGION,
+            secure=SECURE,
+        )
 
     @async_wrap
     def check_bucket(self):
-        if not S3.client.bucket_exists(BUCKET):
-            S3.client.make_bucket(BUCKET)
+        client = S3.get_client()
+        if not client.bucket_exists(BUCKET):
+            client.make_bucket(BUCKET)
             logger.info("Bucket created: {}", BUCKET)
 
+    async def connect(self):
+        await self.check_bucket()
+
     @async_wrap
     def upload(self, file: File):
-        S3.client.fput_object(
+        S3.get_client().fput_object(
             bucket_name=BUCKET,
             object_name=pathlib.Path(file.destination, file.name).as_posix(),
             file_path=file.path,
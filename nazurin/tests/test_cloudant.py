@@ -0,0 +1,153 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from nazurin.database.cloudant import Cloudant
+from nazurin.utils.exceptions import NazurinError
+
+
+class CouchDB:
+    """Just enough of CouchDB API in memory."""
+
+    def __init__(self):
+        self.documents = {}
+        self.methods = []
+        self.app = web.Application()
+        self.app.router.add_route("HEAD", "/nazurin", self.database)
+        self.app.router.add_post("/nazurin/_all_docs", self.all_docs)
+        self.app.router.add_get("/nazurin/_all_docs", self.list_docs)
+        self.app.router.add_get(
+            "/nazurin/_partition/{partition}/_all_docs",
+            self.list_docs,
+        )
+        self.app.router.add_post("/nazurin/_bulk_docs", self.bulk_docs)
+        self.app.router.add_route("*", "/nazurin/{id}", self.document)
+
+    async def database(self, _request):
+        return web.Response()
+
+    def put(self, document: dict) -> bool:
+        if document["_id"] in self.documents:
+            return False
+        self.documents[document["_id"]] = {**document, "_rev": "1-a"}
+        return True
+
+    async def document(self, request: web.Request):
+        self.methods.append(request.method)
+        document_id = request.match_info["id"]
+        document = self.documents.get(document_id)
+        if request.method == "PUT":
+            data = await request.json()
+            if document and data.get("_rev") == document["_rev"]:
+                self.documents[document_id] = {**data, "_rev": "2-b"}
+            elif not self.put({**data, "_id": document_id}):
+                return web.json_response({"error": "conflict"}, status=409)
+            return web.json_response({"ok": True}, status=201)
+        if not document:
+            return web.json_response({"error": "not_found"}, status=404)
+        if request.method == "DELETE":
+            del self.documents[document_id]
+            return web.json_response({"ok": True})
+        return web.json_response(document)
+
+    async def all_docs(self, request: web.Request):
+        rows = []
+        for key in (await request.json())["keys"]:
+            if key in self.documents:
+                row = {"id": key, "key": key, "value": {"rev": "1-a"}}
+                if request.query.get("include_docs") == "true":
+                    row["doc"] = self.documents[key]
+                rows.append(row)
+            else:
+                rows.append({"key": key, "error": "not_found"})
+        return web.json_response({"rows": rows})
+
+    async def list_docs(self, request: web.Request):
+        self.methods.append(request.method)
+        ids = sorted(self.documents)
+        partition = request.match_info.get("partition")
+        if partition:
+            ids = [id_ for id_ in ids if id_.startswith(f"{partition}:")]
+        if "startkey" in request.query:
+            startkey = json.loads(request.query["startkey"])
+            ids = [id_ for id_ in ids if id_ >= startkey]
+        ids = ids[int(request.query.get("skip", 0)) :]
+        if "limit" in request.query:
+            ids = ids[: int(request.query["limit"])]
+        rows = []
+        for id_ in ids:
+            row = {"id": id_, "key": id_, "value": {"rev": "1-a"}}
+            if request.query.get("include_docs") == "true":
+                row["doc"] = self.documents[id_]
+            rows.append(row)
+        return web.json_response({"rows": rows})
+
+    async def bulk_docs(self, request: web.Request):
+        results = [
+            {"id": doc["_id"], "ok": True}
+            if self.put(doc)
+            else {"id": doc["_id"], "error": "conflict"}
+            for doc in (await request.json())["docs"]
+        ]
+        return web.json_response(results, status=201)
+
+
+class TestCloudant(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.couchdb = CouchDB()
+        self.server = TestServer(self.couchdb.app)
+        await self.server.start_server()
+        url = str(self.server.make_url("")).rstrip("/")
+        patcher = patch("nazurin.database.cloudant.URL", url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = Cloudant()
+        await self.db.connect()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        await self.server.close()
+
+    async def test_documents(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert(1, {"title": "a"})
+        assert "pixiv:1" in self.couchdb.documents
+        with self.assertRaises(NazurinError):
+            await pixiv.insert(1, {})
+
+        self.couchdb.methods.clear()
+        assert await pixiv.document(1).exists()
+        assert not await pixiv.document(2).exists()
+        assert self.couchdb.methods == ["HEAD", "HEAD"]
+
+        assert await pixiv.document(1).update({"title": "b"})
+        assert (await pixiv.document(1).get())["title"] == "b"
+        assert await pixiv.document(1).delete()
+        assert await pixiv.document(1).get() is None
+
+    async def test_batch(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert(1, {"title": "a"})
+        assert await pixiv.insert_many({1: {}, 2: {"title": "b"}}) == 1
+        assert await pixiv.exists_many([2, 3, 1]) == [True, False, True]
+        documents = await pixiv.get_many([2, 3])
+        assert documents[0]["title"] == "b"
+        assert documents[1] is None
+
+    @patch("nazurin.database.cloudant.PAGE_SIZE", 2)
+    async def test_list_in_pages(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert_many({key: {} for key in range(1, 6)})
+        await self.db.collection("twitter").insert(1, {})
+        self.couchdb.put({"_id": "_design/index"})
+
+        self.couchdb.methods.clear()
+        assert await self.db.collections() == ["pixiv", "twitter"]
+        # One listing for each partition or design document, one to find the end
+        assert len(self.couchdb.methods) == 4
+        self.couchdb.methods.clear()
+        assert sorted([key async for key in pixiv.keys()]) == ["1", "2", "3", "4", "5"]
+        assert len(self.couchdb.methods) == 3
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from nazurin.database import Database, DatabaseDriver
+from nazurin.database.local import Local
+from nazurin.database.sqlite import SQLite
+from nazurin.utils.exceptions import NazurinError
+
+
+class TestLocal(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = patch("nazurin.database.local.DATA_DIR", directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = Local()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+
+    async def test_handles_are_independent(self):
+        pixiv = self.db.collection("pixiv")
+        twitter = self.db.collection("twitter")
+        await pixiv.insert(1, {"title": "a"})
+        await twitter.insert(2, {"title": "b"})
+        first = pixiv.document(1)
+        second = pixiv.document(2)
+        assert await first.exists()
+        assert not await second.exists()
+        assert (await first.get())["title"] == "a"
+        assert await twitter.document(2).exists()
+        assert self.db.db is None
+
+    async def test_collection_opened_once(self):
+        await self.db.collection("pixiv").insert(1, {})
+        assert self.db.collection("pixiv").db is self.db.tables["pixiv"]
+        assert list(self.db.tables) == ["pixiv"]
+
+    async def test_batch(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert(1, {"title": "a"})
+        assert await pixiv.insert_many({1: {}, 2: {"title": "b"}}) == 1
+        assert await pixiv.exists_many([2, 3, 1]) == [True, False, True]
+        documents = await pixiv.get_many([2, 3])
+        assert documents[0]["title"] == "b"
+        assert documents[1] is None
+
+    async def test_documents_in_batches(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert_many({key: {"title": str(key)} for key in range(5)})
+        batches = [batch async for batch in pixiv.documents(batch_size=2)]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0] == {0: {"title": "0"}, 1: {"title": "1"}}
+        resumed = [batch async for batch in pixiv.documents(2, offset=3)]
+        assert resumed == [{3: {"title": "3"}, 4: {"title": "4"}}]
+
+    async def test_writes_reach_file(self):
+        await self.db.collection("pixiv").insert(1, {"title": "a"})
+        other = Local()
+        assert await other.collection("pixiv").document(1).exists()
+        await other.close()
+
+
+class TestSQLite(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "nazurin.db")
+        self.db = SQLite(self.path)
+
+    async def asyncTearDown(self):
+        await self.db.close()
+
+    async def test_documents(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert(1, {"title": "a", "tags": ["b"]})
+        assert await pixiv.document(1).get() == {"title": "a", "tags": ["b"]}
+        assert not await pixiv.document("1").exists()
+        assert not await self.db.collection("twitter").document(1).exists()
+        with self.assertRaises(NazurinError):
+            await pixiv.insert(1, {})
+
+        assert await pixiv.document(1).update({"title": "c"})
+        assert await pixiv.document(1).get() == {"title": "c", "tags": ["b"]}
+        assert not await pixiv.document(2).update({"title": "c"})
+
+        assert sorted(await self.db.collections()) == ["pixiv", "twitter"]
+        assert [key async for key in pixiv.keys()] == [1]
+        assert await pixiv.document(1).delete()
+        assert await pixiv.document(1).get() is None
+
+    async def test_batch(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert(1, {"title": "a"})
+        documents = {key: {"title": str(key)} for key in range(1200)}
+        assert await pixiv.insert_many(documents) == 1199
+        assert await pixiv.document(1).get() == {"title": "a"}
+        keys = [*range(1100, 1300), "1"]
+        exists = await pixiv.exists_many(keys)
+        assert exists == [key in documents for key in keys]
+        assert await pixiv.get_many([5, 1200]) == [{"title": "5"}, None]
+
+    async def test_documents_in_batches(self):
+        pixiv = self.db.collection("pixiv")
+        await pixiv.insert_many({key: {"title": str(key)} for key in range(5)})
+        batches = [batch async for batch in pixiv.documents(batch_size=2)]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0] == {0: {"title": "0"}, 1: {"title": "1"}}
+        resumed = [batch async for batch in pixiv.documents(2, offset=3)]
+        assert resumed == [{3: {"title": "3"}, 4: {"title": "4"}}]
+
+    async def test_shared_file(self):
+        await self.db.collection("pixiv").insert("a", {})
+        other = SQLite(self.path)
+        assert await other.collection("pixiv").document("a").exists()
+        await other.close()
+
+
+class MemoryDriver(DatabaseDriver):
+    def __init__(self):
+        self.data = {}
+        self._key = None
+
+    def collection(self, key):
+        return self
+
+    def document(self, key):
+        return self._handle(_key=key)
+
+    async def get(self):
+        return self.data.get(self._key)
+
+    async def exists(self):
+        return self._key in self.data
+
+    async def insert(self, key, data):
+        if key in self.data:
+            raise NazurinError("Already exists in database.")
+        self.data[key] = data
+
+
+class TestDatabase(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_fallback(self):
+        db = MemoryDriver()
+        await db.insert(1, {"title": "a"})
+        assert await db.insert_many({1: {}, 2: {"title": "b"}}) == 1
+        assert await db.exists_many([1, 2, 3]) == [True, True, False]
+        assert await db.get_many([1, 3]) == [{"title": "a"}, None]
+
+    async def test_driver_shared(self):
+        with patch("nazurin.database.DATABASE", "Local"), patch.object(
+            Database,
+            "instance",
+            None,
+        ):
+            driver = Database().driver()
+            assert Database().driver() is driver
+            await Database().close()
+            assert Database.instance is None
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from aiohttp import ClientPayloadError, ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+from nazurin.utils.download import DownloadSink, hash_file
+from nazurin.utils.network import Request, sessions
+
+DATA = bytes(range(256)) * 64
+ETAG = '"v1"'
+
+
+class DownloadTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ranges = []
+        self.interrupt = False
+        self.accept_ranges = True
+        self.fail_range = None
+        self.truncate_range = None
+        app = web.Application()
+        app.router.add_get("/file", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url("/file"))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.destination = os.path.join(directory.name, "file.bin")
+
+    async def asyncTearDown(self):
+        await sessions.close()
+        await self.server.close()
+
+    async def handle(self, request: web.Request):
+        self.ranges.append(request.headers.get("Range"))
+        headers = {"ETag": ETAG}
+        if self.interrupt:
+            self.interrupt = False
+            response = web.StreamResponse(
+                headers={**headers, "Content-Length": str(len(DATA))},
+            )
+            await response.prepare(request)
+            await response.write(DATA[:1000])
+            # Let the client receive it before the connection drops
+            await asyncio.sleep(0.1)
+            request.transport.close()
+            return response
+        byte_range = request.headers.get("Range")
+        if byte_range and self.accept_ranges and request.headers["If-Range"] == ETAG:
+            if byte_range == self.fail_range:
+                self.fail_range = None
+                return web.Response(status=503)
+            start, end = byte_range[len("bytes=") :].split("-")
+            start, end = int(start), int(end or len(DATA) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(DATA)}"
+            body = DATA[start : end + 1]
+            if byte_range == self.truncate_range:
+                self.truncate_range = None
+                body = body[:100]
+            return web.Response(status=206, body=body, headers=headers)
+        headers["Accept-Ranges"] = "bytes"
+        return web.Response(body=DATA, headers=headers)
+
+    async def download(self):
+        async with Request() as request:
+            return await request.download(self.url, self.destination)
+
+
+class TestResumableDownload(DownloadTestCase):
+    async def test_resume(self):
+        self.interrupt = True
+        with self.assertRaises(ClientPayloadError):
+            await self.download()
+        assert not os.path.exists(self.destination)
+        assert os.path.getsize(self.destination + ".part") == 1000
+
+        # Resumed downloads are hashed afterwards
+        assert await self.download() is None
+        assert self.ranges == [None, "bytes=1000-"]
+        with open(self.destination, "rb") as file:
+            assert file.read() == DATA
+        assert not os.path.exists(self.destination + ".part")
+        assert not os.path.exists(self.destination + ".part.json")
+
+    async def test_restart_when_changed(self):
+        self.interrupt = True
+        with self.assertRaises(ClientPayloadError):
+            await self.download()
+        with open(self.destination + ".part", "wb") as file:
+            file.write(b"changed")
+        with open(self.destination + ".part.json", "w", encoding="utf-8") as file:
+            file.write(f'{{"url": "{self.url}", "etag": "\\"v0\\""}}')
+
+        await self.download()
+        assert self.ranges[-1] == "bytes=7-"
+        with open(self.destination, "rb") as file:
+            assert file.read() == DATA
+
+    async def test_digests(self):
+        digests = await self.download()
+        assert digests == {
+            "md5": hashlib.md5(DATA).hexdigest(),
+            "sha256": hashlib.sha256(DATA).hexdigest(),
+        }
+        assert await hash_file(self.destination) == digests
+
+
+class TestSegmentedDownload(DownloadTestCase):
+    def setUp(self):
+        options = {"SEGMENTED_DOWNLOAD_SIZE": 1000, "DOWNLOAD_SEGMENTS": 4}
+        for name, value in options.items():
+            patcher = patch(f"nazurin.utils.download.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assert_downloaded(self):
+        with open(self.destination, "rb") as file:
+            assert file.read() == DATA
+        assert not os.path.exists(self.destination + ".part.json")
+
+    async def test_segments(self):
+        # Segments are hashed afterwards
+        assert await self.download() is None
+        assert sorted(self.ranges[1:]) == [
+            "bytes=12288-16383",
+            "bytes=4096-8191",
+            "bytes=8192-12287",
+        ]
+        self.assert_downloaded()
+
+    async def test_resume_segments(self):
+        self.fail_range = "bytes=8192-12287"
+        with self.assertRaises(ClientResponseError):
+            await self.download()
+        self.ranges.clear()
+        await self.download()
+        assert self.ranges == ["bytes=8192-12287"]
+        self.assert_downloaded()
+
+    async def test_resume_truncated_segment(self):
+        self.truncate_range = "bytes=8192-12287"
+        with self.assertRaises(ClientPayloadError):
+            await self.download()
+        self.ranges.clear()
+        await self.download()
+        assert self.ranges == ["bytes=8292-12287"]
+        self.assert_downloaded()
+
+    async def test_keep_unwritten_segment(self):
+        write_buffer = DownloadSink.write_buffer
+
+        def fail_segment(sink: DownloadSink, data: bytes):
+            if sink.offset == 8192:
+                raise OSError("No space left on device")
+            write_buffer(sink, data)
+
+        with patch.object(DownloadSink, "write_buffer", fail_segment):
+            with self.assertRaises(OSError):
+                await self.download()
+        self.ranges.clear()
+        await self.download()
+        assert self.ranges == ["bytes=8192-12287"]
+        self.assert_downloaded()
+
+    async def test_fallback_to_single_stream(self):
+        self.accept_ranges = False
+        await self.download()
+        assert self.ranges[-1] is None
+        self.assert_downloaded()
+
+
+class TestDownloadSink(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "file.bin")
+        with open(self.path, "wb") as file:
+            file.write(b"0123456789")
+        patcher = patch("nazurin.utils.download.DOWNLOAD_BUFFER_SIZE", 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_write_at_offset(self):
+        async with DownloadSink(self.path, 2) as sink:
+            for chunk in (b"a", b"bc", b"def"):
+                await sink.write(chunk)
+        assert sink.written == 6
+        with open(self.path, "rb") as file:
+            assert file.read() == b"01abcdef89"
+
+    async def test_keep_received_on_error(self):
+        with self.assertRaises(ClientPayloadError):
+            async with DownloadSink(self.path, truncate=True) as sink:
+                await sink.write(b"ab")
+                raise ClientPayloadError
+        with open(self.path, "rb") as file:
+            assert file.read() == b"ab"
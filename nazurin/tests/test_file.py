@@ -0,0 +1,63 @@
+import hashlib
+import os
+import unittest
+import uuid
+from unittest.mock import patch
+
+from nazurin.models import File, Image
+from nazurin.utils.exceptions import NazurinError
+
+DATA = b"not really an image"
+
+
+class FakeSession:
+    def __init__(self):
+        self.downloads = 0
+
+    async def download(self, _url, destination):
+        self.downloads += 1
+        with open(destination, "wb") as file:
+            file.write(DATA)
+
+
+class TestChecksum(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.image = Image(f"{uuid.uuid4().hex}.png", "https://example.com/image.png")
+        self.session = FakeSession()
+
+    def tearDown(self):
+        if os.path.exists(self.image.path):
+            os.remove(self.image.path)
+
+    async def test_skip_image_check_when_verified(self):
+        self.image.checksums["md5"] = hashlib.md5(DATA).hexdigest().upper()
+        with patch("nazurin.models.image.check_image") as check_image:
+            await self.image.download(self.session)
+        check_image.assert_not_called()
+        assert self.image.verified
+        assert self.image.hashes["sha256"] == hashlib.sha256(DATA).hexdigest()
+
+    async def test_retry_on_mismatch(self):
+        self.image.checksums["md5"] = "0" * 32
+        with self.assertRaises(NazurinError):
+            await self.image.download(self.session)
+        assert self.session.downloads > 1
+        assert self.image.verified is False
+
+    async def test_check_image_without_checksums(self):
+        with self.assertRaises(NazurinError):
+            await self.image.download(self.session)
+        assert self.image.verified is None
+
+    async def test_hash_existing_file_lazily(self):
+        file = File(self.image.name, self.image.url)
+        with open(file.path, "wb") as f:
+            f.write(DATA)
+        with patch("nazurin.models.file.hash_file") as hash_file:
+            await file.download(self.session)
+        hash_file.assert_not_called()
+        assert self.session.downloads == 0
+        assert await file.hash() == {
+            "md5": hashlib.md5(DATA).hexdigest(),
+            "sha256": hashlib.sha256(DATA).hexdigest(),
+        }
@@ -0,0 +1,57 @@
+import unittest
+
+from nazurin.database import DatabaseDriver
+from nazurin.database.index import BloomFilter, CollectionIndex, MembershipIndex
+
+
+class FakeDriver(DatabaseDriver):
+    def __init__(self, data: dict):
+        self.data = data
+        self._collection = None
+
+    def collection(self, key):
+        self._collection = key
+        return self
+
+    async def collections(self):
+        return list(self.data)
+
+    async def keys(self):
+        for key in self.data[self._collection]:
+            yield key
+
+
+class TestMembershipIndex(unittest.IsolatedAsyncioTestCase):
+    def test_bloom_filter(self):
+        bloom = BloomFilter(100)
+        for i in range(100):
+            bloom.add(f"key{i}")
+        assert all(f"key{i}" in bloom for i in range(100))
+        false_positives = sum(f"other{i}" in bloom for i in range(1000))
+        assert false_positives < 10
+        assert bloom.full
+
+    def test_collection_index(self):
+        index = CollectionIndex()
+        index.update([3, "1", "abc"])
+        index.add(2)
+        index.add(2)
+        assert list(index.numbers) == [1, 2, 3]
+        # Numeric strings are treated the same as integers
+        assert 1 in index
+        assert "2" in index
+        assert 4 not in index
+        assert "abc" in index
+        assert "abd" not in index
+        assert len(index) == 4
+
+    async def test_load(self):
+        index = MembershipIndex()
+        await index.load(FakeDriver({"pixiv": [1, 2], "artstation": ["abc"]}))
+        assert index.may_contain("pixiv", 1)
+        assert not index.may_contain("pixiv", 3)
+        assert not index.may_contain("artstation", "def")
+        # Unknown collections may contain anything
+        assert index.may_contain("twitter", 1)
+        index.add("pixiv", 3)
+        assert index.may_contain("pixiv", 3)
@@ -0,0 +1,34 @@
+import unittest
+
+from nazurin.utils.metrics import Counter, Gauge, Histogram, Metric
+
+
+class TestMetrics(unittest.TestCase):
+    def tearDown(self) -> None:
+        Metric.registry = [
+            metric for metric in Metric.registry if not metric.name.startswith("test_")
+        ]
+        return super().tearDown()
+
+    def test_counter_and_gauge(self):
+        counter = Counter("test_requests_total", "Requests.", ("site",))
+        counter.labels(site="pixiv").inc()
+        counter.labels("pixiv").inc(2)
+        gauge = Gauge("test_in_progress", "In progress.")
+        gauge.inc()
+        lines = list(counter.collect()) + list(gauge.collect())
+        assert 'test_requests_total{site="pixiv"} 3' in lines
+        assert "test_in_progress 1" in lines
+        gauge.set_function(lambda: 5)
+        assert "test_in_progress 5" in list(gauge.collect())
+
+    def test_histogram(self):
+        histogram = Histogram("test_duration_seconds", "Duration.", buckets=(1, 5))
+        histogram.observe(0.5)
+        histogram.observe(3)
+        histogram.observe(10)
+        lines = list(histogram.collect())
+        assert 'test_duration_seconds_bucket{le="1"} 1' in lines
+        assert 'test_duration_seconds_bucket{le="5"} 2' in lines
+        assert "test_duration_seconds_count 3" in lines
+        assert "test_duration_seconds_sum 13.5" in lines
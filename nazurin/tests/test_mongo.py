@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from nazurin.database.mongo import WriteBuffer
+from nazurin.utils.exceptions import NazurinError
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = {}
+        self.fail = False
+        self.attempts = 0
+
+    async def insert_many(self, documents, ordered=True):
+        self.attempts += 1
+        if self.fail:
+            raise ConnectionError("Network is unreachable")
+        for document in documents:
+            self.documents[document["_id"]] = document
+        return SimpleNamespace(inserted_ids=[document["_id"] for document in documents])
+
+
+class TestWriteBuffer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.collection = FakeCollection()
+        self.buffer = WriteBuffer({"pixiv": self.collection})
+        options = (("FLUSH_SIZE", 2), ("FLUSH_INTERVAL", 0.05), ("BUFFER_LIMIT", 4))
+        for name, value in options:
+            patcher = patch(f"nazurin.database.mongo.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_flush_on_size(self):
+        await self.buffer.add("pixiv", 1, {"title": "a"})
+        assert self.buffer.get("pixiv", 1) == {"title": "a", "_id": 1}
+        assert self.collection.documents == {}
+        with self.assertRaises(NazurinError):
+            await self.buffer.add("pixiv", 1, {})
+
+        await self.buffer.add("pixiv", 2, {"title": "b"})
+        assert list(self.collection.documents) == [1, 2]
+        assert self.buffer.get("pixiv", 1) is None
+
+    async def test_flush_on_interval(self):
+        await self.buffer.add("pixiv", 1, {})
+        await asyncio.sleep(0.1)
+        assert list(self.collection.documents) == [1]
+
+    async def test_keep_on_failure(self):
+        self.collection.fail = True
+        await self.buffer.add("pixiv", 1, {})
+        await self.buffer.add("pixiv", 2, {})
+        assert self.buffer.get("pixiv", 1) is not None
+        self.collection.fail = False
+        await self.buffer.close()
+        assert list(self.collection.documents) == [1, 2]
+        assert self.buffer.size == 0
+
+    async def test_back_off_and_limit_on_failure(self):
+        self.collection.fail = True
+        for key in range(1, 5):
+            assert await self.buffer.add("pixiv", key, {})
+        # Only the first flush is attempted, later inserts wait for the retry
+        assert self.collection.attempts == 1
+        assert self.buffer.size == 4
+        assert not await self.buffer.add("pixiv", 5, {})
+        assert self.buffer.get("pixiv", 5) is None
+        self.collection.fail = False
+        await self.buffer.close()
+        assert list(self.collection.documents) == [1, 2, 3, 4]
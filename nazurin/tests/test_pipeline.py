@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+import pytest
+
+from nazurin.pipeline import Pipeline
+
+
+class TestPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_stages_in_order(self):
+        async def double(item: list):
+            item.append(item[-1] * 2)
+
+        async def increase(item: list):
+            item.append(item[-1] + 1)
+
+        pipeline = Pipeline("test").stage("double", double).stage("increase", increase)
+        assert await pipeline.submit([1]) == [1, 2, 3]
+        assert pipeline.stages[1].stats.processed == 1
+        await pipeline.stop()
+
+    async def test_stages_overlap(self):
+        slow_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fetch(item: dict):
+            item["fetched"] = True
+
+        async def store(item: dict):
+            if item["id"] == 1:
+                slow_started.set()
+                await release.wait()
+
+        pipeline = Pipeline("test").stage("fetch", fetch).stage("store", store)
+        first = asyncio.create_task(pipeline.submit({"id": 1}))
+        await slow_started.wait()
+        # The first stage keeps going while the last one is busy
+        second = asyncio.create_task(pipeline.submit({"id": 2}))
+        await asyncio.sleep(0.01)
+        assert pipeline.stages[0].stats.processed == 2
+        release.set()
+        await asyncio.gather(first, second)
+        await pipeline.stop()
+
+    async def test_error_and_early_finish(self):
+        async def check(item: int):
+            if item < 0:
+                raise ValueError(item)
+            return item != 0
+
+        async def never(_item: int):
+            raise AssertionError
+
+        pipeline = Pipeline("test").stage("check", check).stage("never", never)
+        assert await pipeline.submit(0) == 0
+        with pytest.raises(ValueError):
+            await pipeline.submit(-1)
+        assert pipeline.stages[0].stats.failed == 1
+        await pipeline.stop()
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from aiohttp import ServerDisconnectedError
+
+from nazurin import queue as job_queue
+from nazurin.queue import Job, JobQueue, JobState
+from nazurin.utils import metrics
+from nazurin.utils.exceptions import NazurinError
+
+
+class TestJobQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "queue.db")
+        self.handled: list[Job] = []
+        self.errors: list[Exception] = []
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        return super().tearDown()
+
+    async def handler(self, job: Job):
+        self.handled.append(job)
+
+    async def error_handler(self, _job: Job, error: Exception):
+        self.errors.append(error)
+
+    async def test_claim_in_order(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        first = await queue.put(["https://example.com/1"])
+        second = await queue.put(["https://example.com/2"])
+        assert (await queue.claim()).id == first
+        assert (await queue.claim()).id == second
+        assert await queue.claim() is None
+        assert await queue.count(JobState.RUNNING) == 2
+        queue.close()
+
+    async def test_resume_unfinished(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        job = await queue.claim()
+        queue.close()
+
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        await queue.start(workers=1)
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        assert [item.id for item in self.handled] == [job.id]
+        assert self.handled[0].attempts == 2
+
+    async def test_retry_transient_error(self):
+        async def handler(job: Job):
+            raise ServerDisconnectedError
+
+        queue = JobQueue(handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        job = await queue.claim()
+        await queue.run(job)
+        assert job.state == JobState.PENDING
+        assert await queue.count(JobState.PENDING) == 1
+        assert not self.errors
+        queue.close()
+
+    async def test_fail_permanent_error(self):
+        async def handler(job: Job):
+            raise NazurinError("Not found")
+
+        queue = JobQueue(handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        job = await queue.claim()
+        await queue.run(job)
+        assert job.state == JobState.FAILED
+        assert await queue.count(JobState.FAILED) == 1
+        assert len(self.errors) == 1
+        queue.close()
+
+    async def test_claim_across_connections(self):
+        queues = [JobQueue(self.handler, self.error_handler, self.path) for _ in range(2)]
+        for queue in queues:
+            queue.open()
+        for i in range(10):
+            await queues[0].put([f"https://example.com/{i}"])
+        jobs = await asyncio.gather(*[queues[i % 2].claim() for i in range(12)])
+        claimed = [job.id for job in jobs if job]
+        assert len(claimed) == 10
+        assert len(set(claimed)) == 10
+        for queue in queues:
+            queue.close()
+
+    async def test_take_over_expired_lease(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        job = await queue.claim()
+        assert await queue.claim() is None
+        with mock.patch.object(job_queue, "time") as clock:
+            clock.time.return_value = time.time() + job_queue.LEASE_DURATION + 1
+            taken = await queue.claim()
+        assert taken.id == job.id
+        assert taken.attempts == 2
+        queue.close()
+
+    async def test_release_on_cancel(self):
+        started = asyncio.Event()
+
+        async def handler(_job: Job):
+            started.set()
+            await asyncio.sleep(10)
+
+        queue = JobQueue(handler, self.error_handler, self.path)
+        await queue.start(workers=1)
+        await queue.enqueue(["https://example.com/1"])
+        await asyncio.wait_for(started.wait(), 1)
+        await queue.stop()
+        queue.open()
+        assert await queue.count(JobState.PENDING) == 1
+        assert await queue.count(JobState.RUNNING) == 0
+        queue.close()
+
+    async def test_update_metrics(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        for i in range(3):
+            await queue.put([f"https://example.com/{i}"])
+        await queue.claim()
+        await queue.update_metrics()
+        lines = list(metrics.QUEUE_JOBS.collect())
+        assert 'nazurin_queue_jobs{state="pending"} 2' in lines
+        assert 'nazurin_queue_jobs{state="running"} 1' in lines
+        assert 'nazurin_queue_jobs{state="failed"} 0' in lines
+        queue.close()
+
+    async def test_discard_result_after_take_over(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        job = await queue.claim()
+        with mock.patch.object(job_queue, "time") as clock, mock.patch.object(
+            JobQueue,
+            "owner",
+            new_callable=mock.PropertyMock,
+            return_value="other",
+        ):
+            clock.time.return_value = time.time() + job_queue.LEASE_DURATION + 1
+            assert (await queue.claim()).id == job.id
+        await queue.complete(job)
+        assert await queue.count(JobState.RUNNING) == 1
+        assert await queue.count(JobState.DONE) == 0
+        queue.close()
+
+    @mock.patch.object(job_queue.config, "QUEUE_RETRIES", 2)
+    async def test_fail_job_crashing_workers(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        await queue.put(["https://example.com/1"])
+        with mock.patch.object(job_queue, "time") as clock:
+            clock.time.return_value = time.time()
+            for attempts in (1, 2):
+                # Lease expires as if the worker crashed
+                assert (await queue.claim()).attempts == attempts
+                clock.time.return_value += job_queue.LEASE_DURATION + 1
+            assert await queue.claim() is None
+        assert await queue.count(JobState.FAILED) == 1
+        queue.close()
+
+    @mock.patch.object(job_queue.config, "QUEUE_RETRIES", 2)
+    async def test_fail_job_interrupted_too_many_times(self):
+        queue = JobQueue(self.handler, self.error_handler, self.path)
+        queue.open()
+        for i in range(2):
+            await queue.put([f"https://example.com/{i}"])
+        first = await queue.claim()
+        await queue.release(first)
+        await queue.claim()
+        await queue.claim()
+        # The first job has been attempted twice, the second once
+        assert await queue.resume() == 1
+        assert await queue.count(JobState.FAILED) == 1
+        assert (await queue.claim()).id != first.id
+        queue.close()
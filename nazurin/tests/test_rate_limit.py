@@ -0,0 +1,52 @@
+import asyncio
+import time
+import unittest
+
+from nazurin.utils.network import RateLimiter, RateLimiters
+
+
+class TestRateLimit(unittest.IsolatedAsyncioTestCase):
+    async def test_registry_matches_domain(self):
+        limiters = RateLimiters({"pixiv.net": 2}, {"pximg.net": 4})
+        assert limiters.get("https://app-api.pixiv.net/v1/illust") is limiters.get(
+            "https://pixiv.net/",
+        )
+        assert limiters.get("https://i.pximg.net/img.png").semaphore is not None
+        assert limiters.get("https://notpixiv.net/") is None
+        assert limiters.get("https://example.com/") is None
+
+    async def test_rate(self):
+        limiter = RateLimiter(rate=20)
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        # First request is immediate, the rest are spread out
+        assert time.monotonic() - start >= 0.14
+
+    async def test_concurrency(self):
+        limiter = RateLimiter(concurrency=2)
+        active = peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with limiter.limit():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[request() for _ in range(5)])
+        assert peak == 2
+
+
+class TestRateLimitLoop(unittest.TestCase):
+    def test_reset_on_new_loop(self):
+        limiters = RateLimiters({"pixiv.net": 2})
+
+        async def get():
+            limiter = limiters.get("https://pixiv.net/")
+            await limiter.acquire()
+            return limiter
+
+        first = asyncio.run(get())
+        assert asyncio.run(get()) is not first
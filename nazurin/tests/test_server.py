@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from nazurin import config, dp
+from nazurin.queue import JobQueue, JobState
+from nazurin.server import NazurinServer
+
+
+class TestNazurinServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.queue = JobQueue(
+            dp.process_job,
+            dp.on_job_error,
+            os.path.join(directory.name, "queue.db"),
+        )
+        # Only receive requests, like the webhook process with workers
+        await self.queue.start(workers=0)
+        self.client = await self.start_client()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.queue.stop()
+
+    async def start_client(self) -> TestClient:
+        client = TestClient(TestServer(NazurinServer(self.queue)))
+        await client.start_server()
+        return client
+
+    @mock.patch.object(config, "WORKER_PROCESSES", 2)
+    async def test_enqueue_api_request(self):
+        url = "https://example.com/artwork/1"
+        with mock.patch.object(dp.bot, "update_collection") as update_collection:
+            response = await self.client.post(f"/{config.TOKEN}/api", json={"url": url})
+            assert response.status == 200
+        update_collection.assert_not_called()
+        assert await self.queue.count(JobState.PENDING) == 1
+        job = await self.queue.claim()
+        assert job.urls == [url]
+        assert job.message is None
+
+    async def test_reject_invalid_request(self):
+        response = await self.client.post(f"/{config.TOKEN}/api", json={})
+        assert response.status == 400
+        assert await self.queue.count(JobState.PENDING) == 0
+
+    async def test_metrics_disabled_by_default(self):
+        response = await self.client.get("/metrics")
+        assert response.status == 404
+
+    @mock.patch.object(config, "METRICS_PATH", "/secret-metrics")
+    async def test_metrics_path(self):
+        client = await self.start_client()
+        self.addAsyncCleanup(client.close)
+        response = await client.get("/secret-metrics")
+        assert response.status == 200
+        assert "nazurin_" in await response.text()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from nazurin.utils.network import Request, sessions
+
+
+class TestSessions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.peers = []
+        app = web.Application()
+        app.router.add_get("/", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = self.server.make_url("/")
+
+    async def asyncTearDown(self):
+        await sessions.close()
+        await self.server.close()
+
+    async def handle(self, request: web.Request):
+        self.peers.append(request.transport.get_extra_info("peername"))
+        response = web.json_response({"cookie": request.headers.get("Cookie")})
+        response.set_cookie("visited", "1")
+        return response
+
+    async def test_reuse_connections(self):
+        for _ in range(3):
+            async with Request() as request, request.get(self.url) as response:
+                await response.read()
+        assert len(set(self.peers)) == 1
+        assert not sessions.connector().closed
+
+    async def test_sessions_by_profile(self):
+        session = sessions.get(cookies={"a": "1"})
+        assert sessions.get(cookies={"a": "1"}) is session
+        assert sessions.get(cookies={"a": "2"}) is not session
+        for _ in range(2):
+            async with session.get(self.url) as response:
+                # Cookies set by the previous response are not sent
+                assert (await response.json())["cookie"] == "a=1"
+
+        await sessions.close()
+        assert session.closed
+        assert sessions.get(cookies={"a": "1"}) is not session
+
+
+class TestSessionsAcrossLoops(unittest.TestCase):
+    def tearDown(self):
+        asyncio.run(sessions.close())
+
+    def test_close_pools_of_previous_loop(self):
+        async def open_pools():
+            return sessions.connector(), sessions.get()
+
+        connector, session = asyncio.run(open_pools())
+        assert not connector.closed
+
+        async def replace_pools():
+            assert sessions.connector() is not connector
+            await sessions.closing
+
+        asyncio.run(replace_pools())
+        assert connector.closed
+        assert session.closed
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+import pytest
+
+from nazurin.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesce_concurrent_calls(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*[flights.do("key", fetch) for _ in range(3)])
+        assert results == [1, 1, 1]
+        assert "key" not in flights
+        # Calls after completion run again
+        assert await flights.do("key", fetch) == 2
+
+    async def test_share_exception(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError
+
+        results = await asyncio.gather(
+            flights.do("key", fail),
+            flights.do("key", fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    async def test_cancel_one_caller(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_cancel_all_callers(self):
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = False
+
+        async def fetch():
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled
+        assert "key" not in flights
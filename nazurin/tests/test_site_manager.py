@@ -0,0 +1,111 @@
+import unittest
+
+from nazurin.sites import SiteManager, Source
+
+
+async def handle(_match):
+    raise NotImplementedError
+
+
+class TestSiteManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = SiteManager()
+        sources = [
+            Source(
+                priority=30,
+                patterns=[r"danbooru\.donmai\.us/posts/(\d+)"],
+                handler=handle,
+                name="danbooru",
+                hosts=["donmai.us"],
+            ),
+            Source(
+                priority=10,
+                patterns=[
+                    r"pixiv\.net/(?:en/)?artworks/(\d+)",
+                    r"[^./]+\.pximg\.net/img-original/img/(?:\d+/){6}(\d+)",
+                ],
+                handler=handle,
+                name="pixiv",
+                hosts=["pixiv.net", "pximg.net"],
+            ),
+            Source(
+                priority=5,
+                patterns=[r"(?:twitter|x)\.com/[^.]+/status/(\d+)"],
+                handler=handle,
+                name="twitter",
+                hosts=["twitter.com", "x.com"],
+            ),
+        ]
+        for source in sources:
+            self.manager.register(source)
+        return super().setUp()
+
+    def test_match_all_urls(self):
+        urls = [
+            "https://www.pixiv.net/artworks/123",
+            "https://example.com/",
+            "https://x.com/user/status/456",
+            "https://danbooru.donmai.us/posts/789",
+        ]
+        results = self.manager.match(urls)
+        assert [(result.source.name, result.match.group(1)) for result in results] == [
+            ("pixiv", "123"),
+            ("twitter", "456"),
+            ("danbooru", "789"),
+        ]
+        assert results[1].url == urls[2]
+
+    def test_match_distinct(self):
+        results = self.manager.match(
+            [
+                "https://www.pixiv.net/artworks/123",
+                "https://i.pximg.net/img-original/img/2020/02/02/20/00/02/123_p0.png",
+                "https://www.pixiv.net/en/artworks/123",
+            ],
+        )
+        assert len(results) == 1
+        assert results[0].url == "https://www.pixiv.net/artworks/123"
+
+    def test_no_match(self):
+        assert self.manager.match(["https://example.com/"]) == []
+
+    def test_match_by_host(self):
+        results = self.manager.match(
+            [
+                "pixiv.net/artworks/1",
+                "https://i.pximg.net/img-original/img/2020/02/02/20/00/02/2_p0.png",
+                # Only sources of the host are tried
+                "https://example.com/?next=https://x.com/user/status/3",
+            ],
+        )
+        assert [result.match.group(1) for result in results] == ["1", "2"]
+        assert [source.name for source in self.manager.candidates("x.com")] == [
+            "twitter",
+        ]
+
+    def test_match_without_hosts(self):
+        self.manager.register(
+            Source(
+                priority=1,
+                patterns=[r"example\.com/posts/(\d+)"],
+                handler=handle,
+                name="example",
+            ),
+        )
+        results = self.manager.match(["https://www.example.com/posts/1"])
+        assert [result.source.name for result in results] == ["example"]
+        assert [source.name for source in self.manager.candidates("x.com")] == [
+            "twitter",
+            "example",
+        ]
+
+
+class TestSiteLoading(unittest.TestCase):
+    def test_import_on_first_match(self):
+        manager = SiteManager()
+        manager.load()
+        assert "pixiv" in manager.plugins
+        result = manager.match(["https://www.pixiv.net/artworks/123"])[0]
+        assert result.source.handler is None
+        assert manager.identify(result) == ("pixiv", 123)
+        assert result.source.handler is not None
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from nazurin.models import File, Illust
+from nazurin.storage import Storage
+from nazurin.storage.local import Local
+
+
+class TestStorage(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = patch.object(Storage, "drivers", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_creates_no_driver(self):
+        with patch("nazurin.storage.STORAGE", ["Local"]):
+            Storage().load()
+        assert Storage.drivers == {}
+
+    def test_driver_created_once(self):
+        storage = Storage()
+        driver = storage.driver("Local")
+        assert isinstance(driver, Local)
+        assert storage.driver("Local") is driver
+        assert Storage().driver("Local") is driver
+
+    async def test_connect_failure_is_logged(self):
+        with patch("nazurin.storage.STORAGE", ["Missing", "Local"]):
+            await Storage().connect()
+        assert list(Storage.drivers) == ["Local"]
+
+    async def test_danbooru_upload_counts_new_files(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        files = [File("existing.jpg"), File("new.jpg")]
+        with patch("nazurin.models.file.TEMP_DIR", directory.name):
+            for index, file in enumerate(files):
+                with open(file.path, "wb") as f:
+                    f.write(b"0" * (index + 1) * 100)
+                file.hashes["md5"] = file.name
+            metadata = {"artist": {"name": "artist"}, "tag_str": "", "posts": {}}
+            illust = Illust("1", files=files, danbooru_metadata=metadata)
+            client = MagicMock()
+            client.post_list.return_value = [{"md5": "existing.jpg"}]
+            with patch.object(Storage, "danbooru_client", return_value=client):
+                uploaded = await Storage().danbooru_upload(illust)
+            # Only the new file is uploaded and counted
+            assert uploaded == 200
+            upload = client.bulk_upload_then_post
+            assert upload.call_args.kwargs["files"] == [files[1].path]
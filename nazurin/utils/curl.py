@@ -0,0 +1,77 @@
+import os
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+
+from curl_cffi.requests import AsyncSession as CurlSession
+from curl_cffi.requests import Response as CurlResponse
+
+from nazurin.config import PROXY, TIMEOUT
+from nazurin.utils.download import DownloadSink, PartialFile
+from nazurin.utils.logging import logger
+from nazurin.utils.network import NazurinRequestSession, limiters
+
+
+class CurlRequest(CurlSession, NazurinRequestSession):
+    """
+    Wrapped curl_cffi AsyncSession to impersonate a browser,
+    with timeout and proxy support.
+    """
+
+    def __init__(
+        self,
+        cookies: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: int = TIMEOUT,
+        **kwargs,
+    ):
+        self.cookies = cookies
+        self.headers = headers
+        self.timeout = timeout
+        self.proxies = {"https": PROXY, "http": PROXY} if PROXY else None
+        super().__init__(**kwargs)
+
+    @asynccontextmanager
+    async def get(
+        self,
+        *args,
+        impersonate: str = "chrome110",
+        headers: Optional[dict] = None,
+        **kwargs,
+    ) -> AsyncGenerator[CurlResponse, None]:
+        url = args[0] if args else kwargs.get("url")
+        async with limiters.limit(url):
+            yield await super().request(
+                "GET",
+                *args,
+                cookies=self.cookies,
+                headers={**(self.headers or {}), **(headers or {})},
+                timeout=self.timeout,
+                impersonate=impersonate,
+                proxies=self.proxies,
+                **kwargs,
+            )
+
+    async def download(
+        self,
+        url: str,
+        destination: Union[str, os.PathLike],
+    ) -> Optional[dict[str, str]]:
+        part = PartialFile.load(url, destination)
+        if part.completed:
+            part.complete()
+            return None
+        async with self.get(url, stream=True, headers=part.headers()) as response:
+            offset = part.start(response.status_code, response.headers)
+            if not response.ok:
+                logger.error(
+                    "Download failed with status code {}",
+                    response.status_code,
+                )
+                logger.info("Response: {}", await response.acontent())
+                response.raise_for_status()
+            async with DownloadSink(part.path, offset, truncate=not offset) as sink:
+                async for chunk in response.aiter_content():
+                    await sink.write(chunk)
+        part.complete()
+        return sink.digests
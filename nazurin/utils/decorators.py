@@ -10,15 +10,17 @@ from async_lru import alru_cache
 from tenacity import retry_if_exception, stop_after_attempt, wait_exponential
 
 from nazurin import config
-from nazurin.utils import logger
+from nazurin.utils import logger, metrics
 
 
 def after_log(retry_state):
+    name = tenacity._utils.get_callback_name(retry_state.fn)
+    metrics.NETWORK_RETRIES.labels(function=name).inc()
     # Set frame depth to get the real caller
     logger.opt(depth=3).info(
         "{} during {} execution, {} of {} attempted.",
         repr(retry_state.outcome.exception()),
-        tenacity._utils.get_callback_name(retry_state.fn),
+        name,
         retry_state.attempt_number,
         config.RETRIES,
     )
@@ -69,6 +71,8 @@ def retry_after(func):
                     "Hit flood limit, retry after {} seconds",
                     error.retry_after + 1,
                 )
+                metrics.TELEGRAM_RETRY_AFTER.inc()
+                metrics.TELEGRAM_RETRY_AFTER_SECONDS.inc(error.retry_after + 1)
                 await asyncio.sleep(error.retry_after + 1)
 
     return decorator
@@ -0,0 +1,305 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from typing import BinaryIO, Optional, Union
+
+from aiohttp import ClientPayloadError
+from humanize import naturalsize
+
+from nazurin.config import (
+    DOWNLOAD_BUFFER_SIZE,
+    DOWNLOAD_SEGMENTS,
+    SEGMENTED_DOWNLOAD_SIZE,
+)
+from nazurin.utils.decorators import async_wrap
+from nazurin.utils.logging import logger
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+# Digests of downloaded files
+HASHES = ("md5", "sha256")
+
+
+class RangesIgnored(ClientPayloadError):
+    """Server sent something else than the requested range of file."""
+
+
+@dataclass
+class PartialFile:
+    """
+    Download in progress, written to `{destination}.part`
+    and renamed to `destination` once complete.
+
+    Expected length and validators of the response are recorded beside it,
+    so that an interrupted download continues where it stopped
+    as long as the file on server is unchanged.
+
+    Large files may be split into segments downloaded in parallel,
+    `segments` are then byte ranges yet to be downloaded.
+    """
+
+    destination: str
+    url: str
+    length: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    segments: Optional[list[list[int]]] = None
+
+    @property
+    def path(self) -> str:
+        return f"{self.destination}.part"
+
+    @property
+    def meta_path(self) -> str:
+        return f"{self.destination}.part.json"
+
+    @property
+    def offset(self) -> int:
+        """Bytes already downloaded."""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    @property
+    def completed(self) -> bool:
+        if self.segments is not None:
+            return not self.segments
+        return self.length is not None and self.offset >= self.length
+
+    @property
+    def validator(self) -> Optional[str]:
+        """Validator to make sure ranges are of the same file."""
+        # Weak ETags can't be used for ranges
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    @classmethod
+    def load(cls, url: str, destination: Union[str, os.PathLike]) -> "PartialFile":
+        destination = os.fspath(destination)
+        part = cls(destination, url)
+        if os.path.exists(part.meta_path) and os.path.exists(part.path):
+            with open(part.meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("url") == url:
+                return cls(**{**meta, "destination": destination})
+        # Unknown content, can't be resumed
+        part.discard()
+        return part
+
+    def headers(self) -> dict[str, str]:
+        """Headers to request the rest of the file."""
+        offset = self.offset
+        if not offset or not self.validator:
+            return {}
+        logger.info("Resuming download of {} from byte {}", self.destination, offset)
+        return {"Range": f"bytes={offset}-", "If-Range": self.validator}
+
+    def split(self, headers: Mapping[str, str]) -> bool:
+        """
+        Split the file into segments if it's large enough
+        and the server supports ranges, returns whether it's split.
+        """
+        if (
+            DOWNLOAD_SEGMENTS < 2
+            or self.length is None
+            or self.length < SEGMENTED_DOWNLOAD_SIZE
+            or headers.get("Accept-Ranges") != "bytes"
+            or not self.validator
+        ):
+            return False
+        size = -(-self.length // DOWNLOAD_SEGMENTS)
+        self.segments = [
+            [start, min(start + size, self.length) - 1]
+            for start in range(0, self.length, size)
+        ]
+        # Preallocate, segments are written into their own places
+        with open(self.path, "wb") as file:
+            file.truncate(self.length)
+        self.save()
+        return True
+
+    def segment_headers(self, segment: list[int]) -> dict[str, str]:
+        start, end = segment
+        return {"Range": f"bytes={start}-{end}", "If-Range": self.validator}
+
+    def check_segment(
+        self,
+        status: int,
+        headers: Mapping[str, str],
+        segment: list[int],
+    ):
+        """Check the response is the requested segment of the same file."""
+        if status in (HTTPStatus.OK, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE):
+            raise RangesIgnored(f"Expected range {segment}, got status {status}")
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            content_range = headers.get("Content-Range", "")
+            match = CONTENT_RANGE.fullmatch(content_range)
+            if not match or int(match.group(1)) != segment[0]:
+                raise RangesIgnored(f"Expected range {segment}, got {content_range}")
+
+    def start(self, status: int, headers: Mapping[str, str]) -> int:
+        """
+        Record the response to be written, returns the offset to write from.
+        Raises `ClientPayloadError` if it doesn't continue the partial file,
+        which is discarded so that the next attempt starts over.
+        """
+        if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            self.discard()
+            raise ClientPayloadError("Partial download no longer matches the file")
+        if status >= HTTPStatus.BAD_REQUEST:
+            # Other errors are left to callers
+            return self.offset
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            match = CONTENT_RANGE.fullmatch(headers.get("Content-Range", ""))
+            if not match or int(match.group(1)) != self.offset:
+                self.discard()
+                raise ClientPayloadError("Unexpected range of partial download")
+            return self.offset
+        # The whole file is sent, e.g. it has changed or ranges are unsupported
+        length = headers.get("Content-Length")
+        # Compressed responses are decoded and longer than their Content-Length
+        encoded = headers.get("Content-Encoding", "identity") != "identity"
+        self.length = int(length) if length and not encoded else None
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        self.save()
+        return 0
+
+    def save(self):
+        meta = asdict(self)
+        del meta["destination"]
+        with open(self.meta_path, "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+
+    def complete(self):
+        """Check length of the downloaded file and move it to destination."""
+        if self.segments:
+            raise ClientPayloadError(f"Segments {self.segments} are not downloaded")
+        offset = self.offset
+        if self.length is not None and offset != self.length:
+            # Resume if short, start over if corrupted
+            if offset > self.length:
+                self.discard()
+            raise ClientPayloadError(f"Downloaded {offset} bytes of {self.length}")
+        os.replace(self.path, self.destination)
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+
+    def discard(self):
+        for path in (self.path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@async_wrap
+def hash_file(path: Union[str, os.PathLike]) -> dict[str, str]:
+    """Digests of a file, for downloads that can't be hashed while written."""
+    hashers = {name: hashlib.new(name) for name in HASHES}
+    with open(path, "rb") as file:
+        while chunk := file.read(DOWNLOAD_BUFFER_SIZE):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
+class DownloadSink:
+    """
+    Writes received chunks to `path` from `offset`,
+    coalesced into buffers of `DOWNLOAD_BUFFER_SIZE` bytes.
+
+    Buffers are written by a dedicated thread while the next one fills up,
+    so that the event loop neither blocks on disk
+    nor hops to a thread for every chunk.
+
+    A sink writing the file from scratch also hashes it on the way,
+    see `digests`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        offset: int = 0,
+        *,
+        truncate: bool = False,
+    ):
+        self.path = path
+        self.offset = offset
+        self.truncate = truncate
+        self.buffer = bytearray()
+        # Bytes that reached the file, buffered ones are not counted
+        self.written = 0
+        self.started = time.perf_counter()
+        self.file: Optional[BinaryIO] = None
+        self.writing: Optional[asyncio.Future] = None
+        self.hashers = (
+            {name: hashlib.new(name) for name in HASHES} if truncate else None
+        )
+        # A single thread runs file operations in order, even if cancelled
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="download-sink")
+
+    @property
+    def digests(self) -> Optional[dict[str, str]]:
+        """Digests of the whole file, if written from scratch."""
+        if self.hashers is None:
+            return None
+        return {name: hasher.hexdigest() for name, hasher in self.hashers.items()}
+
+    @property
+    def speed(self) -> float:
+        """Bytes written per second."""
+        return self.written / max(time.perf_counter() - self.started, 1e-9)
+
+    def open(self) -> BinaryIO:
+        # pylint: disable-next=consider-using-with
+        file = open(self.path, "wb" if self.truncate else "r+b")  # noqa: SIM115
+        file.seek(self.offset)
+        return file
+
+    def write_buffer(self, data: bytes):
+        self.file.write(data)
+        self.written += len(data)
+        if self.hashers:
+            for hasher in self.hashers.values():
+                hasher.update(data)
+
+    async def __aenter__(self) -> "DownloadSink":
+        self.file = await async_wrap(self.open)(executor=self.executor)
+        self.started = time.perf_counter()
+        return self
+
+    async def write(self, chunk: bytes):
+        self.buffer += chunk
+        if len(self.buffer) >= DOWNLOAD_BUFFER_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        # Wait for the previous buffer, so that at most two are in memory
+        if self.writing:
+            writing, self.writing = self.writing, None
+            await writing
+        if self.buffer:
+            data, self.buffer = bytes(self.buffer), bytearray()
+            self.writing = asyncio.ensure_future(
+                async_wrap(self.write_buffer)(data, executor=self.executor),
+            )
+
+    async def __aexit__(self, *args):
+        try:
+            # Keep what is received even on errors, it's resumed next time
+            await self.flush()
+            if self.writing:
+                await self.writing
+        finally:
+            await async_wrap(self.file.close)(executor=self.executor)
+            self.executor.shutdown(wait=False)
+        logger.debug(
+            "Wrote {} to {} at {}/s",
+            naturalsize(self.written, binary=True),
+            self.path,
+            naturalsize(self.speed, binary=True),
+        )
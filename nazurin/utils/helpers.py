@@ -16,12 +16,14 @@ import aiofiles
 import aiofiles.os
 import aiojobs
 from aiogram.enums import MessageEntityType
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
 from aiogram.types import Message
+from aiohttp import ClientResponseError
 from PIL import Image
 
 from nazurin.models import Caption
 from nazurin.utils.decorators import async_wrap
+from nazurin.utils.exceptions import NazurinError
 
 from . import logger
 
@@ -191,6 +193,22 @@ def format_error(error: Exception) -> str:
     return f"({error_type}) {error_msg}"
 
 
+async def reply_error(message: Message, error: Exception):
+    """Tell the user what went wrong with `message`, log unexpected errors."""
+    if isinstance(error, ClientResponseError):
+        logger.opt(exception=error).warning("Response error: {}", error)
+        await message.reply(f"Response Error: {error.status} {error.message}")
+    elif isinstance(error, NazurinError):
+        await message.reply(error.msg)
+    elif isinstance(error, asyncio.TimeoutError):
+        logger.opt(exception=error).warning("Timeout")
+        await message.reply("Error: Timeout, please try again.")
+    else:
+        logger.opt(exception=error).error("{}: {}", type(error), error)
+        if not isinstance(error, TelegramAPIError):
+            await message.reply(f"Error: {format_error(error)}")
+
+
 async def remove_files_older_than(path: str, days: int):
     """Remove files in `path` whose last access time is older than `days`."""
     if not await aiofiles.os.path.exists(path):
@@ -0,0 +1,241 @@
+"""Application metrics in Prometheus text format."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, ClassVar, Optional
+
+# Default histogram buckets in seconds
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, math.inf)
+
+# Site of the collection update in progress, to label metrics deep in the call stack
+current_site: ContextVar[str] = ContextVar("current_site", default="unknown")
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class CounterValue:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def samples(self, name: str, labels: dict) -> Iterator[str]:
+        yield f"{name}{format_labels(labels)} {format_value(self.value)}"
+
+
+class GaugeValue(CounterValue):
+    def __init__(self):
+        super().__init__()
+        self.function: Optional[Callable[[], float]] = None
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from `function` on every collection."""
+        self.function = function
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    def samples(self, name: str, labels: dict) -> Iterator[str]:
+        if self.function:
+            self.value = self.function()
+        yield from super().samples(name, labels)
+
+
+class HistogramValue:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name: str, labels: dict) -> Iterator[str]:
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            bucket_labels = {**labels, "le": format_value(bound)}
+            yield f"{name}_bucket{format_labels(bucket_labels)} {total}"
+        yield f"{name}_sum{format_labels(labels)} {format_value(self.sum)}"
+        yield f"{name}_count{format_labels(labels)} {total}"
+
+
+class Metric:
+    registry: ClassVar[list[Metric]] = []
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: dict[tuple, object] = {}
+        Metric.registry.append(self)
+
+    def new_value(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **labels):
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Expected labels {self.labelnames} for {self.name}")
+        if values not in self.children:
+            self.children[values] = self.new_value()
+        return self.children[values]
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for values, child in list(self.children.items()):
+            yield from child.samples(self.name, dict(zip(self.labelnames, values)))
+
+    def __getattr__(self, name: str):
+        # Metrics without labels can be used as their single value
+        if name.startswith("__") or self.labelnames:
+            raise AttributeError(name)
+        return getattr(self.labels(), name)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def new_value(self) -> CounterValue:
+        return CounterValue()
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def new_value(self) -> GaugeValue:
+        return GaugeValue()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple[float, ...] = BUCKETS,
+    ):
+        if buckets[-1] != math.inf:
+            buckets = (*buckets, math.inf)
+        self.buckets = buckets
+        super().__init__(name, documentation, labelnames)
+
+    def new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+
+def generate_latest() -> str:
+    lines = []
+    for metric in Metric.registry:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+COLLECTION_DURATION = Histogram(
+    "nazurin_collection_duration_seconds",
+    "Time to collect an artwork, from matching to saving to database.",
+    ("site",),
+)
+STAGE_DURATION = Histogram(
+    "nazurin_stage_duration_seconds",
+    "Time spent in each stage of collection.",
+    ("stage", "site"),
+)
+STORAGE_DURATION = Histogram(
+    "nazurin_storage_duration_seconds",
+    "Time to store files of an artwork in each storage.",
+    ("driver",),
+)
+COLLECTIONS = Counter(
+    "nazurin_collections_total",
+    "Collection updates by result.",
+    ("site", "result"),
+)
+COLLECTIONS_IN_PROGRESS = Gauge(
+    "nazurin_collections_in_progress",
+    "Collection updates in progress.",
+)
+DOWNLOADED_BYTES = Counter(
+    "nazurin_downloaded_bytes_total",
+    "Bytes downloaded from each site.",
+    ("site",),
+)
+UPLOADED_BYTES = Counter(
+    "nazurin_uploaded_bytes_total",
+    "Bytes uploaded to each storage.",
+    ("driver",),
+)
+NETWORK_RETRIES = Counter(
+    "nazurin_network_retries_total",
+    "Retries of network requests after transient errors.",
+    ("function",),
+)
+TELEGRAM_RETRY_AFTER = Counter(
+    "nazurin_telegram_retry_after_total",
+    "Times hitting Telegram flood limit.",
+)
+TELEGRAM_RETRY_AFTER_SECONDS = Counter(
+    "nazurin_telegram_retry_after_seconds_total",
+    "Time spent waiting for Telegram flood limit.",
+)
+QUEUE_JOBS = Gauge(
+    "nazurin_queue_jobs",
+    "Collection jobs in the queue by state.",
+    ("state",),
+)
+PIPELINE_ITEMS = Gauge(
+    "nazurin_pipeline_items",
+    "Items in each pipeline stage, either being processed or queued.",
+    ("stage", "state"),
+)
@@ -1,22 +1,240 @@
 import abc
+import asyncio
 import os
+import time
 from collections.abc import AsyncGenerator
-import yarl
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from typing import Optional, Union
 
-import aiofiles
-import cloudscraper
-from aiohttp import ClientSession, ClientTimeout, TCPConnector
-from curl_cffi.requests import AsyncSession as CurlSession
-from curl_cffi.requests import Response as CurlResponse
-from requests import Session
+import yarl
+from aiohttp import (
+    ClientPayloadError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    DummyCookieJar,
+    TCPConnector,
+)
+from requests import Response, Session
 
-from nazurin.config import DOWNLOAD_CHUNK_SIZE, PROXY, TIMEOUT, UA
+from nazurin.config import (
+    CONCURRENCY_LIMITS,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    DOWNLOAD_BUFFER_SIZE,
+    DOWNLOAD_CHUNK_SIZE,
+    KEEPALIVE_TIMEOUT,
+    PROXY,
+    RATE_LIMITS,
+    TIMEOUT,
+    UA,
+)
 from nazurin.utils.decorators import async_wrap
+from nazurin.utils.download import DownloadSink, PartialFile, RangesIgnored
 from nazurin.utils.logging import logger
 
 
+class RateLimiter:
+    """
+    Token bucket limiting requests per second,
+    with an optional cap on concurrent requests.
+
+    The bucket holds at most one token, so that bursts are spread out evenly.
+    """
+
+    def __init__(self, rate: float = 0, concurrency: int = 0):
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.semaphore:
+            await self.semaphore.acquire()
+        if self.rate <= 0:
+            return
+        try:
+            # Waiters take tokens in order of arrival
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(1.0, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self.tokens = 1.0
+                    self.updated = time.monotonic()
+                self.tokens -= 1
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        if self.semaphore:
+            self.semaphore.release()
+
+    @asynccontextmanager
+    async def limit(self) -> AsyncGenerator[None, None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class RateLimiters:
+    """
+    Registry of rate limiters keyed by host,
+    a host is limited by the most specific configured domain it belongs to.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[dict[str, float]] = None,
+        concurrency: Optional[dict[str, int]] = None,
+    ):
+        self.rates = rates or {}
+        self.concurrency = concurrency or {}
+        self.limiters: dict[str, RateLimiter] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def check_loop(self):
+        # Locks and semaphores are bound to the loop they were first used in
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            self.limiters = {}
+            self.loop = loop
+
+    def get(self, url: Union[str, yarl.URL]) -> Optional[RateLimiter]:
+        host = yarl.URL(str(url)).host
+        if not host:
+            return None
+        parts = host.lower().split(".")
+        for i in range(len(parts) - 1):
+            domain = ".".join(parts[i:])
+            if domain in self.rates or domain in self.concurrency:
+                break
+        else:
+            return None
+        self.check_loop()
+        if domain not in self.limiters:
+            self.limiters[domain] = RateLimiter(
+                self.rates.get(domain, 0),
+                self.concurrency.get(domain, 0),
+            )
+        return self.limiters[domain]
+
+    @asynccontextmanager
+    async def limit(self, url: Union[str, yarl.URL]) -> AsyncGenerator[None, None]:
+        limiter = self.get(url)
+        if limiter is None:
+            yield
+            return
+        async with limiter.limit():
+            yield
+
+
+limiters = RateLimiters(RATE_LIMITS, CONCURRENCY_LIMITS)
+
+
+class Sessions:
+    """
+    Connection pools and long-lived sessions shared by the whole process.
+
+    All sessions with the same proxy share one connection pool,
+    so that requests to a host reuse open connections and resolved addresses
+    instead of connecting from scratch every time.
+    """
+
+    def __init__(self):
+        self.connectors: dict[Optional[str], TCPConnector] = {}
+        self.sessions: dict[tuple, Request] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closing: Optional[asyncio.Task] = None
+
+    def check_loop(self):
+        # Connections can't be used across event loops, e.g. in tests
+        loop = asyncio.get_running_loop()
+        if loop is self.loop:
+            return
+        sessions, connectors = self.sessions, self.connectors
+        self.sessions, self.connectors = {}, {}
+        self.loop = loop
+        if sessions or connectors:
+            # Close pools of the previous loop instead of leaking their sockets
+            self.closing = loop.create_task(self.close_pools(sessions, connectors))
+
+    def connector(self, proxy: Optional[str] = PROXY) -> TCPConnector:
+        """Connection pool of `proxy`, sessions using it must not own it."""
+        self.check_loop()
+        connector = self.connectors.get(proxy)
+        if connector is None or connector.closed:
+            connector = TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                ssl=not proxy,
+            )
+            self.connectors[proxy] = connector
+        return connector
+
+    def get(
+        self,
+        cookies: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: int = TIMEOUT,
+    ) -> "Request":
+        """
+        Long-lived session of the cookies and headers,
+        closed on shutdown instead of by callers.
+
+        Cookies set by responses are not kept,
+        so that they don't leak between callers of the same session.
+        """
+        self.check_loop()
+        cookies = cookies or {}
+        headers = headers or {}
+        key = (
+            tuple(sorted(cookies.items())),
+            tuple(sorted(headers.items())),
+            timeout,
+            PROXY,
+        )
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            if cookies:
+                cookie = "; ".join(f"{name}={value}" for name, value in cookies.items())
+                headers = {**headers, "Cookie": cookie}
+            session = Request(
+                headers=headers,
+                timeout=timeout,
+                cookie_jar=DummyCookieJar(),
+            )
+            self.sessions[key] = session
+        return session
+
+    async def close(self):
+        sessions, connectors = self.sessions, self.connectors
+        self.sessions, self.connectors = {}, {}
+        await self.close_pools(sessions, connectors)
+        if self.closing:
+            await self.closing
+            self.closing = None
+
+    @staticmethod
+    async def close_pools(
+        sessions: dict[tuple, "Request"],
+        connectors: dict[Optional[str], TCPConnector],
+    ):
+        for session in sessions.values():
+            await session.close()
+        for connector in connectors.values():
+            await connector.close()
+
+
+sessions = Sessions()
+
+
 class NazurinRequestSession(AbstractAsyncContextManager):
     def __init__(
         self,
@@ -32,7 +250,15 @@ class NazurinRequestSession(AbstractAsyncContextManager):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def download(self, url: str, destination: Union[str, os.PathLike]):
+    async def download(
+        self,
+        url: str,
+        destination: Union[str, os.PathLike],
+    ) -> Optional[dict[str, str]]:
+        """
+        Download `url` to `destination`,
+        returns digests of the file if hashed while downloading.
+        """
         raise NotImplementedError
 
 
@@ -40,6 +266,9 @@ class Request(ClientSession, NazurinRequestSession):
     """
     Wrapped ClientSession with default user agent,
     timeout and proxy support.
+
+    Connections come from the pool shared by the process,
+    and stay open for reuse when the session is closed.
     """
 
     def __init__(
@@ -49,15 +278,12 @@ class Request(ClientSession, NazurinRequestSession):
         timeout: int = TIMEOUT,
         **kwargs,
     ):
-        headers = headers or {}
-        headers.update({"User-Agent": UA})
+        headers = {**(headers or {}), "User-Agent": UA}
         timeout = ClientTimeout(total=timeout)
 
-        connector = None
-        if PROXY:
-            connector = TCPConnector(ssl=False)
         super().__init__(
-            connector=connector,
+            connector=sessions.connector(),
+            connector_owner=False,
             cookies=cookies,
             headers=headers,
             trust_env=True,
@@ -65,67 +291,136 @@ class Request(ClientSession, NazurinRequestSession):
             **kwargs,
         )
 
-    async def download(self, url: str, destination: Union[str, os.PathLike]):
+    async def _request(self, method: str, str_or_url, **kwargs) -> ClientResponse:
+        limiter = limiters.get(str_or_url)
+        if limiter is None:
+            return await super()._request(method, str_or_url, **kwargs)
+        await limiter.acquire()
+        try:
+            response = await super()._request(method, str_or_url, **kwargs)
+        except BaseException:
+            limiter.release()
+            raise
+        # Hold the slot until the response body is consumed
+        if response.connection:
+            response.connection.add_callback(limiter.release)
+        else:
+            limiter.release()
+        return response
+
+    async def download(
+        self,
+        url: str,
+        destination: Union[str, os.PathLike],
+    ) -> Optional[dict[str, str]]:
+        part = PartialFile.load(url, destination)
         yarl_url = yarl.URL(url, encoded=True)
-        async with self.get(yarl_url) as response:
+        digests = None
+        try:
+            if part.segments:
+                await self.download_segments(yarl_url, part)
+            elif not part.completed:
+                digests = await self.download_stream(yarl_url, part)
+        except RangesIgnored as error:
+            logger.warning("{}, downloading {} in a single stream", error, url)
+            part.discard()
+            part = PartialFile.load(url, destination)
+            digests = await self.download_stream(yarl_url, part, segmented=False)
+        part.complete()
+        return digests
+
+    async def download_stream(
+        self,
+        url: yarl.URL,
+        part: PartialFile,
+        *,
+        segmented: bool = True,
+    ) -> Optional[dict[str, str]]:
+        async with self.get(url, headers=part.headers()) as response:
+            offset = part.start(response.status, response.headers)
             if not response.ok:
                 logger.error("Download failed with status code {}", response.status)
                 logger.info("Response: {}", await response.content.read())
                 response.raise_for_status()
-            async with aiofiles.open(destination, "wb") as f:
+            if segmented and not offset and part.split(response.headers):
+                await self.download_segments(url, part, response)
+                return None
+            async with DownloadSink(part.path, offset, truncate=not offset) as sink:
                 async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
-                    await f.write(chunk)
+                    await sink.write(chunk)
+        return sink.digests
 
-
-class CurlRequest(CurlSession, NazurinRequestSession):
-    """
-    Wrapped curl_cffi AsyncSession to impersonate a browser,
-    with timeout and proxy support.
-    """
-
-    def __init__(
+    async def download_segments(
         self,
-        cookies: Optional[dict] = None,
-        headers: Optional[dict] = None,
-        timeout: int = TIMEOUT,
-        **kwargs,
+        url: yarl.URL,
+        part: PartialFile,
+        response: Optional[ClientResponse] = None,
     ):
-        self.cookies = cookies
-        self.headers = headers
-        self.timeout = timeout
-        self.proxies = {"https": PROXY, "http": PROXY} if PROXY else None
-        super().__init__(**kwargs)
+        """
+        Download remaining segments of `part` in parallel,
+        the first one from `response` of the whole file if given.
+        """
 
-    @asynccontextmanager
-    async def get(
-        self,
-        *args,
-        impersonate: str = "chrome110",
-        **kwargs,
-    ) -> AsyncGenerator[CurlResponse, None]:
-        yield await super().request(
-            "GET",
-            *args,
-            cookies=self.cookies,
-            headers=self.headers,
-            timeout=self.timeout,
-            impersonate=impersonate,
-            proxies=self.proxies,
-            **kwargs,
-        )
-
-    async def download(self, url: str, destination: Union[str, os.PathLike]):
-        async with self.get(url, stream=True) as response:
-            if not response.ok:
-                logger.error(
-                    "Download failed with status code {}",
-                    response.status_code,
+        async def write(response: ClientResponse, segment: list[int]):
+            start, end = segment
+            size = end + 1 - start
+            received = 0
+            sink = DownloadSink(part.path, start)
+            try:
+                async with sink:
+                    async for chunk in response.content.iter_chunked(
+                        DOWNLOAD_CHUNK_SIZE,
+                    ):
+                        # The whole file goes beyond the first segment
+                        chunk = chunk[: size - received]
+                        await sink.write(chunk)
+                        received += len(chunk)
+                        if received == size:
+                            break
+            finally:
+                # Only record what reached the file as downloaded
+                segment[0] = start + sink.written
+            if sink.written != size:
+                raise ClientPayloadError(
+                    f"Segment {start}-{end} is incomplete, "
+                    f"wrote {sink.written} of {size} bytes",
                 )
-                logger.info("Response: {}", await response.acontent())
+
+        async def fetch(segment: list[int]):
+            headers = part.segment_headers(segment)
+            async with self.get(url, headers=headers) as response:
+                part.check_segment(response.status, response.headers, segment)
                 response.raise_for_status()
-            async with aiofiles.open(destination, "wb") as f:
-                async for chunk in response.aiter_content():
-                    await f.write(chunk)
+                await write(response, segment)
+
+        async def first(segment: list[int]):
+            try:
+                await write(response, segment)
+            finally:
+                # Release the connection for other segments
+                response.close()
+
+        logger.info("Downloading {} in {} segments", url, len(part.segments))
+        try:
+            # Let other segments finish when one fails, they won't be downloaded again
+            results = await asyncio.gather(
+                *(
+                    first(segment)
+                    if response is not None and segment[0] == 0
+                    else fetch(segment)
+                    for segment in part.segments
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            # Record progress, so that only the rest is downloaded next time
+            part.segments = [
+                segment for segment in part.segments if segment[0] <= segment[1]
+            ]
+            part.save()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
 
 class CloudScraperRequest(NazurinRequestSession):
@@ -147,6 +442,9 @@ class CloudScraperRequest(NazurinRequestSession):
         session.headers.update(headers or {})
         session.proxies.update(proxies or {})
         self.timeout = timeout
+        # pylint: disable-next=import-outside-toplevel
+        import cloudscraper  # noqa: PLC0415
+
         self.scraper = cloudscraper.create_scraper(sess=session, **kwargs)
 
     @asynccontextmanager
@@ -154,11 +452,26 @@ class CloudScraperRequest(NazurinRequestSession):
         self,
         *args,
         **kwargs,
-    ) -> AsyncGenerator[cloudscraper.requests.Response, None]:
-        yield await async_wrap(self.scraper.get)(*args, timeout=self.timeout, **kwargs)
+    ) -> AsyncGenerator[Response, None]:
+        url = args[0] if args else kwargs.get("url")
+        async with limiters.limit(url):
+            yield await async_wrap(self.scraper.get)(
+                *args,
+                timeout=self.timeout,
+                **kwargs,
+            )
 
-    async def download(self, url: str, destination: Union[str, os.PathLike]):
-        async with self.get(url, stream=True) as response:
+    async def download(
+        self,
+        url: str,
+        destination: Union[str, os.PathLike],
+    ) -> Optional[dict[str, str]]:
+        part = PartialFile.load(url, destination)
+        if part.completed:
+            part.complete()
+            return None
+        async with self.get(url, stream=True, headers=part.headers()) as response:
+            offset = part.start(response.status_code, response.headers)
             if not response.ok:
                 logger.error(
                     "Download failed with status code {}",
@@ -166,9 +479,24 @@ class CloudScraperRequest(NazurinRequestSession):
                 )
                 logger.info("Response: {}", await response.text)
                 response.raise_for_status()
-            async with aiofiles.open(destination, "wb") as f:
-                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
-                    await f.write(chunk)
+            # Read in a thread, larger chunks save hops to it
+            chunks = response.iter_content(DOWNLOAD_BUFFER_SIZE)
+            read = async_wrap(next)
+            async with DownloadSink(part.path, offset, truncate=not offset) as sink:
+                while chunk := await read(chunks, None):
+                    await sink.write(chunk)
+        part.complete()
+        return sink.digests
 
     async def __aexit__(self, *args, **kwargs):
         self.scraper.close()
+
+
+def __getattr__(name: str):
+    # curl_cffi is slow to import and rarely used, so it's imported on demand
+    if name == "CurlRequest":
+        # pylint: disable-next=import-outside-toplevel
+        from nazurin.utils.curl import CurlRequest  # noqa: PLC0415
+
+        return CurlRequest
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,56 @@
+import asyncio
+from collections.abc import Awaitable, Hashable
+from typing import Callable, TypeVar
+
+from nazurin.utils import logger
+
+T = TypeVar("T")
+
+
+class Call:
+    """An in-flight call and the number of callers waiting for it."""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into a single execution,
+    all callers will receive its result or exception.
+    """
+
+    def __init__(self):
+        self.calls: dict[Hashable, Call] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        call = self.calls.get(key)
+        if call is None:
+            call = Call(asyncio.ensure_future(func()))
+            self.calls[key] = call
+            call.future.add_done_callback(lambda future: self.done(key, future))
+        else:
+            logger.info("Joining in-flight call: {}", key)
+        call.waiters += 1
+        try:
+            # Cancelling one of the callers should not affect others
+            return await asyncio.shield(call.future)
+        except asyncio.CancelledError:
+            if call.waiters == 1:
+                # Nobody is left to receive the result
+                call.future.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def done(self, key: Hashable, future: asyncio.Future):
+        call = self.calls.get(key)
+        if call is not None and call.future is future:
+            del self.calls[key]
+        # Retrieve the exception, callers may have left before it was raised
+        if not future.cancelled():
+            future.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.calls
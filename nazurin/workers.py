@@ -0,0 +1,92 @@
+"""Worker processes collecting artworks from the shared job queue."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from multiprocessing.process import BaseProcess
+from typing import Optional
+
+from nazurin.utils import logger
+from nazurin.utils.decorators import async_wrap
+
+# Interval to check whether worker processes are alive, in seconds
+SUPERVISE_INTERVAL = 5
+# Time to wait for worker processes to finish their jobs on shutdown, in seconds
+SHUTDOWN_TIMEOUT = 30
+
+
+def run_worker(index: int):
+    """
+    Entry of a worker process.
+
+    Worker processes are spawned rather than forked,
+    so that every one of them imports the package freshly
+    and creates its own event loop, site clients and database connections.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    from nazurin import dp  # noqa: PLC0415
+
+    with logger.contextualize(request=f"worker:{index}"):
+        asyncio.run(dp.work())
+
+
+class WorkerPool:
+    """
+    Pool of worker processes, restarted if they exit unexpectedly.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: list[Optional[BaseProcess]] = [None] * size
+        self.supervisor: Optional[asyncio.Task] = None
+
+    def spawn(self, index: int):
+        process = self.context.Process(
+            target=run_worker,
+            args=(index,),
+            name=f"nazurin-worker-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+        logger.info("Worker process {} started, pid = {}", index, process.pid)
+
+    def start(self):
+        for index in range(self.size):
+            self.spawn(index)
+        self.supervisor = asyncio.create_task(self.supervise())
+
+    async def supervise(self):
+        while True:
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+            for index, process in enumerate(self.processes):
+                if process.is_alive():
+                    continue
+                logger.warning(
+                    "Worker process {} exited with code {}, restarting",
+                    index,
+                    process.exitcode,
+                )
+                self.spawn(index)
+
+    @async_wrap
+    def join(self):
+        for process in self.processes:
+            if not process:
+                continue
+            process.join(SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                logger.warning("Worker process {} didn't stop in time", process.pid)
+                process.kill()
+
+    async def stop(self):
+        if self.supervisor:
+            self.supervisor.cancel()
+        # Workers hand their running jobs back to the queue on SIGTERM
+        for process in self.processes:
+            if process and process.is_alive():
+                process.terminate()
+        await self.join()
+        logger.info("Worker processes stopped")
@@ -0,0 +1,24 @@
+"""
+Offline benchmarks of Nazurin, see README.md for usage.
+
+Environment defaults are applied here since Nazurin reads its configuration
+on import, so this package must be imported before `nazurin`.
+"""
+
+import os
+
+ENVIRONMENT = {
+    "ENV": "development",
+    "TOKEN": "123456:benchmark-token-0000000000000000",
+    "ADMIN_ID": "1",
+    "DATABASE": "Local",
+    "STORAGE": "Local",
+    "LOG_LEVEL": "WARNING",
+    "PIXIV_TOKEN": "benchmark-refresh-token",
+    "TWITTER_API": "web",
+    "DANBOORU_USERNAME": "benchmark",
+    "DANBOORU_API_KEY": "benchmark",
+}
+
+for key, value in ENVIRONMENT.items():
+    os.environ.setdefault(key, value)
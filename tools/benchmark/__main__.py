@@ -0,0 +1,84 @@
+"""
+Usage:
+    python -m tools.benchmark e2e [--count N] [--concurrency C] [--sites a,b]
+    python -m tools.benchmark micro
+    python -m tools.benchmark stub [--port PORT]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tools.benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    e2e = commands.add_parser("e2e", help="Collect artworks end to end")
+    e2e.add_argument("--count", type=int, default=100, help="Artworks to collect")
+    e2e.add_argument("--concurrency", type=int, default=10, help="Updates at a time")
+    e2e.add_argument(
+        "--sites",
+        default="pixiv,twitter,danbooru,yandere",
+        help="Sites to collect from, in turn",
+    )
+    e2e.add_argument("--latency", type=float, default=0, help="Response delay in ms")
+    e2e.add_argument("--image-size", type=int, default=1000, help="Image side in px")
+    e2e.add_argument(
+        "--gallery",
+        action="store_true",
+        help="Send to a fake Telegram gallery channel",
+    )
+    e2e.add_argument("--stub-url", help="Use a stub server started separately")
+
+    commands.add_parser("micro", help="Run microbenchmarks")
+
+    stub = commands.add_parser("stub", help="Start the stub server only")
+    stub.add_argument("--port", type=int, default=8080)
+    stub.add_argument("--latency", type=float, default=0, help="Response delay in ms")
+    stub.add_argument("--image-size", type=int, default=1000, help="Image side in px")
+    return parser.parse_args()
+
+
+async def serve(port: int, latency: float, image_size: int):
+    # pylint: disable-next=import-outside-toplevel
+    from .stub import StubServer  # noqa: PLC0415
+
+    stub = StubServer(port=port, latency=latency / 1000, image_size=image_size)
+    await stub.start()
+    sys.stdout.write(f"Stub server listening on {stub.url}\n")
+    await asyncio.Event().wait()
+
+
+def main():
+    args = parse_args()
+    if args.command == "e2e" and args.gallery:
+        os.environ["GALLERY_ID"] = "-1001"
+
+    # Nazurin reads configuration on import
+    # pylint: disable=import-outside-toplevel
+    if args.command == "e2e":
+        from . import e2e  # noqa: PLC0415
+
+        report = asyncio.run(
+            e2e.run(
+                count=args.count,
+                concurrency=args.concurrency,
+                sites=args.sites.split(","),
+                latency=args.latency / 1000,
+                image_size=args.image_size,
+                stub_url=args.stub_url,
+            ),
+        )
+        sys.stdout.write(f"{report}\n")
+    elif args.command == "micro":
+        from . import micro  # noqa: PLC0415
+
+        sys.stdout.write(micro.run() + "\n")
+    else:
+        asyncio.run(serve(args.port, args.latency, args.image_size))
+
+
+if __name__ == "__main__":
+    main()
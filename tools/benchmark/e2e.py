@@ -0,0 +1,166 @@
+"""End-to-end benchmark of collection updates against the stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from nazurin import config
+from nazurin.bot import NazurinBot
+
+from .redirect import redirect
+from .stub import StubServer
+
+SITE_URLS = {
+    "pixiv": "https://www.pixiv.net/artworks/{id}",
+    "twitter": "https://x.com/benchmark_artist/status/{id}",
+    "danbooru": "https://danbooru.donmai.us/posts/{id}",
+    "yandere": "https://yande.re/post/show/{id}",
+}
+
+
+@dataclass
+class Report:
+    latencies: list[float] = field(default_factory=list)
+    errors: list[tuple[str, Exception]] = field(default_factory=list)
+    duration: float = 0
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:  # noqa: PLR2004
+            return self.latencies[0] if self.latencies else 0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1]
+
+    def __str__(self) -> str:
+        total = len(self.latencies) + len(self.errors)
+        # ru_maxrss is in KiB on Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        lines = [
+            f"Collected:   {len(self.latencies)} / {total} in {self.duration:.2f}s",
+            f"Throughput:  {len(self.latencies) / self.duration:.2f} artworks/s",
+            f"Latency p50: {self.percentile(50) * 1000:.1f} ms",
+            f"Latency p95: {self.percentile(95) * 1000:.1f} ms",
+            f"Latency p99: {self.percentile(99) * 1000:.1f} ms",
+            f"Peak RSS:    {peak_rss:.1f} MiB",
+        ]
+        lines += [f"Error: {url}: {error!r}" for url, error in self.errors[:5]]
+        return "\n".join(lines)
+
+
+def build_urls(sites: list[str], count: int, start: int) -> list[str]:
+    return [
+        SITE_URLS[sites[i % len(sites)]].format(id=start + i) for i in range(count)
+    ]
+
+
+@contextmanager
+def workspace() -> Iterator[str]:
+    """
+    Run in a temporary directory so that database files are isolated.
+    """
+
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp(prefix="nazurin-benchmark-")
+    shutil.rmtree(config.TEMP_DIR, ignore_errors=True)
+    os.chdir(directory)
+    try:
+        yield directory
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextmanager
+def offline_twitter() -> Iterator[None]:
+    """
+    Transaction ID is generated from scripts of x.com home page,
+    which can't be replayed meaningfully, use a constant instead.
+    """
+
+    from nazurin.sites.twitter.api.web import WebAPI  # noqa: PLC0415
+
+    generate = WebAPI._generate_transaction_id
+
+    async def transaction_id(_self, _url: str, _method: str = "GET") -> str:
+        return "benchmark"
+
+    WebAPI._generate_transaction_id = transaction_id
+    try:
+        yield
+    finally:
+        WebAPI._generate_transaction_id = generate
+
+
+async def collect(
+    bot: NazurinBot,
+    urls: list[str],
+    concurrency: int,
+    report: Optional[Report] = None,
+):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def update(url: str):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await bot.update_collection([url])
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                if report:
+                    report.errors.append((url, error))
+                return
+            if report:
+                report.latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[update(url) for url in urls])
+
+
+async def run(
+    *,
+    count: int,
+    concurrency: int,
+    sites: list[str],
+    latency: float,
+    image_size: int,
+    stub_url: Optional[str],
+) -> Report:
+    stub = None
+    if not stub_url:
+        stub = StubServer(latency=latency, image_size=image_size)
+        await stub.start()
+        stub_url = stub.url
+
+    with workspace():
+        bot = NazurinBot()
+        bot.session = AiohttpSession(
+            api=TelegramAPIServer.from_base(f"{stub_url}/api.telegram.org"),
+        )
+        bot.init()
+        await bot.on_startup()
+        report = Report()
+        try:
+            with redirect(stub_url), offline_twitter():
+                # Authentication and other one-off requests are not measured
+                warmup = build_urls(sites, len(sites), 1)
+                await collect(bot, warmup, concurrency)
+                urls = build_urls(sites, count, 1000)
+                start = time.perf_counter()
+                await collect(bot, urls, concurrency, report)
+                report.duration = time.perf_counter() - start
+        finally:
+            await bot.on_shutdown()
+            await bot.session.close()
+            if stub:
+                await stub.stop()
+    return report
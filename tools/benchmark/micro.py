@@ -0,0 +1,125 @@
+"""Microbenchmarks of hot helper functions."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+import timeit
+from typing import Callable, Optional
+
+from pixivpy3 import AppPixivAPI
+
+from nazurin.sites import SiteManager, Source
+from nazurin.utils.helpers import sanitize_caption, sanitize_filename
+
+from .e2e import SITE_URLS
+from .stub import render
+
+VALUES = {"id": 123456, "width": 1000, "height": 1000, "size": 1048576, "md5": "0" * 32}
+
+URLS = [
+    *(url.format(id=123456) for url in SITE_URLS.values()),
+    "https://i.pximg.net/img-original/img/2024/01/01/00/00/00/123456_p0.png",
+    "https://files.yande.re/image/0123456789abcdef0123456789abcdef/yande.re%20123456%20a.jpg",
+    "https://www.artstation.com/artwork/AbCdE",
+    "https://bsky.app/profile/example.com/post/3abcdefghijk2",
+    # Not supported, goes through every pattern
+    "https://example.com/posts/123456",
+]
+
+URL_TEMPLATES = [
+    *SITE_URLS.values(),
+    "https://i.pximg.net/img-original/img/2024/01/01/00/00/00/{id}_p0.png",
+    "https://files.yande.re/image/0123456789abcdef0123456789abcdef/yande.re%20{id}%20a.jpg",
+    "https://www.zerochan.net/{id}",
+    "https://gelbooru.com/index.php?page=post&s=view&id={id}",
+    "https://bsky.app/profile/example.com/post/3abc{id}",
+    # Links commonly seen in chats but not supported
+    "https://github.com/user/repo/issues/{id}",
+    "https://www.youtube.com/watch?v={id}",
+    "https://en.wikipedia.org/wiki/{id}",
+    "https://t.me/channel/{id}",
+    "https://www.reddit.com/r/pics/comments/{id}/",
+]
+
+# Mixed URLs of supported sites and others, like many messages would have
+MIXED_URLS = [
+    template.format(id=i)
+    for i, template in zip(range(2000), itertools.cycle(URL_TEMPLATES))
+]
+
+FILENAME = 'Title: with "invalid" <characters> / and a long suffix | ' * 3
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Best time per call in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def linear_match(sources: list[Source], url: str) -> Optional[re.Match]:
+    """Try every pattern of every source, as before sources were indexed by host."""
+    for source in sources:
+        for pattern in source.patterns:
+            match = re.search(pattern, url)
+            if match:
+                return match
+    return None
+
+
+def fixture(name: str) -> dict:
+    return json.loads(render(name, **VALUES))
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    sites = SiteManager()
+    sites.load()
+
+    # pylint: disable=import-outside-toplevel
+    from nazurin.sites.danbooru.api import Danbooru  # noqa: PLC0415
+    from nazurin.sites.moebooru.api import Moebooru  # noqa: PLC0415
+    from nazurin.sites.pixiv.api import Pixiv  # noqa: PLC0415
+    from nazurin.sites.twitter.api.base import BaseAPI  # noqa: PLC0415
+    from nazurin.sites.twitter.api.web import WebAPI  # noqa: PLC0415
+
+    illust = AppPixivAPI.parse_json(render("pixiv_illust.json", **VALUES)).illust
+    image_url = illust.meta_single_page.original_image_url
+    tweet = WebAPI.normalize_tweet(fixture("twitter_tweet.json")["data"]["tweetResult"]["result"])
+    post = fixture("danbooru_post.json")
+    html = render("yandere_post.html", **VALUES)
+    yandere_post = json.loads(html.split("Post.register_resp(")[1].split("); </script>")[0])
+    moebooru = Moebooru().site("yande.re")
+
+    return {
+        "SiteManager.match": lambda: [sites.match([url]) for url in URLS],
+        "SiteManager.match mixed": lambda: [sites.match_url(url) for url in MIXED_URLS],
+        "Linear scan mixed": lambda: [
+            linear_match(sites.sources, url) for url in MIXED_URLS
+        ],
+        "sanitize_filename": lambda: sanitize_filename(FILENAME),
+        "Pixiv.get_storage_dest": lambda: Pixiv.get_storage_dest(image_url, illust),
+        "Twitter.get_storage_dest": lambda: BaseAPI.get_storage_dest("a.jpg", tweet),
+        "Danbooru.get_storage_dest": lambda: Danbooru.get_storage_dest(post, "a.png"),
+        "Moebooru.get_storage_dest": lambda: moebooru.get_storage_dest(
+            yandere_post["posts"][0],
+            "a.png",
+        ),
+        "Pixiv.build_caption": lambda: sanitize_caption(Pixiv.build_caption(illust)),
+        "Twitter.build_caption": lambda: sanitize_caption(BaseAPI.build_caption(tweet)),
+    }
+
+
+def run() -> str:
+    units = {
+        "SiteManager.match": f"{len(URLS)} URLs",
+        "SiteManager.match mixed": f"{len(MIXED_URLS)} URLs",
+        "Linear scan mixed": f"{len(MIXED_URLS)} URLs",
+    }
+    lines = []
+    for name, func in cases().items():
+        seconds = measure(func)
+        unit = units.get(name, "call")
+        lines.append(f"{name:<28} {seconds * 1e6:>10.2f} µs / {unit}")
+    return "\n".join(lines)
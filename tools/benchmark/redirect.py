@@ -0,0 +1,48 @@
+"""Redirect outgoing site requests to the stub server."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import yarl
+from requests.adapters import HTTPAdapter
+
+from nazurin.utils.network import Request
+
+
+def rewrite(url: str, base: str) -> str:
+    parts = urlsplit(url)
+    rewritten = f"{base}/{parts.netloc}{parts.path or '/'}"
+    if parts.query:
+        rewritten += "?" + parts.query
+    return rewritten
+
+
+@contextmanager
+def redirect(base: str) -> Iterator[None]:
+    """
+    Send requests of `Request` (aiohttp) and `requests` based clients,
+    e.g. pixivpy, pybooru and CloudScraperRequest, to `base`.
+    """
+
+    request = Request._request
+    send = HTTPAdapter.send
+
+    async def redirected_request(self, method, str_or_url, **kwargs):
+        url = yarl.URL(str(str_or_url), encoded=isinstance(str_or_url, yarl.URL))
+        url = yarl.URL(rewrite(str(url), base), encoded=True)
+        return await request(self, method, url, **kwargs)
+
+    def redirected_send(self, prepared, **kwargs):
+        prepared.url = rewrite(prepared.url, base)
+        return send(self, prepared, **kwargs)
+
+    Request._request = redirected_request
+    HTTPAdapter.send = redirected_send
+    try:
+        yield
+    finally:
+        Request._request = request
+        HTTPAdapter.send = send
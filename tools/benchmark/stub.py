@@ -0,0 +1,196 @@
+"""
+Local stub server replaying recorded site responses.
+
+Requests are redirected to `http://127.0.0.1:<port>/<original host>/<path>`,
+see `redirect.py`, and answered from the fixtures in `fixtures/`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import random
+import re
+from collections.abc import Awaitable
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Callable
+
+from aiohttp import web
+from PIL import Image
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+Handler = Callable[[web.Request, re.Match], Awaitable[web.StreamResponse]]
+
+
+@lru_cache
+def load_fixture(name: str) -> Template:
+    return Template((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def render(name: str, **values) -> str:
+    """Fill in placeholders like `$id` of a fixture."""
+    return load_fixture(name).substitute(values)
+
+
+def generate_image(width: int, height: int) -> bytes:
+    """Noise image, so that it doesn't compress to nearly nothing."""
+    image = Image.frombytes("RGB", (width, height), random.randbytes(width * height * 3))
+    output = io.BytesIO()
+    image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+class StubServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        image_size: int = 1000,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.width = self.height = image_size
+        self.image = generate_image(self.width, self.height)
+        self.md5 = hashlib.md5(self.image).hexdigest()  # noqa: S324
+        self.requests = 0
+        self.ids = iter(range(1, 1 << 31))
+        self.routes: list[tuple[str, str, re.Pattern, Handler]] = []
+        self.route("POST", "oauth.secure.pixiv.net", r"/auth/token", self.pixiv_auth)
+        self.route("GET", "app-api.pixiv.net", r"/v1/illust/detail", self.pixiv_illust)
+        self.route("GET", "i.pximg.net", r"/.+", self.image_file)
+        self.route("POST", "api.twitter.com", r"/1.1/guest/activate.json", self.guest)
+        self.route("GET", "api.x.com", r"/graphql/\w+/TweetResultByRestId", self.tweet)
+        self.route("GET", "pbs.twimg.com", r"/media/.+", self.image_file)
+        self.route("GET", "danbooru.donmai.us", r"/posts/(\d+)\.json", self.post)
+        self.route("POST", "danbooru.donmai.us", r"/artists\.json", self.created)
+        self.route("POST", "danbooru.donmai.us", r"/uploads\.json", self.created)
+        self.route("GET", "danbooru.donmai.us", r"/uploads/(\d+)\.json", self.upload)
+        self.route("POST", "danbooru.donmai.us", r"/posts\.json", self.created)
+        self.route("GET", "cdn.donmai.us", r"/.+", self.image_file)
+        self.route("GET", "yande.re", r"/post/show/(\d+)", self.yandere_post)
+        self.route("GET", "files.yande.re", r"/.+", self.image_file)
+        self.route("*", "api.telegram.org", r"/bot[^/]+/(\w+)", self.telegram)
+        # Uploads to Danbooru carry whole images
+        self.app = web.Application(client_max_size=1 << 30)
+        self.app.router.add_route("*", "/{host}/{path:.*}", self.dispatch)
+        self.runner = web.AppRunner(self.app, access_log=None)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def route(self, method: str, host: str, path: str, handler: Handler):
+        self.routes.append((method, host, re.compile(path), handler))
+
+    async def start(self):
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def dispatch(self, request: web.Request) -> web.StreamResponse:
+        host = request.match_info["host"]
+        path = "/" + request.match_info["path"]
+        self.requests += 1
+        for method, route_host, pattern, handler in self.routes:
+            # HEAD requests are answered by GET routes
+            allowed = method in ("*", request.method) or (
+                method == "GET" and request.method == "HEAD"
+            )
+            if host != route_host or not allowed:
+                continue
+            match = pattern.fullmatch(path)
+            if match:
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                return await handler(request, match)
+        return web.json_response({"error": f"No fixture for {host}{path}"}, status=404)
+
+    def render(self, name: str, **values) -> str:
+        return render(
+            name,
+            width=self.width,
+            height=self.height,
+            size=len(self.image),
+            md5=self.md5,
+            **values,
+        )
+
+    def json_fixture(self, name: str, **values) -> web.Response:
+        return web.Response(
+            text=self.render(name, **values),
+            content_type="application/json",
+        )
+
+    async def image_file(self, _request: web.Request, _match: re.Match):
+        return web.Response(body=self.image, content_type="image/png")
+
+    async def pixiv_auth(self, _request: web.Request, _match: re.Match):
+        return self.json_fixture("pixiv_auth.json")
+
+    async def pixiv_illust(self, request: web.Request, _match: re.Match):
+        return self.json_fixture("pixiv_illust.json", id=request.query["illust_id"])
+
+    async def guest(self, _request: web.Request, _match: re.Match):
+        return self.json_fixture("twitter_guest_token.json")
+
+    async def tweet(self, request: web.Request, _match: re.Match):
+        variables = json.loads(request.query["variables"])
+        return self.json_fixture("twitter_tweet.json", id=variables["tweetId"])
+
+    async def post(self, _request: web.Request, match: re.Match):
+        return self.json_fixture("danbooru_post.json", id=match.group(1))
+
+    async def created(self, request: web.Request, _match: re.Match):
+        # Consume uploaded files
+        await request.read()
+        return web.json_response({"id": next(self.ids)}, status=201)
+
+    async def upload(self, _request: web.Request, match: re.Match):
+        asset_id = next(self.ids)
+        return web.json_response(
+            {
+                "id": int(match.group(1)),
+                "status": "completed",
+                "upload_media_assets": [{"id": asset_id, "media_asset_id": asset_id}],
+            },
+        )
+
+    async def yandere_post(self, _request: web.Request, match: re.Match):
+        return web.Response(
+            text=self.render("yandere_post.html", id=match.group(1)),
+            content_type="text/html",
+        )
+
+    async def telegram(self, request: web.Request, match: re.Match):
+        data = dict(await request.post()) or dict(request.query)
+        chat_id = data.get("chat_id", 0)
+        message = json.loads(
+            self.render("telegram_message.json", id=next(self.ids), chat_id=chat_id),
+        )
+        method = match.group(1).lower()
+        if method == "getme":
+            result = {
+                "id": 1,
+                "is_bot": True,
+                "first_name": "Benchmark",
+                "username": "benchmark_bot",
+            }
+        elif method == "sendmediagroup":
+            media = json.loads(data.get("media", "[]"))
+            result = [{**message, "message_id": next(self.ids)} for _ in media]
+        elif method.startswith(("send", "forward")):
+            result = message
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
@@ -3,18 +3,19 @@ Helper script to scan artworks from local directory and write metadata to databa
 Run this script in the root directory of the project.
 """
 
+import asyncio
 import glob
 import logging
 import os
-import random
 import re
 import sys
-from time import sleep, time
+from time import time
 
 sys.path.append(".")
-from nazurin.database import Database
+from nazurin.database import Database, DatabaseDriver
 from nazurin.sites import SiteManager
 from nazurin.sites.moebooru.config import COLLECTIONS as MOEBOORU_COLLECTIONS
+from nazurin.utils.network import limiters
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -29,6 +30,10 @@ directory = ""
 error = []
 processed = {}
 sites.load()
+# Artworks looked up in the database at a time
+BATCH_SIZE = 100
+# Requests to Pixiv API are made by pixivpy, limited by `RATE_LIMITS` here
+PIXIV_API_URL = "https://app-api.pixiv.net/"
 SITES = [
     "pixiv",
     "danbooru",
@@ -57,9 +62,8 @@ def scan():
         file_cnt = file_cnt + 1
         filename = path[len(directory) :]
         flag = False
-        source = None
 
-        for pattern in patterns.values():
+        for source, pattern in patterns.items():
             match = re.search(pattern, filename, re.IGNORECASE)
             if match:
                 flag = True
@@ -71,7 +75,7 @@ def scan():
         yield (filename, source, match)
 
 
-def parse_source(source, match):
+async def parse_source(source, match):
     collection = source
     origin_id = match.group(1)
     if source == "moebooru":
@@ -82,36 +86,60 @@ def parse_source(source, match):
         collection = MOEBOORU_COLLECTIONS[url.lower()]
     elif source == "danbooru":
         md5 = match.group(1)
-        data = sites.api("danbooru").getPost(md5=md5)
+        data = await sites.api("danbooru").get_post(md5=md5)
         origin_id = data["id"]
     return int(origin_id), collection
 
 
-def process(filename, source, match, origin_id):
+async def process(filename, source, match, origin_id):
     api = sites.api(source)
     if source == "pixiv":
-        data = api.getArtwork(origin_id)
-        sleep(random.random() + 0.5)  # Rate limit
+        async with limiters.limit(PIXIV_API_URL):
+            data = await api.get_artwork(origin_id)
     elif source == "twitter":
-        data = api.getTweet(origin_id)
+        data = (await api.fetch(origin_id)).metadata
     elif source == "danbooru":
-        data = api.getPost(origin_id)
+        data = await api.get_post(origin_id)
         if not filename.startswith("danbooru"):  # Rename old format to new
-            _, newname = api._getNames(data)
+            _, newname = api._get_names(data)
             os.rename(directory + filename, directory + newname)
     elif source == "moebooru":
         url = match.group(1)
         if url == "lolibooru":
             url = "lolibooru.moe"
         api = api.site(url)
-        data, _ = api.getPost(origin_id)
+        data, _ = await api.get_post(origin_id)
     elif source == "zerochan":
-        data = api.getPost(origin_id)
+        data = await api.get_post(origin_id)
     elif source == "bilibili":
-        data = api.getDynamic(origin_id)
+        data = await api.get_dynamic(origin_id)
     return data
 
 
+async def save(collection: DatabaseDriver, site: str, batch: dict):
+    """Write metadata of artworks in `batch` not in database yet."""
+    global success  # noqa: PLW0603
+    origin_ids = list(batch)
+    exists = await collection.exists_many(origin_ids)
+    documents = {}
+    for origin_id, found in zip(origin_ids, exists):
+        filename, source, match = batch[origin_id]
+        processed[site].append(origin_id)
+        if found:
+            logger.info("⚪️ %s: Already exists", filename)
+            continue
+        try:
+            data = await process(filename, source, match, origin_id)
+        except Exception as err:
+            logger.error("❌ %s: (id: %s) %s", filename, origin_id, err)
+            error.append((filename, origin_id, err))
+            continue
+        data["collected_at"] = time()
+        documents[origin_id] = data
+        logger.info("✔️ %s: %s%s", filename, source, str(match.groups()))
+    success = success + await collection.insert_many(documents)
+
+
 def print_result():
     logger.info(
         "Scanned Files: %d, Matched Artworks: %d, "
@@ -130,8 +158,8 @@ def print_result():
         logger.info("❌ Error:\n %s", error)
 
 
-def main():
-    global artworks, success, directory  # noqa: PLW0603
+async def main():
+    global artworks, directory  # noqa: PLW0603
     for source in SITES:
         processed[source] = []
     directory = input("Directory path (ends with slash): ")
@@ -140,42 +168,38 @@ def main():
     skipped = input()
     skipped = skipped.split(",")
     db = Database().driver()
+    await db.connect()
+    # Artworks waiting to be looked up in database, by site and ID
+    batches: dict[str, dict] = {}
 
-    for filename, source, match in scan():
-        origin_id, site = parse_source(source, match)
-        if source == "danbooru_new":
-            source = site = "danbooru"  # noqa: PLW2901
-        if site in skipped:
-            continue
-
-        if origin_id in processed[site]:  # Pixiv multiple pages
-            continue
-        artworks = artworks + 1
-        if db.collection(site).document(origin_id).exists():
-            logger.info("⚪️ %s: Already exists", filename)
-            processed[site].append(origin_id)
-            continue
-
-        try:
-            data = process(filename, source, match, origin_id)
-        except Exception as err:
-            logger.error("❌ %s: (id: %s) %s", filename, origin_id, err)
-            error.append((filename, origin_id, err))
-            processed[site].append(origin_id)
-            continue
-
-        data["collected_at"] = time()
-        db.collection(site).insert(origin_id, data)
-        logger.info("✔️ %s: %s%s", filename, source, str(match.groups()))
-
-        processed[site].append(origin_id)
-        success = success + 1
+    try:
+        for filename, source, match in scan():
+            origin_id, site = await parse_source(source, match)
+            if source == "danbooru_new":
+                source = site = "danbooru"  # noqa: PLW2901
+            if site in skipped:
+                continue
+
+            batch = batches.setdefault(site, {})
+            # Pixiv multiple pages
+            if origin_id in processed[site] or origin_id in batch:
+                continue
+            artworks = artworks + 1
+            batch[origin_id] = (filename, source, match)
+            if len(batch) >= BATCH_SIZE:
+                await save(db.collection(site), site, batches.pop(site))
+
+        for site, batch in batches.items():
+            if batch:
+                await save(db.collection(site), site, batch)
+    finally:
+        await db.close()
 
     print_result()
 
 
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main())
     except KeyboardInterrupt:
         print_result()
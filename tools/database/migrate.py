@@ -0,0 +1,238 @@
+"""
+Copy documents from one database to another, e.g. from TinyDB to SQLite.
+
+Usage:
+    python -m tools.database.migrate SOURCE TARGET [--collections a,b]
+        [--batch-size N] [--concurrency C] [--restart]
+
+SOURCE and TARGET are database driver names like the `DATABASE` option,
+e.g. `Local`, `SQLite`, `Mongo`, `Firebase` or `Cloudant`,
+both configured with the usual environment variables.
+
+Documents are streamed in batches, existing keys in the target are skipped.
+Finished collections and the number of documents copied from the others
+are recorded in a checkpoint file after every batch,
+so that an interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from nazurin.config import DATA_DIR
+from nazurin.database import Database, DatabaseDriver
+from nazurin.utils import logger
+
+# Interval of progress reports, in seconds
+REPORT_INTERVAL = 5
+
+
+@dataclass
+class Checkpoint:
+    path: str
+    done: list[str] = field(default_factory=list)
+    # Documents copied from the beginning of unfinished collections
+    offsets: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> Checkpoint:
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(path, data["done"], data.get("offsets", {}))
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({"done": self.done, "offsets": self.offsets}, file)
+
+    def advance(self, collection: str, offset: int):
+        self.offsets[collection] = offset
+        self.save()
+
+    def finish(self, collection: str):
+        self.done.append(collection)
+        self.offsets.pop(collection, None)
+        self.save()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+@dataclass
+class Stats:
+    copied: int = 0
+    skipped: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def total(self) -> int:
+        return self.copied + self.skipped
+
+    def __str__(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        return (
+            f"copied {self.copied}, skipped {self.skipped} in {elapsed:.1f}s "
+            f"({self.total / max(elapsed, 1e-9):.0f} documents/s)"
+        )
+
+
+async def migrate_collection(
+    source: DatabaseDriver,
+    target: DatabaseDriver,
+    *,
+    batch_size: int,
+    concurrency: int,
+    offset: int = 0,
+    progress: Callable[[int], None] = lambda _offset: None,
+) -> Stats:
+    """
+    Copy documents after the first `offset` ones,
+    `progress` is called with the number of documents copied from the beginning
+    whenever it advances.
+    """
+
+    stats = Stats()
+    # Batches being written, reading stops while all slots are taken
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+    errors: list[Exception] = []
+    # Sizes of written batches by their offsets, until earlier ones are written
+    written: dict[int, int] = {}
+
+    async def write(start: int, documents: dict):
+        nonlocal offset
+        try:
+            inserted = await target.insert_many(documents)
+            stats.copied += inserted
+            stats.skipped += len(documents) - inserted
+            # Batches may finish out of order, only count the contiguous ones
+            written[start] = len(documents)
+            if start == offset:
+                while offset in written:
+                    offset += written.pop(offset)
+                progress(offset)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            errors.append(error)
+        finally:
+            semaphore.release()
+
+    async def report():
+        while True:
+            await asyncio.sleep(REPORT_INTERVAL)
+            logger.info("  {}", stats)
+
+    reporter = asyncio.create_task(report())
+    try:
+        start = offset
+        async for documents in source.documents(batch_size, offset):
+            await semaphore.acquire()
+            # Stop early on errors instead of reading everything first
+            if errors:
+                break
+            task = asyncio.create_task(write(start, documents))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            start += len(documents)
+        await asyncio.gather(*tasks)
+    finally:
+        reporter.cancel()
+    if errors:
+        raise errors[0]
+    return stats
+
+
+async def migrate(
+    source_name: str,
+    target_name: str,
+    *,
+    collections: list[str],
+    batch_size: int,
+    concurrency: int,
+    restart: bool,
+):
+    source = Database.load(source_name)()
+    target = Database.load(target_name)()
+    checkpoint = Checkpoint.load(
+        os.path.join(DATA_DIR, f"migrate-{source_name}-{target_name}.checkpoint"),
+    )
+    if restart:
+        checkpoint = Checkpoint(checkpoint.path)
+    try:
+        await asyncio.gather(source.connect(), target.connect())
+        total = Stats()
+        for name in collections or await source.collections():
+            if name in checkpoint.done:
+                logger.info("{}: done in a previous run, skipped", name)
+                continue
+            offset = checkpoint.offsets.get(name, 0)
+            if offset:
+                logger.info("{}: resuming after {} documents", name, offset)
+            else:
+                logger.info("{}: migrating", name)
+            stats = await migrate_collection(
+                source.collection(name),
+                target.collection(name),
+                batch_size=batch_size,
+                concurrency=concurrency,
+                offset=offset,
+                progress=lambda offset, name=name: checkpoint.advance(name, offset),
+            )
+            logger.info("{}: {}", name, stats)
+            checkpoint.finish(name)
+            total.copied += stats.copied
+            total.skipped += stats.skipped
+        logger.info("Migration completed: {}", total)
+        checkpoint.remove()
+    finally:
+        await asyncio.gather(source.close(), target.close())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tools.database.migrate")
+    parser.add_argument("source", help="Database to copy from, e.g. Local")
+    parser.add_argument("target", help="Database to copy to, e.g. SQLite")
+    parser.add_argument(
+        "--collections",
+        default="",
+        help="Collections to migrate, separated by commas, defaults to all",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Batches written at a time in each collection",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint of an interrupted run",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    asyncio.run(
+        migrate(
+            args.source,
+            args.target,
+            collections=[name for name in args.collections.split(",") if name],
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            restart=args.restart,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()